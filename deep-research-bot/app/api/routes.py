@@ -1,14 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, func, and_
 from sqlalchemy.orm import selectinload
 from typing import Optional, List
 from datetime import datetime, timedelta
+import json
 from pydantic import BaseModel
 
 from app.models.database import Keyword, Content, ResearchLog, get_session, async_session
-from app.services.researcher import researcher
-from app.services.analyzer import analyzer
+from app.services.jobs import research_jobs
+from app.services.work_queue import work_queue
+from app.core.http import http_client
+from app.core.singleflight import singleflight
+from app.core.resilience import host_guard
+from app.core.llm_limits import llm_limiter
+from app.services.analysis_cache import analysis_cache
+from app.services.analysis_batches import analysis_batches
+from app.services.relevance import relevance_scorer
+from app.services.digests import daily_digests
+from app.services.http_cache import conditional_cache
+from app.services.urls import url_resolver
+from app.services.article_extractor import article_extractor
+from app.services.transcripts import transcript_fetcher
+from app.config import settings
 
 router = APIRouter()
 
@@ -111,6 +126,49 @@ async def delete_keyword(keyword_id: int):
 
 # ============ Contents ============
 
+def contents_query(
+    source_type: Optional[str] = None,
+    language: Optional[str] = None,
+    min_score: Optional[float] = None,
+    keyword_id: Optional[int] = None,
+    is_starred: Optional[bool] = None,
+    is_analyzed: Optional[bool] = True,
+    limit: int = 50,
+    offset: int = 0,
+    sort_by: str = "share_score"
+):
+    """콘텐츠 목록 조회 쿼리 (실행 계획 점검에도 사용 - app/models/migrations.py)"""
+    query = select(Content).options(selectinload(Content.keyword))
+    
+    # 필터링
+    conditions = []
+    if source_type:
+        conditions.append(Content.source_type == source_type)
+    if language:
+        conditions.append(Content.language == language)
+    if min_score is not None:
+        conditions.append(Content.ai_share_score >= min_score)
+    if keyword_id:
+        conditions.append(Content.keyword_id == keyword_id)
+    if is_starred is not None:
+        conditions.append(Content.is_starred == is_starred)
+    if is_analyzed is not None:
+        conditions.append(Content.is_analyzed == is_analyzed)
+    
+    if conditions:
+        query = query.where(and_(*conditions))
+    
+    # 정렬
+    if sort_by == "share_score":
+        query = query.order_by(desc(Content.ai_share_score))
+    elif sort_by == "published_at":
+        query = query.order_by(desc(Content.published_at))
+    else:
+        query = query.order_by(desc(Content.created_at))
+    
+    # 페이징
+    return query.offset(offset).limit(limit)
+
 @router.get("/contents")
 async def list_contents(
     source_type: Optional[str] = None,
@@ -125,38 +183,9 @@ async def list_contents(
 ):
     """콘텐츠 목록 조회"""
     async with async_session() as session:
-        query = select(Content).options(selectinload(Content.keyword))
-        
-        # 필터링
-        conditions = []
-        if source_type:
-            conditions.append(Content.source_type == source_type)
-        if language:
-            conditions.append(Content.language == language)
-        if min_score is not None:
-            conditions.append(Content.ai_share_score >= min_score)
-        if keyword_id:
-            conditions.append(Content.keyword_id == keyword_id)
-        if is_starred is not None:
-            conditions.append(Content.is_starred == is_starred)
-        if is_analyzed is not None:
-            conditions.append(Content.is_analyzed == is_analyzed)
-        
-        if conditions:
-            query = query.where(and_(*conditions))
-        
-        # 정렬
-        if sort_by == "share_score":
-            query = query.order_by(desc(Content.ai_share_score))
-        elif sort_by == "published_at":
-            query = query.order_by(desc(Content.published_at))
-        else:
-            query = query.order_by(desc(Content.created_at))
-        
-        # 페이징
-        query = query.offset(offset).limit(limit)
-        
-        result = await session.execute(query)
+        result = await session.execute(contents_query(
+            source_type, language, min_score, keyword_id, is_starred, is_analyzed, limit, offset, sort_by
+        ))
         contents = result.scalars().all()
         
         return [c.to_dict() for c in contents]
@@ -207,27 +236,47 @@ async def mark_shared(content_id: int):
 
 # ============ Research ============
 
-@router.post("/research/run")
+@router.post("/research/run", status_code=202)
 async def run_research():
-    """전체 리서치 실행"""
-    try:
-        result = await researcher.run_daily_research()
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@router.post("/research/keyword/{keyword_id}")
+    """전체 리서치 실행 - 작업을 등록하고 바로 작업 ID 반환 (같은 범위의 작업이 있으면 합침)"""
+    if settings.research_mode == "workers":
+        # worker.py 작업 큐에 등록 (워커 프로세스가 처리)
+        return await work_queue.enqueue_run()
+    return await research_jobs.submit()
+
+@router.post("/research/keyword/{keyword_id}", status_code=202)
 async def research_keyword(keyword_id: int):
-    """특정 키워드 리서치"""
-    try:
-        result = await researcher.research_single_keyword(keyword_id)
-        if result["status"] == "error":
-            raise HTTPException(status_code=404, detail=result["message"])
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """특정 키워드 리서치 - 작업을 등록하고 바로 작업 ID 반환"""
+    async with async_session() as session:
+        keyword = await session.get(Keyword, keyword_id)
+        if not keyword:
+            raise HTTPException(status_code=404, detail="키워드를 찾을 수 없습니다.")
+    return await research_jobs.submit(keyword_id)
+
+@router.get("/research/jobs")
+async def get_research_jobs():
+    """대기/실행 중인 리서치 작업, 등록/합친 작업 수"""
+    return {
+        "jobs": await research_jobs.active(),
+        **research_jobs.stats(),
+        "work_units": await work_queue.stats()
+    }
+
+@router.get("/research/jobs/{job_id}")
+async def get_research_job(job_id: int):
+    """리서치 작업 상태 (단계별 건수, 현재 키워드, 예상 남은 시간, 끝난 작업의 결과)"""
+    job = await research_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@router.post("/research/jobs/{job_id}/cancel")
+async def cancel_research_job(job_id: int):
+    """리서치 작업 취소 (실행 중이면 파이프라인을 멈추고 실행 로그를 cancelled로)"""
+    status = await research_jobs.cancel(job_id) or await work_queue.cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=409, detail="대기 중이거나 실행 중인 작업이 아닙니다.")
+    return {"job_id": job_id, "status": status}
 
 @router.get("/research/logs")
 async def get_research_logs(limit: int = 10):
@@ -241,8 +290,42 @@ async def get_research_logs(limit: int = 10):
         logs = result.scalars().all()
         return [l.to_dict() for l in logs]
 
+# ============ Analysis Batches ============
+
+@router.get("/analysis/batches")
+async def get_analysis_batches(limit: int = 20):
+    """배치 분석 작업 목록"""
+    return await analysis_batches.recent(limit)
+
+@router.post("/analysis/batches")
+async def submit_analysis_batch():
+    """미분석 콘텐츠를 배치 작업으로 제출"""
+    result = await analysis_batches.submit()
+    if result["status"] == "error":
+        raise HTTPException(status_code=502, detail=result["message"])
+    return result
+
+@router.post("/analysis/batches/poll")
+async def poll_analysis_batches():
+    """진행 중인 배치 작업 상태 확인 (완료된 작업은 결과 반영)"""
+    return await analysis_batches.poll()
+
 # ============ Dashboard Stats ============
 
+def analyzed_count_query():
+    return select(func.count(Content.id)).where(Content.is_analyzed == True)
+
+def source_counts_query():
+    return select(Content.source_type, func.count(Content.id)).group_by(Content.source_type)
+
+def daily_count_query(day_start: datetime):
+    return select(func.count(Content.id)).where(
+        and_(
+            Content.created_at >= day_start,
+            Content.created_at < day_start + timedelta(days=1)
+        )
+    )
+
 @router.get("/stats")
 async def get_stats():
     """대시보드 통계"""
@@ -252,9 +335,7 @@ async def get_stats():
         total_contents = total_contents.scalar()
         
         # 분석 완료 수
-        analyzed_contents = await session.execute(
-            select(func.count(Content.id)).where(Content.is_analyzed == True)
-        )
+        analyzed_contents = await session.execute(analyzed_count_query())
         analyzed_contents = analyzed_contents.scalar()
         
         # 고득점 콘텐츠 수 (80점 이상)
@@ -270,23 +351,15 @@ async def get_stats():
         active_keywords = active_keywords.scalar()
         
         # 소스별 통계
-        source_stats = await session.execute(
-            select(Content.source_type, func.count(Content.id))
-            .group_by(Content.source_type)
-        )
+        source_stats = await session.execute(source_counts_query())
         source_stats = {row[0]: row[1] for row in source_stats.all()}
         
         # 최근 7일 일별 수집량
         daily_stats = []
         for i in range(7):
             date = datetime.utcnow().date() - timedelta(days=i)
-            count = await session.execute(
-                select(func.count(Content.id)).where(
-                    and_(
-                        func.date(Content.created_at) == date
-                    )
-                )
-            )
+            day_start = datetime.combine(date, datetime.min.time())
+            count = await session.execute(daily_count_query(day_start))
             daily_stats.append({
                 "date": date.isoformat(),
                 "count": count.scalar()
@@ -304,36 +377,55 @@ async def get_stats():
 # ============ Digest ============
 
 @router.get("/digest")
-async def get_daily_digest():
-    """오늘의 다이제스트 생성"""
-    async with async_session() as session:
-        # 오늘 수집된 고득점 콘텐츠
-        today = datetime.utcnow().date()
-        result = await session.execute(
-            select(Content)
-            .where(
-                and_(
-                    func.date(Content.created_at) == today,
-                    Content.is_analyzed == True,
-                    Content.ai_share_score >= 60
-                )
-            )
-            .options(selectinload(Content.keyword))
-            .order_by(desc(Content.ai_share_score))
-            .limit(20)
-        )
-        contents = result.scalars().all()
-        
-        if not contents:
-            return {"digest": "오늘 수집된 고득점 콘텐츠가 없습니다.", "contents": []}
-        
-        # 다이제스트 생성
-        content_dicts = [c.to_dict() for c in contents]
-        digest_text = await analyzer.generate_daily_digest(content_dicts)
-        
-        return {
-            "digest": digest_text,
-            "contents": content_dicts,
-            "date": today.isoformat()
-        }
+async def get_daily_digest(keyword_id: Optional[int] = None):
+    """오늘의 다이제스트 (저장된 다이제스트가 현재 고득점 콘텐츠로 만든 것이면 그대로 반환)"""
+    return await daily_digests.get(keyword_id=keyword_id or 0)
+
+@router.get("/digest/stream")
+async def stream_daily_digest(keyword_id: Optional[int] = None):
+    """오늘의 다이제스트 (Server-Sent Events) - 콘텐츠 목록을 먼저 보내고 다이제스트를 생성되는 대로 전송"""
+    async def events():
+        async for event, data in daily_digests.stream(keyword_id=keyword_id or 0):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # 프록시 버퍼링 없이 바로 전달
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============ System ============
+
+@router.get("/system/http")
+async def get_http_stats():
+    """공유 HTTP 클라이언트 커넥션 풀, 조건부 GET 캐시, 요청 병합, URL 해석 / 본문 추출 / 트랜스크립트 통계"""
+    return {
+        **http_client.stats(),
+        "singleflight": singleflight.stats(),
+        "conditional_cache": conditional_cache.stats(),
+        "url_resolver": url_resolver.stats(),
+        "article_extractor": article_extractor.stats(),
+        "transcripts": transcript_fetcher.stats()
+    }
+
+@router.get("/system/hosts")
+async def get_host_states():
+    """호스트별 서킷 브레이커 상태 및 속도 제한 설정"""
+    return host_guard.stats()
+
+@router.get("/system/llm")
+async def get_llm_stats():
+    """LLM 요청 제한 상태, 분석 처리량 (최근 1분 요청/토큰 수, 429 횟수, 대기 시간), 분석 캐시 적중률, 관련도 필터, 다이제스트 재사용"""
+    return {
+        **llm_limiter.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "relevance": relevance_scorer.stats(),
+        "digests": daily_digests.stats()
+    }
 
+@router.post("/system/hosts/reset")
+async def reset_host_breakers(host: Optional[str] = None):
+    """서킷 브레이커 초기화 (host 미지정 시 전체)"""
+    host_guard.reset(host)
+    return {"status": "success"}
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import os
 from pathlib import Path
 
@@ -15,11 +15,133 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/research.db"
+    database_echo: bool = False  # SQL 문 로그 출력 (debug와 별개)
+    
+    # SQLite 프로필 (연결할 때마다 PRAGMA 적용)
+    sqlite_journal_mode: str = "wal"  # wal: 쓰는 중에도 읽기가 막히지 않음 (SQLite 기본값은 delete)
+    sqlite_synchronous: str = "normal"  # WAL에서는 normal로도 손상되지 않음 (전원 장애 시 마지막 커밋만 유실 가능)
+    sqlite_mmap_size: int = 268435456  # 메모리 매핑 크기 (바이트, 0이면 사용 안 함)
+    sqlite_busy_timeout_ms: int = 15000  # 잠금 대기 시간 (워커 프로세스 동시 쓰기)
+    sqlite_cache_size_kb: int = 65536  # 연결당 페이지 캐시 크기
+    
+    # 커넥션 풀 (PostgreSQL / SQLite 파일 DB), PostgreSQL 프로필 (asyncpg)
+    db_pool_size: int = 10  # 유지하는 연결 수
+    db_max_overflow: int = 20  # 부족할 때 추가로 여는 연결 수
+    db_pool_timeout: float = 30.0  # 연결을 기다리는 최대 시간 (초)
+    db_pool_recycle: int = 1800  # 연결 재생성 주기 (초)
+    db_pool_pre_ping: bool = True  # 사용 전 연결 확인 (DB 재시작 / 유휴 연결 끊김 대비)
+    db_statement_timeout_ms: int = 30000  # 쿼리 최대 실행 시간 (0이면 제한 없음)
+    db_connect_timeout: float = 10.0  # 연결 시간 제한 (초)
     
     # Research Settings
     daily_content_limit: int = 100
     research_schedule_hour: int = 9
     
+    # Research Jobs (백그라운드 리서치 실행)
+    research_progress_interval: float = 2.0  # 실행 로그에 진행 상황을 기록하는 주기 (초)
+    
+    # Research Workers (worker.py - 작업 큐 기반 멀티 프로세스 리서치)
+    research_mode: str = "inprocess"  # inprocess, workers (전체 리서치를 작업 큐에 등록하고 worker.py가 처리)
+    worker_processes: int = 4  # worker.py 기본 프로세스 수
+    worker_lease_seconds: float = 300.0  # 작업 임대 시간 (heartbeat가 없으면 만료 후 다른 워커가 회수)
+    worker_heartbeat_seconds: float = 30.0  # 임대 연장 주기
+    worker_max_attempts: int = 3  # 작업당 최대 임대 횟수 (넘으면 failed)
+    worker_poll_seconds: float = 5.0  # 큐가 비었을 때 다시 확인하는 주기 (--wait)
+    
+    # Concurrency
+    research_concurrent: bool = True  # 키워드/소스/언어/피드 단위 동시 수집
+    max_concurrency: int = 16  # 전체 동시 요청 수
+    max_concurrency_per_host: int = 4  # 호스트별 동시 요청 수
+    
+    # Rate Limiting / Circuit Breaker (호스트별)
+    rate_limit_rate: float = 5.0  # 호스트별 초당 요청 수 (기본값)
+    rate_limit_burst: int = 10  # 호스트별 순간 최대 요청 수 (기본값)
+    rate_limit_hosts: Dict[str, Tuple[float, int]] = {  # 호스트별 (초당 요청 수, burst)
+        "export.arxiv.org": (0.33, 1),  # arXiv 권장: 3초에 1회
+        "news.google.com": (1.0, 3),
+    }
+    retry_max_attempts: int = 3  # 일시적 오류 시 최대 시도 횟수
+    retry_backoff_base: float = 0.5  # 지수 백오프 시작값 (초)
+    retry_backoff_max: float = 10.0  # 백오프 최대값 (초)
+    breaker_failure_threshold: int = 3  # 연속 실패 시 차단
+    breaker_cooldown: float = 600.0  # 차단 유지 시간 (초)
+    
+    # HTTP Client (앱 전체 공유 커넥션 풀)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0  # 초
+    http_timeout: float = 30.0  # 초
+    http_connect_timeout: float = 10.0  # 초
+    http2: bool = False  # h2 패키지 필요
+    
+    # Pipeline (수집 → 정규화 → 저장 → 분석)
+    pipeline_queue_size: int = 100  # 단계 간 큐 크기 (backpressure)
+    pipeline_persist_batch: int = 50  # 저장 배치 크기
+    pipeline_analyze_workers: int = 8  # 동시 분석 작업 수 (실제 API 호출 수는 LLM 설정으로 제한)
+    
+    # AI Analysis
+    openai_model: str = "gpt-4o-mini"
+    openai_base_url: Optional[str] = None  # OpenAI 호환 서버 주소 (로컬 테스트 서버 등)
+    analysis_cache: bool = True  # 같은 글/조건의 분석 결과 재사용 (API 호출 없이)
+    analysis_cache_max_age_days: int = 180  # 이 기간 동안 쓰이지 않은 결과 삭제
+    analysis_cache_max_entries: int = 50000  # 초과 시 오래 쓰이지 않은 결과부터 삭제
+    
+    # Relevance Pre-filter (LLM 분석 전 로컬 관련도 점수)
+    relevance_filter: bool = True
+    relevance_threshold: float = 10.0  # 0-100, 미만이면 저순위 (키워드가 단어로 나오지 않으면 0)
+    relevance_action: str = "delay"  # delay: 다른 항목을 모두 분석한 뒤 분석, skip: 분석하지 않음
+    relevance_model: bool = True  # 과거 ai_share_score로 학습한 예상 공유 점수 함께 사용
+    relevance_model_min_samples: int = 200  # 학습에 필요한 최소 분석 건수
+    relevance_model_weight: float = 0.5  # 예상 공유 점수 가중치 (나머지는 BM25 관련도)
+    relevance_corpus_size: int = 5000  # 문서 빈도/학습에 쓰는 최근 콘텐츠 수
+    
+    # Content Budgeting (분석 요청 입력 토큰 예산)
+    analysis_input_tokens: int = 3000  # 요청당 콘텐츠 입력 토큰 예산 (기본값, 넘으면 청크 요약 후 분석)
+    analysis_input_tokens_models: Dict[str, int] = {}  # 모델별 입력 토큰 예산 (예: {"gpt-4o-mini": 12000})
+    analysis_compact_tokens: int = 400  # 이 이하의 짧은 콘텐츠는 간단한 프롬프트로 분석
+    analysis_chunk_summary_tokens: int = 300  # 청크 요약 1건의 최대 출력 토큰
+    
+    # Batched Analysis
+    analysis_batch_size: int = 1  # 한 요청에 묶어 분석할 콘텐츠 수 (1이면 개별 요청)
+    analysis_mode: str = "realtime"  # realtime, batch (일일 리서치의 미분석 항목을 배치 작업으로 제출)
+    analysis_batch_max_items: int = 5000  # 배치 작업 1건에 넣을 최대 콘텐츠 수
+    analysis_batch_poll_minutes: int = 10  # 배치 작업 상태 확인 주기 (분)
+    
+    # Daily Digest (날짜/키워드별로 저장, 대상 콘텐츠가 바뀔 때만 다시 생성)
+    digest_prebuild: bool = True  # 일일 리서치 직후 다이제스트 미리 생성
+    digest_prebuild_keywords: bool = False  # 활성 키워드별 다이제스트도 미리 생성
+    
+    # LLM Rate Limiting (OpenAI 분석 요청)
+    llm_concurrent: bool = True  # False면 분석 요청을 하나씩 보냄
+    llm_max_concurrency: int = 8  # 동시 요청 수
+    llm_rpm_limit: int = 500  # 분당 요청 수 (응답 헤더의 실제 한도가 더 낮으면 그 값 사용)
+    llm_tpm_limit: int = 200000  # 분당 토큰 수
+    llm_max_output_tokens: int = 1000  # 요청당 최대 출력 토큰 (호출 전 토큰 추정에 포함)
+    llm_max_retries: int = 5  # 429/5xx/연결 오류 시 재시도 횟수
+    
+    # Parsing (피드/HTML 파싱 워커 풀)
+    parse_executor: str = "process"  # process, thread
+    parse_workers: int = 2
+    
+    # URL Canonicalization (중복 판별)
+    url_resolve_redirects: bool = True  # Google News 등 리다이렉트 링크를 원문 URL로 해석
+    
+    # Near-duplicate Detection (유사 중복 콘텐츠는 대표 1건만 분석)
+    near_duplicate_detection: bool = True
+    near_duplicate_max_distance: int = 10  # 같은 글로 볼 SimHash 해밍 거리 (64비트 중)
+    near_duplicate_window_days: int = 7  # 비교 대상 기간
+    
+    # Article Extraction (뉴스/블로그 본문 추출)
+    article_extraction: bool = True
+    article_extraction_workers: int = 4  # 동시 추출 작업 수
+    article_fetch_timeout: float = 20.0  # 페이지당 제한 시간 (다운로드 + 추출, 초)
+    article_max_chars: int = 20000  # 저장할 본문 최대 길이
+    
+    # YouTube Transcripts (자막 가져오기 스레드 풀)
+    youtube_transcripts: bool = True
+    transcript_workers: int = 4  # 동시 요청 수
+    transcript_timeout: float = 20.0  # 영상당 제한 시간 (초)
+    
     # Paths
     base_dir: Path = Path(__file__).parent.parent
     data_dir: Path = base_dir / "data"
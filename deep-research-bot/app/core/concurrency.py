@@ -0,0 +1,72 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Dict, List, Any
+from urllib.parse import urlparse
+
+from app.config import settings
+
+class ConcurrencyLimiter:
+    """전역 및 호스트별 동시 요청 수 제한"""
+    
+    def __init__(self, max_concurrency: int, max_per_host: int):
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+    
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.max_per_host)
+        return self._hosts[host]
+    
+    @asynccontextmanager
+    async def limit(self, url: str):
+        """URL의 호스트 기준으로 슬롯을 확보한 뒤 실행"""
+        host = urlparse(url).netloc.lower()
+        async with self._host_semaphore(host):
+            async with self._global:
+                yield
+
+
+async def run_tasks(coros: List[Awaitable[Any]]) -> List[Any]:
+    """
+    작업 목록 실행
+    
+    동시 실행 모드에서는 함께 실행하고(실제 요청 수는 limiter가 제한),
+    아니면 기존처럼 하나씩 순서대로 실행한다. 개별 작업의 예외 처리는 호출자 책임.
+    """
+    if settings.research_concurrent:
+        return list(await asyncio.gather(*coros))
+    
+    results = []
+    for coro in coros:
+        results.append(await coro)
+    return results
+
+
+async def iter_completed(coros: List[Awaitable[Any]]) -> AsyncIterator[Any]:
+    """
+    작업 결과를 끝나는 순서대로 yield (run_tasks의 스트리밍 버전)
+    
+    순차 모드에서는 주어진 순서대로 실행한다. 소비자가 중간에 멈추면 남은 작업은 취소된다.
+    """
+    if not settings.research_concurrent:
+        for coro in coros:
+            yield await coro
+        return
+    
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+# Singleton instance
+limiter = ConcurrencyLimiter(
+    max_concurrency=settings.max_concurrency,
+    max_per_host=settings.max_concurrency_per_host
+)
@@ -0,0 +1,65 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+class ParseExecutor:
+    """
+    피드/HTML 파싱 전용 워커 풀
+    
+    feedparser, BeautifulSoup 같은 동기 파싱을 이벤트 루프 밖에서 실행해
+    수집 중에도 API 응답이 밀리지 않게 한다.
+    기본은 프로세스 풀(parse_executor="process"), 스레드 풀("thread")도 선택 가능.
+    프로세스 풀로 보내는 함수와 인자는 pickle 가능해야 한다.
+    """
+    
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self.mode = settings.parse_executor
+    
+    def _create(self) -> Executor:
+        if self.mode == "process":
+            try:
+                # 부모 프로세스의 이벤트 루프/스레드를 물려받지 않도록 spawn 사용
+                return ProcessPoolExecutor(
+                    max_workers=settings.parse_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            except Exception as e:
+                print(f"⚠️ 파싱 프로세스 풀 생성 실패, 스레드 풀 사용: {e}")
+                self.mode = "thread"
+        
+        return ThreadPoolExecutor(
+            max_workers=settings.parse_workers,
+            thread_name_prefix="parse"
+        )
+    
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._create()
+        return self._executor
+    
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """워커 풀에서 fn(*args, **kwargs) 실행"""
+        loop = asyncio.get_running_loop()
+        call = partial(fn, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(self.executor, call)
+        except BrokenProcessPool:
+            # 워커가 비정상 종료된 경우 풀을 새로 만들어 한 번 재시도
+            self.shutdown()
+            return await loop.run_in_executor(self.executor, call)
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+parse_executor = ParseExecutor()
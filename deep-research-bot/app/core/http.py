@@ -0,0 +1,117 @@
+import httpx
+from typing import Dict, Any, Optional
+
+from app.config import settings
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
+
+class HttpClientManager:
+    """
+    앱 전체에서 공유하는 HTTP 클라이언트
+    
+    FastAPI lifespan에서 start()/close()로 수명을 관리하고, 모든 수집기가 같은
+    커넥션 풀(keep-alive, 선택적 HTTP/2)과 타임아웃 정책을 사용한다.
+    lifespan 밖(스크립트 등)에서는 첫 사용 시 자동으로 생성된다.
+    """
+    
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2_enabled = False
+        self._reset_stats()
+    
+    def _reset_stats(self):
+        self.requests = 0
+        self.responses = 0
+        self.connections_opened = 0
+        self.http_versions: Dict[str, int] = {}
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        http2 = settings.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️ h2 패키지가 없어 HTTP/1.1로 동작합니다. (pip install h2)")
+                http2 = False
+        self.http2_enabled = http2
+        
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            event_hooks={
+                "request": [self._on_request],
+                "response": [self._on_response]
+            }
+        )
+    
+    async def start(self):
+        """클라이언트 생성 (lifespan 시작 시)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+            self._reset_stats()
+    
+    async def close(self):
+        """커넥션 풀 정리 (lifespan 종료 시)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+    
+    # ============ 커넥션 풀 통계 ============
+    
+    async def _on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+    
+    async def _on_response(self, response: httpx.Response):
+        self.responses += 1
+        version = response.http_version
+        self.http_versions[version] = self.http_versions.get(version, 0) + 1
+    
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        # 새 TCP 연결이 맺어질 때만 발생 - 나머지 요청은 기존 연결을 재사용한 것
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """커넥션 재사용 현황"""
+        connections = []
+        if self._client is not None:
+            pool = getattr(self._client._transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+        
+        reused = max(self.responses - self.connections_opened, 0)
+        
+        return {
+            "active": self._client is not None and not self._client.is_closed,
+            "http2_enabled": self.http2_enabled,
+            "requests": self.requests,
+            "responses": self.responses,
+            "connections_opened": self.connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / self.responses, 3) if self.responses else 0.0,
+            "http_versions": self.http_versions,
+            "pool_connections": len(connections),
+            "pool_idle_connections": sum(1 for c in connections if c.is_idle()),
+            "limits": {
+                "max_connections": settings.http_max_connections,
+                "max_keepalive_connections": settings.http_max_keepalive_connections,
+                "keepalive_expiry": settings.http_keepalive_expiry
+            }
+        }
+
+
+# Singleton instance
+http_client = HttpClientManager()
@@ -0,0 +1,295 @@
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from app.config import settings
+
+# sliding window 길이 (RPM/TPM 기준)
+WINDOW = 60.0
+
+# 재시도할 응답 코드 (429는 RateLimitError로 따로 처리)
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# "1s", "6m0s", "20ms", "1h2m3.5s" 형식의 리셋 시간
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """OpenAI 리셋 헤더 값을 초 단위로 변환"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _header_int(headers: httpx.Headers, name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 추정
+    
+    tiktoken이 설치되어 있으면 사용하고, 없으면 ASCII는 4자당 1토큰,
+    한글 등 그 외 문자는 1자당 1토큰으로 넉넉하게 잡는다.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def estimate_request_tokens(messages: List[Dict[str, str]], max_output_tokens: int) -> int:
+    """채팅 요청의 토큰 수 추정 (입력 + 메시지 오버헤드 + 최대 출력)"""
+    prompt_tokens = sum(estimate_tokens(m["content"]) + 4 for m in messages) + 3
+    return prompt_tokens + max_output_tokens
+
+
+class LLMRateLimiter:
+    """
+    LLM API 요청 제한기 (RPM + TPM + 동시 요청 수)
+    
+    최근 60초 동안 보낸 요청 수와 토큰 수(호출 전 추정치, 응답 후 실제 사용량으로 보정)를
+    설정한 한도 안으로 유지한다. 응답의 x-ratelimit-* 헤더로 실제 한도와 남은 양을 반영하고,
+    429를 받으면 retry-after(-ms) 또는 리셋 시간만큼 모든 요청을 멈춘 뒤
+    속도 배율을 절반으로 낮춘다 (성공할 때마다 조금씩 회복).
+    """
+    
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = asyncio.Lock()
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[List[float]] = deque()  # [시각, 토큰 수]
+        self._token_total = 0.0
+        self._completed: Deque[List[float]] = deque()  # [시각, 토큰 수] - 처리량 계산용
+        self._paused_until = 0.0
+        self.factor = 1.0  # 적응형 속도 배율 (0.1 ~ 1.0)
+        self.header_rpm: Optional[int] = None
+        self.header_tpm: Optional[int] = None
+        self.requests = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.tokens_estimated = 0
+        self.tokens_used = 0
+        self.waited = 0.0
+        self.latency = 0.0
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            concurrency = settings.llm_max_concurrency if settings.llm_concurrent else 1
+            self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        return self._semaphore
+    
+    def rpm_limit(self) -> int:
+        limit = settings.llm_rpm_limit
+        if self.header_rpm:
+            limit = min(limit, self.header_rpm)
+        return max(int(limit * self.factor), 1)
+    
+    def tpm_limit(self) -> int:
+        limit = settings.llm_tpm_limit
+        if self.header_tpm:
+            limit = min(limit, self.header_tpm)
+        return max(int(limit * self.factor), 1)
+    
+    def _trim(self, now: float):
+        while self._requests and now - self._requests[0] >= WINDOW:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= WINDOW:
+            self._token_total -= self._tokens.popleft()[1]
+        while self._completed and now - self._completed[0][0] >= WINDOW:
+            self._completed.popleft()
+    
+    async def _reserve(self, tokens: int) -> List[float]:
+        """요청 1건 + 추정 토큰을 한도 안에서 확보 (대기자는 순서대로)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._trim(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if len(self._requests) >= self.rpm_limit():
+                        wait = self._requests[0] + WINDOW - now
+                    elif self._tokens and self._token_total + tokens > self.tpm_limit():
+                        # 한 요청이 TPM보다 커도 창이 비면 보냄
+                        wait = self._tokens[0][0] + WINDOW - now
+                    else:
+                        entry = [now, float(tokens)]
+                        self._requests.append(now)
+                        self._tokens.append(entry)
+                        self._token_total += tokens
+                        return entry
+                self.waited += wait
+                await asyncio.sleep(wait)
+    
+    def _settle(self, entry: List[float], used: Optional[int]):
+        """추정 토큰을 실제 사용량으로 보정"""
+        if used is None:
+            return
+        if any(e is entry for e in self._tokens):
+            self._token_total += used - entry[1]
+        entry[1] = float(used)
+    
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def _observe(self, headers: httpx.Headers, next_tokens: int):
+        """x-ratelimit-* 헤더 반영 - 실제 한도 갱신, 남은 양이 부족하면 리셋까지 대기"""
+        limit_requests = _header_int(headers, "x-ratelimit-limit-requests")
+        limit_tokens = _header_int(headers, "x-ratelimit-limit-tokens")
+        if limit_requests:
+            self.header_rpm = limit_requests
+        if limit_tokens:
+            self.header_tpm = limit_tokens
+        
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests <= 0:
+            self._pause(parse_duration(headers.get("x-ratelimit-reset-requests")) or 1.0)
+        
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and remaining_tokens < next_tokens:
+            self._pause(parse_duration(headers.get("x-ratelimit-reset-tokens")) or 1.0)
+    
+    @staticmethod
+    def _retry_after(headers: httpx.Headers) -> Optional[float]:
+        """429 응답의 대기 시간 (retry-after-ms → retry-after → 리셋 헤더 순)"""
+        value = headers.get("retry-after-ms")
+        if value:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = parse_duration(headers.get("retry-after"))
+        if value is not None:
+            return value
+        resets = [
+            parse_duration(headers.get(name))
+            for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        ]
+        resets = [r for r in resets if r is not None]
+        return max(resets) if resets else None
+    
+    async def run(self, request: Callable[[], Awaitable[Any]], estimated_tokens: int) -> Any:
+        """
+        요청 실행 (한도 확보 → 호출 → 헤더 반영, 일시적 오류는 재시도)
+        
+        Args:
+            request: openai with_raw_response 호출을 반환하는 함수
+            estimated_tokens: 호출 전 추정 토큰 수 (입력 + 최대 출력)
+        
+        Returns:
+            파싱된 응답 객체
+        """
+        attempts = max(settings.llm_max_retries, 0) + 1
+        
+        async with self.semaphore:
+            for attempt in range(attempts):
+                entry = await self._reserve(estimated_tokens)
+                self.requests += 1
+                self.tokens_estimated += estimated_tokens
+                started = time.monotonic()
+                
+                try:
+                    raw = await request()
+                except RateLimitError as e:
+                    self._settle(entry, 0)
+                    self.rate_limited += 1
+                    # 모든 요청을 멈추고 속도를 절반으로
+                    self.factor = max(self.factor * 0.5, 0.1)
+                    delay = self._retry_after(e.response.headers)
+                    if delay is None:
+                        delay = self._backoff_delay(attempt)
+                    self._pause(delay)
+                    print(f"⚠️ LLM 속도 제한: {delay:.1f}초 대기 (배율 {self.factor:.2f})")
+                    if attempt == attempts - 1:
+                        self.failed += 1
+                        raise
+                    self.retries += 1
+                    continue
+                except (APIConnectionError, APITimeoutError, APIStatusError) as e:
+                    self._settle(entry, 0)
+                    retryable = not isinstance(e, APIStatusError) or e.status_code in RETRY_STATUS_CODES
+                    if not retryable or attempt == attempts - 1:
+                        self.failed += 1
+                        raise
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    continue
+                
+                response = raw.parse()
+                usage = getattr(response, "usage", None)
+                used = usage.total_tokens if usage else None
+                self._settle(entry, used)
+                self._observe(raw.headers, estimated_tokens)
+                
+                now = time.monotonic()
+                self.succeeded += 1
+                self.tokens_used += used or estimated_tokens
+                self.latency += now - started
+                self._completed.append([now, float(used or estimated_tokens)])
+                self.factor = min(self.factor + 0.05, 1.0)
+                return response
+    
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(settings.retry_backoff_max, settings.retry_backoff_base * 2 ** attempt))
+    
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._trim(now)
+        return {
+            "concurrency": settings.llm_max_concurrency if settings.llm_concurrent else 1,
+            "rpm_limit": self.rpm_limit(),
+            "tpm_limit": self.tpm_limit(),
+            "factor": round(self.factor, 2),
+            "paused_for": round(max(self._paused_until - now, 0.0), 1),
+            "window_requests": len(self._requests),
+            "window_tokens": int(self._token_total),
+            # 최근 60초 처리량
+            "requests_per_minute": len(self._completed),
+            "tokens_per_minute": int(sum(tokens for _, tokens in self._completed)),
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "tokens_estimated": self.tokens_estimated,
+            "tokens_used": self.tokens_used,
+            "waited_seconds": round(self.waited, 1),
+            "avg_latency": round(self.latency / self.succeeded, 2) if self.succeeded else None
+        }
+
+
+# Singleton instance
+llm_limiter = LLMRateLimiter()
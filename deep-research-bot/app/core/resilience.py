@@ -0,0 +1,269 @@
+import asyncio
+import random
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.concurrency import limiter
+from app.config import settings
+
+# 재시도할 응답 코드 (호스트 장애/과부하로 간주)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 브레이커에 아무것도 기록하지 않는 응답 코드 - 해당 URL만의 문제라 호스트 상태와 무관
+# (나머지 4xx는 재시도해도 같으므로 바로 실패 1회: 403 차단, 401 인증 오류 등)
+URL_ERROR_STATUS_CODES = {404, 410}
+
+# 재시도할 예외 (연결/타임아웃 등 일시적 오류)
+RETRY_EXCEPTIONS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class CircuitOpenError(Exception):
+    """차단된 호스트로의 요청"""
+    
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} 차단 중 ({retry_in:.0f}초 후 재시도)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """토큰 버킷 - 초당 rate개씩 채워지고 최대 burst개까지 모임"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 0.001)
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self):
+        """토큰 1개 확보 (없으면 채워질 때까지 대기, 대기자는 순서대로)"""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class CircuitBreaker:
+    """
+    호스트별 서킷 브레이커
+    
+    closed: 정상 / open: 연속 실패로 차단 (cooldown 동안 즉시 실패) /
+    half_open: cooldown 후 한 번 시험 요청 - 성공하면 closed, 실패하면 다시 open
+    """
+    
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_progress = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[datetime] = None
+    
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(self.cooldown - (time.monotonic() - self.opened_at), 0.0)
+    
+    def before_request(self, host: str):
+        """요청 가능 여부 확인 (차단 중이면 CircuitOpenError)"""
+        if self.state == "open":
+            if self.retry_in() > 0:
+                self.total_rejected += 1
+                raise CircuitOpenError(host, self.retry_in())
+            self.state = "half_open"
+            self.trial_in_progress = False
+        
+        if self.state == "half_open":
+            # 시험 요청은 하나만 - 나머지는 결과가 나올 때까지 차단
+            if self.trial_in_progress:
+                self.total_rejected += 1
+                raise CircuitOpenError(host, 0)
+            self.trial_in_progress = True
+    
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+    
+    def release_trial(self):
+        """결과 없이 끝난 요청 (취소, 재시도 대상이 아닌 오류) - 시험 요청이었으면 다음 요청이 시험하도록"""
+        self.trial_in_progress = False
+    
+    def record_failure(self, error: str):
+        self.failures += 1
+        self.total_failures += 1
+        self.last_error = error
+        self.last_failure_at = datetime.utcnow()
+        self.trial_in_progress = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"⚠️ 호스트 차단: {error} ({self.cooldown:.0f}초)")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": round(self.retry_in(), 1) if self.state == "open" else 0.0,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "last_error": self.last_error,
+            "last_failure_at": self.last_failure_at.isoformat() if self.last_failure_at else None
+        }
+
+
+class HostGuard:
+    """
+    수집기 HTTP 요청 보호 계층 (호스트별 토큰 버킷 + 서킷 브레이커 + 재시도)
+    
+    호스트별 요청 속도를 제한하고(arXiv 권장 간격, Google News 버스트 제한 등),
+    일시적 오류는 지수 백오프 + jitter로 재시도한다. 계속 실패하는 호스트는 cooldown 동안
+    요청 없이 바로 실패시켜 죽은 피드가 매번 타임아웃만큼 실행을 붙잡지 않게 한다.
+    """
+    
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+    
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+    
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            rate, burst = settings.rate_limit_hosts.get(
+                host, (settings.rate_limit_rate, settings.rate_limit_burst)
+            )
+            self._buckets[host] = TokenBucket(rate, burst)
+        return self._buckets[host]
+    
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(
+                settings.breaker_failure_threshold, settings.breaker_cooldown
+            )
+        return self._breakers[host]
+    
+    async def get(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        """
+        보호 계층을 거친 GET
+        
+        재시도 후에도 5xx/429이면 마지막 응답을 그대로 반환한다 (처리는 호출자 몫).
+        
+        브레이커 기록: 2xx/3xx는 성공, 404/410은 기록 없음, 그 밖의 4xx와 재시도 후에도
+        남은 5xx/429, 연결 오류는 실패.
+        """
+        host = self.host_of(url)
+        breaker = self.breaker(host)
+        attempts = max(settings.retry_max_attempts, 1)
+        
+        # 브레이커에는 재시도를 포함한 논리 요청 하나당 결과 하나만 기록
+        # (URL 하나가 계속 실패한다고 호스트 전체가 바로 차단되지 않게)
+        breaker.before_request(host)
+        succeeded = False
+        failure: Optional[str] = None
+        try:
+            for attempt in range(attempts):
+                await self.bucket(host).acquire()
+                
+                try:
+                    async with limiter.limit(url):
+                        response = await client.get(url, **kwargs)
+                except RETRY_EXCEPTIONS as e:
+                    if attempt == attempts - 1 or breaker.state == "open":
+                        failure = f"{host}: {type(e).__name__}"
+                        raise
+                    await self._backoff(attempt)
+                    continue
+                
+                status = response.status_code
+                if status not in RETRY_STATUS_CODES:
+                    if status < 400:
+                        succeeded = True
+                    elif status not in URL_ERROR_STATUS_CODES:
+                        failure = f"{host}: HTTP {status}"
+                    return response
+                
+                if attempt == attempts - 1 or breaker.state == "open":
+                    failure = f"{host}: HTTP {response.status_code}"
+                    return response
+                await self._backoff(attempt, self._retry_after(response))
+            
+            return response
+        finally:
+            # 취소 / 그 밖의 예외로 끝나도 시험 요청 표시가 남지 않게
+            if succeeded:
+                breaker.record_success()
+            elif failure:
+                breaker.record_failure(failure)
+            else:
+                breaker.release_trial()
+    
+    async def _backoff(self, attempt: int, retry_after: Optional[float] = None):
+        """지수 백오프 + full jitter (Retry-After가 있으면 그만큼 이상 대기)"""
+        self.retries += 1
+        delay = random.uniform(0, min(settings.retry_backoff_max, settings.retry_backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, settings.retry_backoff_max))
+        await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        # HTTP 날짜 형식
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
+    
+    def reset(self, host: Optional[str] = None):
+        """브레이커 초기화 (host가 없으면 전체)"""
+        if host is None:
+            self._breakers.clear()
+        else:
+            self._breakers.pop(host, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "open_hosts": sorted(h for h, b in self._breakers.items() if b.state == "open"),
+            "hosts": {
+                host: {
+                    **breaker.to_dict(),
+                    "rate": self.bucket(host).rate,
+                    "burst": self.bucket(host).burst
+                }
+                for host, breaker in sorted(self._breakers.items())
+            }
+        }
+
+
+# Singleton instance
+host_guard = HostGuard()
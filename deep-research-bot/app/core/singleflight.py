@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """요청 식별 키 (메서드 + URL + 파라미터)"""
+    return (method.upper(), url, tuple(sorted((params or {}).items())))
+
+
+class FlightScope:
+    """실행 범위 - 이 범위 안에서 완료된 결과와 절약 횟수"""
+    
+    def __init__(self):
+        self.results: Dict[Hashable, Any] = {}
+        self.calls = 0  # 실제로 실행한 요청
+        self.shared = 0  # 진행 중인 같은 요청에 합류
+        self.reused = 0  # 이미 완료된 같은 요청의 결과 재사용
+    
+    @property
+    def saved(self) -> int:
+        return self.shared + self.reused
+    
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "shared": self.shared, "reused": self.reused, "saved": self.saved}
+
+
+class SingleFlight:
+    """
+    동일 요청 병합 (singleflight)
+    
+    같은 키의 요청이 동시에 들어오면 하나만 실행하고 나머지는 그 결과를 함께 받는다.
+    scope() 안(리서치 실행 단위)에서는 완료된 결과도 보관해, 언어만 다른 arXiv 검색이나
+    키워드가 겹치는 검색처럼 실행 중 반복되는 같은 요청을 다시 보내지 않는다.
+    실패한 요청은 보관하지 않는다.
+    """
+    
+    def __init__(self):
+        self._scope: ContextVar[Optional[FlightScope]] = ContextVar("singleflight_scope", default=None)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+        self.reused = 0
+    
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator[FlightScope]:
+        """실행 범위 시작 - 범위 안에서 생성된 태스크도 같은 결과 보관소를 사용"""
+        scope = FlightScope()
+        token = self._scope.set(scope)
+        try:
+            yield scope
+        finally:
+            self._scope.reset(token)
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key에 대해 fn()을 한 번만 실행하고 결과를 공유"""
+        scope = self._scope.get()
+        
+        if scope is not None and key in scope.results:
+            self.reused += 1
+            scope.reused += 1
+            return scope.results[key]
+        
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.shared += 1
+            if scope is not None:
+                scope.shared += 1
+            # 먼저 요청한 쪽이 취소되어도 결과를 기다리는 쪽에는 영향 없음
+            return await asyncio.shield(flight)
+        
+        self.calls += 1
+        if scope is not None:
+            scope.calls += 1
+        
+        flight = asyncio.ensure_future(fn())
+        self._inflight[key] = flight
+        flight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        result = await asyncio.shield(flight)
+        if scope is not None:
+            scope.results[key] = result
+        return result
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "reused": self.reused,
+            "saved": self.shared + self.reused,
+            "in_flight": len(self._inflight)
+        }
+
+
+# Singleton instance
+singleflight = SingleFlight()
@@ -1,5 +1,13 @@
 # Models Package
-from .database import Keyword, Content, ResearchLog, init_db, get_session, async_session
+from .database import (
+    Keyword, Content, ResearchLog, HttpCache, UrlRedirect, ArticleBody, VideoTranscript, FeedWatermark,
+    AnalysisCacheEntry, AnalysisBatch, DailyDigest, WorkUnit, SchemaMigration,
+    init_db, get_session, async_session, insert_ignore_conflicts
+)
 
-__all__ = ["Keyword", "Content", "ResearchLog", "init_db", "get_session", "async_session"]
+__all__ = [
+    "Keyword", "Content", "ResearchLog", "HttpCache", "UrlRedirect", "ArticleBody", "VideoTranscript", "FeedWatermark",
+    "AnalysisCacheEntry", "AnalysisBatch", "DailyDigest", "WorkUnit", "SchemaMigration",
+    "init_db", "get_session", "async_session", "insert_ignore_conflicts"
+]
 
@@ -1,8 +1,11 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Text, Date, DateTime, Float, Boolean, ForeignKey, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event, make_url, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from datetime import datetime
+from typing import Optional
 import json
 
 Base = declarative_base()
@@ -35,6 +38,19 @@ class Keyword(Base):
 class Content(Base):
     """수집된 콘텐츠 모델"""
     __tablename__ = "contents"
+    __table_args__ = (
+        # 콘텐츠 목록 기본 조회 (분석 완료 + 정렬), 대시보드 통계, 다이제스트
+        Index("ix_contents_analyzed_score", "is_analyzed", "ai_share_score"),
+        Index("ix_contents_analyzed_published", "is_analyzed", "published_at"),
+        Index("ix_contents_analyzed_created", "is_analyzed", "created_at"),
+        # 키워드/소스/언어/즐겨찾기 필터 + 점수 정렬, 키워드별 미분석 항목 조회
+        Index("ix_contents_keyword_analyzed_score", "keyword_id", "is_analyzed", "ai_share_score"),
+        Index("ix_contents_source_analyzed_score", "source_type", "is_analyzed", "ai_share_score"),
+        Index("ix_contents_language_analyzed_score", "language", "is_analyzed", "ai_share_score"),
+        Index("ix_contents_starred_analyzed_score", "is_starred", "is_analyzed", "ai_share_score"),
+        # 최근 수집분 조회 (유사 중복 인덱스 적재)
+        Index("ix_contents_created", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     keyword_id = Column(Integer, ForeignKey("keywords.id"), nullable=False)
@@ -42,6 +58,9 @@ class Content(Base):
     # 기본 정보
     title = Column(String(500), nullable=False)
     url = Column(String(1000), nullable=False, unique=True)
+    canonical_url = Column(String(1000), nullable=True, index=True)  # 중복 판별용 정규화 URL
+    simhash = Column(String(16), nullable=True)  # 제목+설명 SimHash (hex)
+    duplicate_of = Column(Integer, ForeignKey("contents.id"), nullable=True, index=True)  # 유사 중복이면 대표 콘텐츠 ID
     source_type = Column(String(50), nullable=False)  # youtube, news, blog, paper, podcast
     source_name = Column(String(200), nullable=True)  # 출처명
     language = Column(String(10), default="ko")  # ko, en
@@ -59,6 +78,10 @@ class Content(Base):
     ai_share_score = Column(Float, nullable=True)  # 0-100
     ai_share_reason = Column(Text, nullable=True)
     
+    # 분석 전 로컬 관련도 (BM25 + 공유 점수 모델, 0-100)
+    relevance_score = Column(Float, nullable=True)
+    is_low_priority = Column(Boolean, default=False)  # 기준 미만 - 나중에 분석하거나 건너뜀
+    
     # 메타데이터
     is_analyzed = Column(Boolean, default=False)
     is_starred = Column(Boolean, default=False)
@@ -67,6 +90,7 @@ class Content(Base):
     
     # Relationships
     keyword = relationship("Keyword", back_populates="contents")
+    representative = relationship("Content", remote_side=[id])
     
     def to_dict(self):
         return {
@@ -86,7 +110,10 @@ class Content(Base):
             "ai_business_relevance": self.ai_business_relevance,
             "ai_share_score": self.ai_share_score,
             "ai_share_reason": self.ai_share_reason,
+            "relevance_score": self.relevance_score,
+            "is_low_priority": bool(self.is_low_priority),
             "is_analyzed": self.is_analyzed,
+            "duplicate_of": self.duplicate_of,
             "is_starred": self.is_starred,
             "is_shared": self.is_shared,
             "created_at": self.created_at.isoformat() if self.created_at else None
@@ -96,36 +123,287 @@ class Content(Base):
 class ResearchLog(Base):
     """리서치 실행 로그"""
     __tablename__ = "research_logs"
+    __table_args__ = (
+        # 대기/실행 중인 실행은 범위당 하나 - 여러 프로세스가 동시에 등록해도 하나만 들어감
+        Index(
+            "uq_research_logs_active_scope", "scope", unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
-    status = Column(String(20), default="running")  # running, completed, failed
-    total_found = Column(Integer, default=0)
+    status = Column(String(20), default="running")  # queued, running, completed, failed, cancelled
+    scope = Column(String(50), default="all")  # all, keyword:{id}, workers (worker.py 작업 큐)
+    total_found = Column(Integer, default=0)  # 새로 저장된 콘텐츠 수
+    total_skipped = Column(Integer, default=0)  # 이미 저장되어 건너뛴 콘텐츠 수
     total_analyzed = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
     
+    # 실행 중 진행 상황 (파이프라인이 주기적으로 기록)
+    current_keyword = Column(String(100), nullable=True)
+    progress = Column(Text, nullable=True)  # JSON (단계별 건수, 수집 단위 수, 예상 남은 시간)
+    updated_at = Column(DateTime, nullable=True)
+    
     def to_dict(self):
         return {
             "id": self.id,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "status": self.status,
+            "scope": self.scope,
             "total_found": self.total_found,
+            "total_skipped": self.total_skipped,
             "total_analyzed": self.total_analyzed,
-            "error_message": self.error_message
+            "error_message": self.error_message,
+            "current_keyword": self.current_keyword,
+            "progress": json.loads(self.progress) if self.progress else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
 
 
+class WorkUnit(Base):
+    """워커 작업 큐 - 리서치 실행 1건을 키워드 × 소스 단위로 나눈 작업 (임대 만료 시 다른 워커가 회수)"""
+    __tablename__ = "work_units"
+    __table_args__ = (UniqueConstraint("log_id", "keyword_id", "source_type"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    log_id = Column(Integer, ForeignKey("research_logs.id"), nullable=False, index=True)
+    keyword_id = Column(Integer, ForeignKey("keywords.id"), nullable=False)
+    source_type = Column(String(50), nullable=False)
+    status = Column(String(20), default="pending", index=True)  # pending, leased, done, failed, cancelled
+    worker_id = Column(String(100), nullable=True)  # 호스트명:PID
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0)  # 임대 횟수 (회수되면 다시 증가)
+    found = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)
+    analyzed = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class HttpCache(Base):
+    """조건부 GET 캐시 - URL별 검증자(ETag/Last-Modified)와 본문, 파싱 요약"""
+    __tablename__ = "http_cache"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    url = Column(String(1000), nullable=False, unique=True)
+    etag = Column(String(500), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    body_hash = Column(String(64), nullable=True)  # sha256
+    body = Column(Text, nullable=True)  # 304 응답 시 다시 파싱할 원문
+    parsed_items = Column(Text, nullable=True)  # JSON array (피드는 엔트리 식별 정보)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class UrlRedirect(Base):
+    """리다이렉트 URL(Google News 등) 해석 결과 캐시"""
+    __tablename__ = "url_redirects"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_url = Column(String(1000), nullable=False, unique=True)
+    resolved_url = Column(String(1000), nullable=True)  # 해석 실패 시 NULL
+    resolved_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArticleBody(Base):
+    """기사 본문 추출 캐시 - 정규화 URL별 본문 (zlib 압축)"""
+    __tablename__ = "article_bodies"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    canonical_url = Column(String(1000), nullable=False, unique=True)
+    body = Column(LargeBinary, nullable=True)  # 추출 실패 시 NULL
+    text_length = Column(Integer, default=0)  # 압축 전 글자 수
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+
+class VideoTranscript(Base):
+    """유튜브 트랜스크립트 캐시 - 자막이 없는 영상도 기록해 다시 요청하지 않음"""
+    __tablename__ = "video_transcripts"
+    __table_args__ = (UniqueConstraint("video_id", "language"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    video_id = Column(String(20), nullable=False)
+    language = Column(String(10), nullable=False)  # 요청 언어
+    transcript = Column(Text, nullable=True)  # 자막이 없으면 NULL
+    is_available = Column(Boolean, default=True)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+
+class FeedWatermark(Base):
+    """피드별(+조회 범위별) 마지막으로 처리한 엔트리 - 다음 실행은 이 엔트리 전까지만 처리"""
+    __tablename__ = "feed_watermarks"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    feed_key = Column(String(1200), nullable=False, unique=True)  # 조회 범위|언어|피드 URL
+    last_guid = Column(String(1000), nullable=True)  # 가장 최근 엔트리 id/GUID
+    last_published_at = Column(DateTime, nullable=True)  # 가장 최근 발행 시각
+    content_hash = Column(String(64), nullable=True)  # 가장 최근 엔트리 내용 해시
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AnalysisCacheEntry(Base):
+    """AI 분석 결과 캐시 - (정규화 제목+내용, 유형, 키워드, 언어, 모델, 프롬프트 버전) 해시별 결과"""
+    __tablename__ = "analysis_cache"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cache_key = Column(String(64), nullable=False, unique=True)  # sha256
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    result = Column(Text, nullable=False)  # JSON (summary, insights, business_relevance, share_score, share_reason)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class AnalysisBatch(Base):
+    """OpenAI 배치 작업 - 제출한 콘텐츠 목록과 진행 상태 (완료되면 결과를 가져와 반영)"""
+    __tablename__ = "analysis_batches"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    batch_id = Column(String(100), nullable=False, unique=True)
+    input_file_id = Column(String(100), nullable=False)
+    output_file_id = Column(String(100), nullable=True)
+    error_file_id = Column(String(100), nullable=True)
+    status = Column(String(30), default="validating")  # OpenAI 배치 상태, 결과 반영 후 ingested
+    content_ids = Column(Text, nullable=False)  # 요청별 콘텐츠 ID 묶음 (JSON [[id, ...], ...])
+    request_count = Column(Integer, default=0)
+    analyzed_count = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "content_count": sum(len(group) for group in json.loads(self.content_ids)) if self.content_ids else 0,
+            "request_count": self.request_count,
+            "analyzed_count": self.analyzed_count,
+            "error_message": self.error_message,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+        }
+
+
+class DailyDigest(Base):
+    """일일 다이제스트 - 날짜/키워드 필터별로 저장하고 대상 콘텐츠가 바뀔 때만 다시 생성"""
+    __tablename__ = "daily_digests"
+    __table_args__ = (UniqueConstraint("digest_date", "keyword_id"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    digest_date = Column(Date, nullable=False)  # 콘텐츠 수집일 (UTC)
+    keyword_id = Column(Integer, nullable=False, default=0)  # 0이면 전체 키워드
+    content_ids = Column(Text, nullable=False)  # 생성에 쓴 콘텐츠 ID (JSON [id, ...], 점수 순)
+    digest = Column(Text, nullable=False)
+    model = Column(String(100), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SchemaMigration(Base):
+    """적용된 스키마 마이그레이션 (app/models/migrations.py)"""
+    __tablename__ = "schema_migrations"
+    
+    version = Column(Integer, primary_key=True)
+    description = Column(String(200), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
 # Database initialization
 from app.config import settings
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+def sqlite_pragmas() -> dict:
+    """SQLite 연결 설정 (PRAGMA 이름 -> 값)"""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": -settings.sqlite_cache_size_kb,  # 음수 = KiB 단위
+    }
+
+def create_database_engine(url: Optional[str] = None, pragmas: Optional[dict] = None, **options):
+    """
+    DB 프로필을 적용한 엔진 생성
+    
+    SQLite: 연결할 때마다 PRAGMA 적용 (기본 WAL - 리서치 실행 중에도 대시보드 조회가 막히지 않음), 파일 DB는 커넥션 풀 사용
+    PostgreSQL (asyncpg): 커넥션 풀 크기 / 초과 연결 / 사용 전 확인 / 쿼리 시간 제한
+    pragmas로 SQLite 설정 일부를, options로 create_async_engine 인자를 덮어쓸 수 있다 (벤치마크 등).
+    """
+    url = make_url(url or settings.database_url)
+    engine_options = {"echo": settings.database_echo}
+    
+    if url.get_backend_name() == "postgresql":
+        engine_options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+        if url.get_driver_name() == "asyncpg":
+            server_settings = {}
+            if settings.db_statement_timeout_ms:
+                server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+            engine_options["connect_args"] = {
+                "timeout": settings.db_connect_timeout,
+                "server_settings": server_settings,
+            }
+    elif url.get_backend_name() == "sqlite":
+        pragmas = {**sqlite_pragmas(), **(pragmas or {})}
+        # 첫 PRAGMA 전에도 잠금을 기다리도록 드라이버 timeout도 같게
+        engine_options["connect_args"] = {"timeout": pragmas["busy_timeout"] / 1000}
+        if url.database and url.database != ":memory:":
+            # aiosqlite 기본값(NullPool)은 세션마다 새로 연결해 PRAGMA / 페이지 캐시가 매번 버려짐
+            engine_options.update(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+            )
+    
+    engine_options.update(options)
+    engine = create_async_engine(url, **engine_options)
+    
+    if url.get_backend_name() == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+    
+    return engine
+
+engine = create_database_engine()
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+def insert_ignore_conflicts(model, dialect_name: str, index_elements: list):
+    """INSERT ... ON CONFLICT DO NOTHING 문 생성 (SQLite / PostgreSQL)"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"지원하지 않는 데이터베이스: {dialect_name}")
+    
+    return insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        
+        # create_all이 기존 테이블에 하지 않는 변경 (컬럼/인덱스 추가 등)
+        from app.models.migrations import run_migrations
+        await conn.run_sync(run_migrations)
     
     # Add default keywords
     async with async_session() as session:
@@ -0,0 +1,219 @@
+"""
+스키마 마이그레이션
+
+create_all은 없는 테이블만 만들고 기존 테이블에는 인덱스를 추가하지 않는다. 그런 변경은
+MIGRATIONS에 버전 순으로 추가하면 init_db가 아직 적용되지 않은 것만 실행하고 schema_migrations에 기록한다.
+(기존 테이블에 컬럼을 추가할 때도 _add_columns로 마이그레이션을 추가)
+
+    python -m app.models.migrations status     # 적용 여부
+    python -m app.models.migrations upgrade    # 미적용 마이그레이션 실행 (서버 시작 시에도 실행됨)
+    python -m app.models.migrations explain    # 주요 조회의 실행 계획 - 인덱스를 타지 않으면 종료 코드 1
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from sqlalchemy import select, insert, update, delete, inspect, func
+from sqlalchemy.engine import Connection
+
+from app.models.database import Base, Content, HttpCache, ResearchLog, SchemaMigration, engine
+
+
+def _add_columns(model, *names: str) -> Callable[[Connection], None]:
+    """모델에 선언된 컬럼 중 기존 테이블에 없는 것 추가 (create_all로 새로 만든 테이블은 이미 있음)"""
+    def migrate(conn: Connection):
+        table = model.__table__
+        inspector = inspect(conn)
+        if not inspector.has_table(table.name):
+            return
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for name in names:
+            if name in existing:
+                continue
+            column_type = table.columns[name].type.compile(dialect=conn.dialect)
+            print(f"🛠️ 컬럼 추가: {table.name}.{name}")
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}")
+    return migrate
+
+
+def _create_missing_indexes(conn: Connection):
+    """모델에 선언된 인덱스 중 기존 테이블에 없는 것 생성"""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                print(f"🛠️ 인덱스 생성: {index.name}")
+                index.create(conn)
+
+
+def _clear_http_cache(conn: Connection):
+    """이전 형식의 피드 캐시 삭제 (저장 형식이 바뀌면 다음 실행에서 다시 받음)"""
+    if inspect(conn).has_table(HttpCache.__tablename__):
+        conn.execute(delete(HttpCache))
+
+
+def _reset_failed_analyses(conn: Connection):
+    """이전 버전이 분석 완료로 저장한 실패 결과를 미분석으로 되돌림 (다음 실행에서 다시 분석)"""
+    conn.execute(
+        update(Content)
+        .where(Content.ai_summary == "분석 실패")
+        .values(
+            ai_summary=None,
+            ai_insights=None,
+            ai_business_relevance=None,
+            ai_share_score=None,
+            ai_share_reason=None,
+            is_analyzed=False
+        )
+    )
+
+
+def _create_active_scope_index(conn: Connection):
+    """범위당 대기/실행 중 실행 로그 하나 - 이미 겹친 실행은 최신 것만 남기고 취소 후 유니크 인덱스 생성"""
+    active = ResearchLog.status.in_(("queued", "running"))
+    latest = (
+        select(func.max(ResearchLog.id))
+        .where(active, ResearchLog.scope.isnot(None))
+        .group_by(ResearchLog.scope)
+    )
+    conn.execute(
+        update(ResearchLog)
+        .where(active, ResearchLog.scope.isnot(None), ResearchLog.id.notin_(latest))
+        .values(status="cancelled", completed_at=datetime.utcnow(), error_message="중복 실행 정리")
+        .execution_options(synchronize_session=False)
+    )
+    _create_missing_indexes(conn)
+
+
+# (버전, 설명, 실행 함수) - 적용된 마이그레이션은 수정하지 말고 새 버전으로 추가
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "contents 컬럼 추가 (정규화 URL, SimHash, 유사 중복, 관련도)", _add_columns(
+        Content, "canonical_url", "simhash", "duplicate_of", "relevance_score", "is_low_priority"
+    )),
+    (2, "research_logs 컬럼 추가 (조회 범위, 건너뛴 수, 진행 상황)", _add_columns(
+        ResearchLog, "scope", "total_skipped", "current_keyword", "progress", "updated_at"
+    )),
+    (3, "기존 테이블에 없는 인덱스 생성 (contents 조회 인덱스 등)", _create_missing_indexes),
+    (4, "HTTP 캐시 초기화 (피드 캐시가 전체 파싱 결과를 저장하도록 변경)", _clear_http_cache),
+    (5, "http_cache 본문 컬럼 추가", _add_columns(HttpCache, "body")),
+    (6, "HTTP 캐시 초기화 (피드 캐시가 본문과 엔트리 식별 정보를 저장하도록 변경)", _clear_http_cache),
+    (7, "분석 실패로 저장된 콘텐츠를 미분석으로 되돌림", _reset_failed_analyses),
+    (8, "범위당 대기/실행 중 실행 로그 하나 (research_logs 유니크 인덱스)", _create_active_scope_index),
+]
+
+
+def run_migrations(conn: Connection) -> List[int]:
+    """미적용 마이그레이션 실행 (init_db의 트랜잭션 안에서)"""
+    applied = set(conn.execute(select(SchemaMigration.version)).scalars().all())
+    done = []
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        migrate(conn)
+        conn.execute(
+            insert(SchemaMigration).values(version=version, description=description, applied_at=datetime.utcnow())
+        )
+        print(f"🛠️ 마이그레이션 {version} 적용: {description}")
+        done.append(version)
+    return done
+
+
+def hot_queries() -> List[Tuple[str, object]]:
+    """
+    contents 주요 조회 (API 목록/통계, 다이제스트, 파이프라인, 배치 분석, 유사 중복) - 실행 계획 확인용
+    
+    실제 코드가 실행하는 쿼리 빌더를 그대로 쓴다 (조회가 바뀌면 점검도 함께 바뀌도록).
+    """
+    from app.api.routes import contents_query, analyzed_count_query, source_counts_query, daily_count_query
+    from app.services.analysis_batches import AnalysisBatchJobs
+    from app.services.digests import DailyDigests
+    from app.services.near_duplicates import NearDuplicateIndex
+    from app.services.pipeline import ResearchPipeline
+    
+    today = datetime.utcnow().date()
+    day_start = datetime.combine(today, datetime.min.time())
+    since = datetime.utcnow() - timedelta(days=7)
+    return [
+        ("목록 - 점수순", contents_query()),
+        ("목록 - 발행일순", contents_query(sort_by="published_at")),
+        ("목록 - 수집일순", contents_query(sort_by="created_at")),
+        ("목록 - 최소 점수", contents_query(min_score=80)),
+        ("목록 - 키워드", contents_query(keyword_id=1)),
+        ("목록 - 소스", contents_query(source_type="news")),
+        ("목록 - 언어", contents_query(language="ko")),
+        ("목록 - 즐겨찾기", contents_query(is_starred=True)),
+        ("통계 - 분석 완료 수", analyzed_count_query()),
+        ("통계 - 소스별 수", source_counts_query()),
+        ("통계 - 일별 수집량", daily_count_query(day_start)),
+        ("다이제스트 대상", DailyDigests.contents_query(today)),
+        ("다이제스트 대상 - 키워드", DailyDigests.contents_query(today, keyword_id=1)),
+        ("파이프라인 - 키워드별 미분석", ResearchPipeline.backlog_query([1, 2], ["news", "blog"])),
+        ("배치 분석 - 미분석", AnalysisBatchJobs.backlog_query()),
+        ("유사 중복 - 최근 수집분", NearDuplicateIndex.sync_query(0, since)),
+    ]
+
+
+def _plan(conn: Connection, statement) -> Tuple[List[str], bool]:
+    """(실행 계획, contents 전체 스캔 여부)"""
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        plan = [row[-1] for row in rows]
+        # SCAN contents (인덱스 없이) = 전체 스캔, SEARCH / SCAN ... USING INDEX = 인덱스 사용
+        full_scan = any(line.split()[:2] == ["SCAN", "contents"] and "INDEX" not in line for line in plan)
+    else:
+        # 행이 적으면 플래너가 순차 스캔을 고르므로 인덱스를 쓸 수 있는지만 확인
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = [row[0] for row in conn.exec_driver_sql(f"EXPLAIN {compiled}").all()]
+        full_scan = any("Seq Scan on contents" in line for line in plan)
+    return plan, full_scan
+
+
+def explain_hot_queries(conn: Connection) -> List[str]:
+    """주요 조회의 실행 계획 출력 - 전체 스캔하는 조회 이름 반환"""
+    full_scans = []
+    for name, statement in hot_queries():
+        plan, full_scan = _plan(conn, statement)
+        print(f"{'❌' if full_scan else '✅'} {name}")
+        for line in plan:
+            print(f"    {line}")
+        if full_scan:
+            full_scans.append(name)
+    return full_scans
+
+
+async def main(command: str) -> int:
+    from app.models.database import init_db
+    
+    if command == "upgrade":
+        await init_db()
+        return 0
+    
+    async with engine.begin() as conn:
+        if command == "status":
+            applied = {}
+            if await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(SchemaMigration.__tablename__)):
+                result = await conn.execute(select(SchemaMigration))
+                applied = {row.version: row.applied_at for row in result}
+            for version, description, _ in MIGRATIONS:
+                applied_at = applied.get(version)
+                print(f"{version:>4} {'적용 ' + applied_at.isoformat() if applied_at else '미적용'}  {description}")
+            return 0
+        
+        if command == "explain":
+            full_scans = await conn.run_sync(explain_hot_queries)
+            if full_scans:
+                print(f"전체 스캔 {len(full_scans)}건: {', '.join(full_scans)}")
+                return 1
+            return 0
+    
+    print(__doc__)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "")))
@@ -0,0 +1,285 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+import httpx
+from sqlalchemy import select, update, and_, desc
+from sqlalchemy.orm import selectinload
+
+from app.models.database import AnalysisBatch, Content, async_session
+from app.services.analyzer import analyzer, analysis_values
+from app.services.digests import daily_digests
+from app.config import settings
+
+# 결과가 아직 반영되지 않은 배치 작업 상태 (OpenAI 배치 상태)
+ACTIVE_STATUSES = ("validating", "in_progress", "finalizing", "cancelling", "completed")
+
+# 더 이상 진행되지 않는 상태 - 결과 파일이 있으면 (부분 결과라도) 반영
+FINISHED_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class AnalysisBatchJobs:
+    """
+    배치 작업으로 미분석 콘텐츠 분석
+    
+    미분석 대표 콘텐츠를 analysis_batch_size개씩 묶은 일괄 분석 요청으로 만들어 JSONL 파일 하나로 올리고
+    OpenAI 배치 작업을 생성한다. 주기적으로 상태를 확인해 완료되면 결과 파일을 받아 ai_* 컬럼과
+    분석 캐시에 반영한다. 배치 작업은 실시간 요청보다 단가가 낮고 RPM/TPM 한도를 쓰지 않는다.
+    결과에서 빠진 항목은 미분석으로 남아 다음 제출이나 실시간 분석에서 다시 처리된다.
+    입력 토큰 예산을 넘는 긴 콘텐츠는 청크 요약이 여러 단계 요청을 거쳐야 하므로 배치 파일에 넣지 않고
+    실시간으로 분석한다.
+    """
+    
+    ENDPOINT = "/v1/chat/completions"
+    
+    def __init__(self):
+        # 제출과 결과 반영이 겹치지 않게
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    def _groups(batch: AnalysisBatch) -> List[List[int]]:
+        return json.loads(batch.content_ids)
+    
+    async def pending_content_ids(self) -> Set[int]:
+        """결과를 기다리는 배치 작업에 들어간 콘텐츠 ID"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(AnalysisBatch.content_ids).where(AnalysisBatch.status.in_(ACTIVE_STATUSES))
+            )
+            return {
+                content_id
+                for (content_ids,) in result.all()
+                for group in json.loads(content_ids)
+                for content_id in group
+            }
+    
+    @staticmethod
+    def _item(content: Content) -> Dict[str, Any]:
+        return {
+            "id": content.id,
+            "title": content.title,
+            "content": content.content_text or content.description or "",
+            "source_type": content.source_type,
+            "keyword": content.keyword.name if content.keyword else "",
+            "language": content.language
+        }
+    
+    async def _load_items(self, content_ids) -> Dict[int, Dict[str, Any]]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(Content).options(selectinload(Content.keyword)).where(Content.id.in_(list(content_ids)))
+            )
+            return {content.id: self._item(content) for content in result.scalars().all()}
+    
+    @staticmethod
+    def _skipped() -> list:
+        # 관련도 건너뛰기 모드의 저순위 항목은 제출하지 않음
+        if settings.relevance_filter and settings.relevance_action == "skip":
+            return [Content.is_low_priority.isnot(True)]
+        return []
+    
+    @classmethod
+    def backlog_query(cls):
+        """제출 대상 (미분석 대표 콘텐츠) 조회 쿼리"""
+        return (
+            select(Content)
+            .options(selectinload(Content.keyword))
+            .where(and_(Content.is_analyzed == False, Content.duplicate_of.is_(None), *cls._skipped()))
+            .order_by(Content.id)
+        )
+    
+    async def submit(self) -> Dict[str, Any]:
+        """미분석 콘텐츠를 배치 작업 하나로 제출 (캐시된 결과는 바로 반영)"""
+        async with self._lock:
+            in_batch = await self.pending_content_ids()
+            async with async_session() as session:
+                result = await session.execute(self.backlog_query())
+                contents = [content for content in result.scalars().all() if content.id not in in_batch]
+            items = [self._item(content) for content in contents[:settings.analysis_batch_max_items]]
+            
+            pending = []
+            cached = 0
+            for item in items:
+                analysis = await analyzer.cached_analysis(item)
+                if analysis is None:
+                    pending.append(item)
+                    continue
+                await self._save(item["id"], analysis)
+                cached += 1
+            
+            groups, oversized = analyzer.batch_groups(pending)
+            if oversized:
+                await self._analyze_now(oversized)
+            
+            if not groups:
+                return {"status": "empty", "cached": cached, "realtime": len(oversized)}
+            
+            lines = [
+                json.dumps({
+                    "custom_id": f"group-{index}",
+                    "method": "POST",
+                    "url": self.ENDPOINT,
+                    "body": analyzer.batch_request_body(group)
+                }, ensure_ascii=False)
+                for index, group in enumerate(groups)
+            ]
+            
+            try:
+                uploaded = await analyzer.client.files.create(
+                    file=("analysis-batch.jsonl", "\n".join(lines).encode("utf-8")),
+                    purpose="batch"
+                )
+                response = await analyzer.client.post(
+                    "/batches",
+                    body={"input_file_id": uploaded.id, "endpoint": self.ENDPOINT, "completion_window": "24h"},
+                    cast_to=httpx.Response
+                )
+                created = response.json()
+            except Exception as e:
+                print(f"배치 작업 제출 오류: {e}")
+                return {"status": "error", "message": str(e), "cached": cached, "realtime": len(oversized)}
+            
+            async with async_session() as session:
+                session.add(AnalysisBatch(
+                    batch_id=created["id"],
+                    input_file_id=uploaded.id,
+                    status=created.get("status", "validating"),
+                    content_ids=json.dumps([[item["id"] for item in group] for group in groups]),
+                    request_count=len(groups)
+                ))
+                await session.commit()
+            
+            contents = sum(len(group) for group in groups)
+            print(f"📦 배치 작업 제출: {created['id']} (콘텐츠 {contents}건, 요청 {len(groups)}건)")
+            return {
+                "status": "submitted",
+                "batch_id": created["id"],
+                "contents": contents,
+                "requests": len(groups),
+                "cached": cached,
+                "realtime": len(oversized)
+            }
+    
+    async def _analyze_now(self, items: List[Dict[str, Any]]):
+        """긴 콘텐츠를 실시간으로 분석 (청크 요약 후 분석) - 실패 결과는 저장하지 않음"""
+        async def analyze(item):
+            analysis = await analyzer.analyze_content(
+                item["title"], item["content"], item["source_type"], item["keyword"], item["language"]
+            )
+            if analysis is not None:
+                await self._save(item["id"], analysis)
+        
+        await asyncio.gather(*(analyze(item) for item in items))
+        print(f"📦 긴 콘텐츠 {len(items)}건 실시간 분석")
+    
+    async def poll(self) -> List[Dict[str, Any]]:
+        """진행 중인 배치 작업 상태 확인 - 끝난 작업은 결과 반영"""
+        async with self._lock:
+            async with async_session() as session:
+                result = await session.execute(
+                    select(AnalysisBatch).where(AnalysisBatch.status.in_(ACTIVE_STATUSES))
+                )
+                batches = result.scalars().all()
+            
+            for batch in batches:
+                try:
+                    await self._refresh(batch)
+                except Exception as e:
+                    print(f"배치 작업 상태 확인 오류 ({batch.batch_id}): {e}")
+        
+        # 결과가 반영됐으면 오늘의 다이제스트 갱신 (고득점 콘텐츠가 그대로면 다시 생성하지 않음)
+        if settings.digest_prebuild and any(batch.analyzed_count for batch in batches if batch.completed_at):
+            await daily_digests.refresh()
+        return [batch.to_dict() for batch in batches]
+    
+    async def _refresh(self, batch: AnalysisBatch):
+        response = await analyzer.client.get(f"/batches/{batch.batch_id}", cast_to=httpx.Response)
+        data = response.json()
+        
+        batch.status = data.get("status", batch.status)
+        batch.output_file_id = data.get("output_file_id")
+        batch.error_file_id = data.get("error_file_id")
+        
+        if batch.status in FINISHED_STATUSES:
+            if batch.output_file_id:
+                batch.analyzed_count = await self._ingest(batch)
+            if batch.status == "completed":
+                batch.status = "ingested"
+            else:
+                errors = (data.get("errors") or {}).get("data") or []
+                batch.error_message = "; ".join(e.get("message", "") for e in errors) or batch.status
+            batch.completed_at = datetime.utcnow()
+            print(f"📦 배치 작업 종료: {batch.batch_id} ({batch.status}, 분석 {batch.analyzed_count}건)")
+        
+        async with async_session() as session:
+            await session.execute(
+                update(AnalysisBatch)
+                .where(AnalysisBatch.id == batch.id)
+                .values(
+                    status=batch.status,
+                    output_file_id=batch.output_file_id,
+                    error_file_id=batch.error_file_id,
+                    analyzed_count=batch.analyzed_count,
+                    error_message=batch.error_message,
+                    completed_at=batch.completed_at
+                )
+            )
+            await session.commit()
+    
+    async def _ingest(self, batch: AnalysisBatch) -> int:
+        """결과 파일(JSONL)을 받아 콘텐츠별 분석 결과 저장 - 저장한 건수 반환"""
+        output = await analyzer.client.files.content(batch.output_file_id)
+        groups = self._groups(batch)
+        items = await self._load_items({content_id for group in groups for content_id in group})
+        
+        analyzed = 0
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                group = groups[int(record["custom_id"].split("-", 1)[1])]
+                analyses = analyzer.parse_batch_content(
+                    response["body"]["choices"][0]["message"]["content"], group
+                )
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                print(f"배치 결과 처리 오류 ({batch.batch_id}): {e}")
+                continue
+            
+            for content_id, analysis in analyses.items():
+                item = items.get(content_id)
+                if item is None:
+                    # 제출 후 삭제된 콘텐츠
+                    continue
+                await self._save(content_id, analysis)
+                await analyzer.remember_analysis(item, analysis)
+                analyzed += 1
+        return analyzed
+    
+    @staticmethod
+    async def _save(content_id: int, analysis: Dict[str, Any]):
+        """분석 결과 저장 (아직 분석되지 않은 유사 중복 콘텐츠에도 복사)"""
+        values = analysis_values(analysis)
+        async with async_session() as session:
+            await session.execute(update(Content).where(Content.id == content_id).values(**values))
+            await session.execute(
+                update(Content)
+                .where(and_(Content.duplicate_of == content_id, Content.is_analyzed == False))
+                .values(**values)
+            )
+            await session.commit()
+    
+    async def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(AnalysisBatch).order_by(desc(AnalysisBatch.created_at)).limit(limit)
+            )
+            return [batch.to_dict() for batch in result.scalars().all()]
+
+
+# Singleton instance
+analysis_batches = AnalysisBatchJobs()
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, delete, func
+
+from app.models.database import AnalysisCacheEntry, async_session
+from app.services.near_duplicates import normalize_text
+from app.config import settings
+
+
+def analysis_key(
+    title: str,
+    content: str,
+    source_type: str,
+    keyword: str,
+    language: str,
+    model: str,
+    prompt_version: str
+) -> str:
+    """분석 캐시 키 - 정규화한 제목+내용과 분석 조건의 sha256"""
+    parts = [
+        normalize_text(title),
+        normalize_text(content),
+        source_type,
+        keyword.lower(),
+        language,
+        model,
+        prompt_version
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def chunk_key(chunk: str, keyword: str, language: str, model: str, prompt_version: str) -> str:
+    """청크 요약 캐시 키 - 같은 본문 조각은 다른 글에 들어 있어도 요약을 재사용"""
+    parts = ["chunk", normalize_text(chunk), keyword.lower(), language, model, prompt_version]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AnalysisResultCache:
+    """
+    AI 분석 결과 캐시
+    
+    같은 글이 삭제 후 다시 수집되거나 다른 키워드/URL로 들어와도 분석 조건이 같으면
+    저장된 결과를 돌려주고 API를 호출하지 않는다. 모델이나 프롬프트 버전이 바뀌면 키가 달라지므로
+    예전 결과가 새 분석을 가리지 않는다. 오래 쓰이지 않은 항목부터 기간/개수 기준으로 정리한다.
+    """
+    
+    def __init__(self):
+        self._write_lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과 (없으면 None)"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(AnalysisCacheEntry).where(AnalysisCacheEntry.cache_key == key)
+            )
+            row = result.scalars().first()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_used_at = datetime.utcnow()
+            await session.commit()
+        
+        self.hits += 1
+        return json.loads(row.result)
+    
+    async def put(self, key: str, model: str, prompt_version: str, analysis: Dict[str, Any]):
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    result = await session.execute(
+                        select(AnalysisCacheEntry).where(AnalysisCacheEntry.cache_key == key)
+                    )
+                    row = result.scalars().first()
+                    if not row:
+                        row = AnalysisCacheEntry(cache_key=key, model=model, prompt_version=prompt_version)
+                        session.add(row)
+                    row.result = json.dumps(analysis, ensure_ascii=False)
+                    row.created_at = datetime.utcnow()
+                    row.last_used_at = datetime.utcnow()
+                    await session.commit()
+                self.stored += 1
+            except Exception as e:
+                print(f"분석 캐시 저장 오류: {e}")
+    
+    async def evict(self) -> int:
+        """오래된 항목(analysis_cache_max_age_days)과 개수 초과분(analysis_cache_max_entries) 삭제"""
+        removed = 0
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    cutoff = datetime.utcnow() - timedelta(days=settings.analysis_cache_max_age_days)
+                    result = await session.execute(
+                        delete(AnalysisCacheEntry).where(AnalysisCacheEntry.last_used_at < cutoff)
+                    )
+                    removed += result.rowcount or 0
+                    
+                    count = (await session.execute(select(func.count(AnalysisCacheEntry.id)))).scalar() or 0
+                    overflow = count - settings.analysis_cache_max_entries
+                    if overflow > 0:
+                        # 가장 오래 쓰이지 않은 항목부터
+                        oldest = (
+                            select(AnalysisCacheEntry.id)
+                            .order_by(AnalysisCacheEntry.last_used_at)
+                            .limit(overflow)
+                        )
+                        result = await session.execute(
+                            delete(AnalysisCacheEntry).where(AnalysisCacheEntry.id.in_(oldest))
+                        )
+                        removed += result.rowcount or 0
+                    
+                    await session.commit()
+            except Exception as e:
+                print(f"분석 캐시 정리 오류: {e}")
+        
+        self.evicted += removed
+        return removed
+    
+    def stats(self) -> Dict[str, int]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "stored": self.stored,
+            "evicted": self.evicted
+        }
+
+
+# Singleton instance
+analysis_cache = AnalysisResultCache()
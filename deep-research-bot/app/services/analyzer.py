@@ -1,14 +1,61 @@
 from openai import AsyncOpenAI
 from app.config import settings
+from app.core.llm_limits import llm_limiter, estimate_tokens, estimate_request_tokens
+from app.services.analysis_cache import analysis_cache, analysis_key, chunk_key
+from app.services.chunking import split_by_tokens, fit_to_tokens
+import asyncio
 import json
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+
+
+def analysis_values(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """분석 결과 → Content의 ai_* 컬럼 값"""
+    return {
+        "ai_summary": analysis["summary"],
+        "ai_insights": json.dumps(analysis["insights"], ensure_ascii=False),
+        "ai_business_relevance": analysis["business_relevance"],
+        "ai_share_score": analysis["share_score"],
+        "ai_share_reason": analysis["share_reason"],
+        "is_analyzed": True
+    }
+
 
 class AIAnalyzer:
     """OpenAI를 사용한 콘텐츠 분석기"""
     
+    # 분석 프롬프트나 결과 형식을 바꾸면 올려서 이전 캐시 결과를 쓰지 않게 한다
+    PROMPT_VERSION = "2"
+    
+    SYSTEM_PROMPT = "You are an expert content analyst. Always respond with valid JSON only."
+    
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
-        self.model = "gpt-4o-mini"
+        # 재시도는 llm_limiter가 속도 제한 헤더를 보고 직접 처리
+        # (base_url을 지정하면 OpenAI 호환 서버 사용 - 로컬 테스트 서버 등)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            max_retries=0
+        )
+        self.model = settings.openai_model
+    
+    @property
+    def input_budget(self) -> int:
+        """요청당 콘텐츠 입력 토큰 예산 (모델별 설정이 없으면 기본값)"""
+        return settings.analysis_input_tokens_models.get(self.model, settings.analysis_input_tokens)
+    
+    async def _chat(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None, **kwargs):
+        """RPM/TPM 제한을 거쳐 채팅 요청 (호출 전에 토큰 수 추정)"""
+        max_tokens = max_tokens or settings.llm_max_output_tokens
+        estimated = estimate_request_tokens(messages, max_tokens)
+        return await llm_limiter.run(
+            lambda: self.client.chat.completions.with_raw_response.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                **kwargs
+            ),
+            estimated
+        )
     
     async def analyze_content(
         self, 
@@ -17,20 +64,103 @@ class AIAnalyzer:
         source_type: str,
         keyword: str,
         language: str = "ko"
-    ) -> Dict[str, Any]:
-        """콘텐츠를 분석하여 요약, 인사이트, 비즈니스 연관성, 공유 점수를 반환"""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        콘텐츠를 분석하여 요약, 인사이트, 비즈니스 연관성, 공유 점수를 반환
+        
+        실패하면 None - 호출자는 저장하지 않고 미분석으로 남겨 다음 실행에서 다시 분석한다.
+        """
+        
+        cache_key = self._cache_key(title, content, source_type, keyword, language)
+        if cache_key is not None:
+            cached = await analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        return await self._analyze_single(title, content, source_type, keyword, language, cache_key)
+    
+    def _cache_key(self, title: str, content: str, source_type: str, keyword: str, language: str) -> Optional[str]:
+        """분석 캐시 키 (캐시를 끄면 None) - 긴 콘텐츠도 전체를 분석하므로 전체 내용 포함"""
+        if not settings.analysis_cache:
+            return None
+        return analysis_key(title, content, source_type, keyword, language, self.model, self.PROMPT_VERSION)
+    
+    @staticmethod
+    def _parse_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "summary": result.get("summary", ""),
+            "insights": result.get("insights", []),
+            "business_relevance": result.get("business_relevance", ""),
+            "share_score": float(result.get("share_score", 50)),
+            "share_reason": result.get("share_reason", "")
+        }
+    
+    async def _analyze_single(
+        self,
+        title: str,
+        content: str,
+        source_type: str,
+        keyword: str,
+        language: str,
+        cache_key: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        콘텐츠 1건을 API로 분석 (성공한 결과는 캐시에 저장, 실패하면 None)
         
+        입력 토큰 예산을 넘는 콘텐츠는 청크로 나눠 요약한 뒤(map-reduce) 요약본으로 분석하고,
+        analysis_compact_tokens 이하의 짧은 콘텐츠는 간단한 프롬프트로 분석한다.
+        """
+        try:
+            tokens = estimate_tokens(content)
+            if tokens > self.input_budget:
+                content = await self._condense(title, content, keyword, language)
+                prompt = self._analysis_prompt(title, content, source_type, keyword, language, condensed=True)
+            elif tokens <= settings.analysis_compact_tokens:
+                prompt = self._compact_prompt(title, content, source_type, keyword, language)
+            else:
+                prompt = self._analysis_prompt(title, content, source_type, keyword, language)
+            
+            response = await self._chat(
+                [
+                    {"role": "system", "content": self.SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            
+            result = json.loads(response.choices[0].message.content)
+            analysis = self._parse_analysis(result)
+        
+        except Exception as e:
+            print(f"AI 분석 오류: {e}")
+            return None
+        
+        if cache_key is not None:
+            await analysis_cache.put(cache_key, self.model, self.PROMPT_VERSION, analysis)
+        return analysis
+    
+    @staticmethod
+    def _analysis_prompt(
+        title: str,
+        content: str,
+        source_type: str,
+        keyword: str,
+        language: str,
+        condensed: bool = False
+    ) -> str:
         lang_instruction = "한국어로 답변해주세요." if language == "ko" else "Please respond in English."
+        content_label = "내용 (긴 원문을 부분별로 요약한 것)" if condensed else "내용"
         
-        prompt = f"""
+        return f"""
 당신은 CEO에게 공유할 가치가 있는 콘텐츠를 분석하는 전문가입니다.
 
 ## 분석 대상
 - **제목**: {title}
 - **유형**: {source_type}
 - **관련 키워드**: {keyword}
-- **내용**:
-{content[:4000]}
+- **{content_label}**:
+{content}
 
 ## 분석 요청
 다음 4가지 관점에서 분석해주세요:
@@ -58,43 +188,255 @@ class AIAnalyzer:
 }}
 ```
 """
+
+    @staticmethod
+    def _compact_prompt(title: str, content: str, source_type: str, keyword: str, language: str) -> str:
+        """짧은 콘텐츠(제목/설명 위주)용 간단한 프롬프트 - 결과 형식은 같음"""
+        lang_instruction = "한국어로 답변해주세요." if language == "ko" else "Please respond in English."
+        return f"""CEO에게 공유할 가치를 기준으로 아래 콘텐츠를 분석해주세요. {lang_instruction}
+
+[{source_type}] {title} (키워드: {keyword})
+{content}
+
+JSON 필드: summary (2-3문장), insights (포인트 2-3개 배열), business_relevance (AI/Agent 기업 관점 1-2문장),
+share_score (0-100, 80+ 반드시 공유 / 60+ 추천 / 40+ 선택 / 그 미만 비추천), share_reason (1문장)
+"""
+
+    # ============ Long Content (map-reduce) ============
+    
+    async def _condense(self, title: str, content: str, keyword: str, language: str) -> str:
+        """
+        입력 토큰 예산을 넘는 콘텐츠를 청크별 요약으로 줄임
         
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert content analyst. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+        청크(예산 크기)마다 요약하고(map), 요약을 이어 붙인 결과가 아직 예산을 넘으면
+        그 결과를 다시 나눠 요약한다(reduce). 청크 요약은 분석 캐시에 저장해 재수집 시 재사용한다.
+        """
+        budget = self.input_budget
+        text = content
+        while estimate_tokens(text) > budget:
+            chunks = split_by_tokens(text, budget)
+            summaries = await asyncio.gather(*(
+                self._summarize_chunk(title, chunk, keyword, language) for chunk in chunks
+            ))
+            condensed = "\n\n".join(
+                f"[{index}/{len(chunks)}] {summary}" for index, summary in enumerate(summaries, 1)
             )
-            
-            result = json.loads(response.choices[0].message.content)
-            return {
-                "summary": result.get("summary", ""),
-                "insights": result.get("insights", []),
-                "business_relevance": result.get("business_relevance", ""),
-                "share_score": float(result.get("share_score", 50)),
-                "share_reason": result.get("share_reason", "")
-            }
-            
-        except Exception as e:
-            print(f"AI 분석 오류: {e}")
-            return {
-                "summary": "분석 실패",
-                "insights": [],
-                "business_relevance": "",
-                "share_score": 0,
-                "share_reason": f"분석 중 오류 발생: {str(e)}"
-            }
+            if estimate_tokens(condensed) >= estimate_tokens(text):
+                # 요약이 줄어들지 않으면 (청크 요약 토큰이 너무 큰 설정 등) 앞부분만 사용
+                return fit_to_tokens(condensed, budget)
+            text = condensed
+        return text
     
-    async def generate_daily_digest(self, contents: list) -> str:
-        """일일 콘텐츠 다이제스트 생성"""
+    async def _summarize_chunk(self, title: str, chunk: str, keyword: str, language: str) -> str:
+        """청크 하나 요약 (map 단계)"""
+        cache_key = None
+        if settings.analysis_cache:
+            cache_key = chunk_key(chunk, keyword, language, self.model, self.PROMPT_VERSION)
+            cached = await analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached["summary"]
         
-        if not contents:
-            return "오늘 수집된 콘텐츠가 없습니다."
+        lang_instruction = "한국어로 작성해주세요." if language == "ko" else "Please write in English."
+        prompt = f"""다음은 "{title}"의 일부입니다. 관련 키워드 "{keyword}"와 비즈니스/기술 관점에서
+중요한 사실, 수치, 주장을 빠짐없이 간결하게 요약해주세요. {lang_instruction}
+
+{chunk}
+"""
+        response = await self._chat(
+            [
+                {"role": "system", "content": "You summarize document sections faithfully and concisely."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=settings.analysis_chunk_summary_tokens,
+            temperature=0.2
+        )
+        summary = (response.choices[0].message.content or "").strip()
         
+        if cache_key is not None and summary:
+            await analysis_cache.put(cache_key, self.model, self.PROMPT_VERSION, {"summary": summary})
+        return summary
+    
+    # ============ Batched Analysis ============
+    
+    def _batch_messages(self, items: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """여러 콘텐츠를 하나의 요청으로 묶은 메시지 (분석 지시문은 한 번만)"""
+        blocks = []
+        for item in items:
+            language = "한국어" if item["language"] == "ko" else "English"
+            blocks.append(f"""### [id: {item['id']}]
+- **제목**: {item['title']}
+- **유형**: {item['source_type']}
+- **관련 키워드**: {item['keyword']}
+- **응답 언어**: {language}
+- **내용**:
+{item['content'] or ''}""")
+
+        prompt = f"""
+당신은 CEO에게 공유할 가치가 있는 콘텐츠를 분석하는 전문가입니다.
+아래 {len(items)}개 콘텐츠를 각각 독립적으로 분석해주세요.
+
+## 분석 요청 (콘텐츠마다)
+1. **요약 (summary)**: 핵심 내용을 3-4문장으로 요약
+2. **핵심 인사이트 (insights)**: 비즈니스/기술적 관점에서 중요한 포인트 3-5개 (배열)
+3. **비즈니스 연관성 (business_relevance)**: AI/Agent 기술을 활용하는 스타트업이나 기업에게 이 콘텐츠가 왜 중요한지 2-3문장으로 설명
+4. **공유 가치 점수 (share_score)**: 0-100점으로 슬랙 채널에 공유할 가치를 평가
+   - 80-100: 반드시 공유해야 함 (획기적인 인사이트, 최신 트렌드)
+   - 60-79: 공유 추천 (유용한 정보)
+   - 40-59: 선택적 공유 (일반적인 정보)
+   - 0-39: 공유 비추천 (오래된 정보, 중복 내용)
+5. **공유 이유 (share_reason)**: 해당 점수를 준 이유를 1-2문장으로 설명
+
+각 콘텐츠의 "응답 언어"로 작성해주세요.
+
+## 분석 대상
+{chr(10).join(blocks)}
+
+## 응답 형식 (JSON)
+모든 id에 대해 결과를 정확히 하나씩, id를 그대로 포함해 배열로 반환해주세요.
+```json
+{{
+    "results": [
+        {{
+            "id": 123,
+            "summary": "...",
+            "insights": ["인사이트1", "인사이트2", "인사이트3"],
+            "business_relevance": "...",
+            "share_score": 85,
+            "share_reason": "..."
+        }}
+    ]
+}}
+```
+"""
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def batch_groups(self, items: List[Dict[str, Any]]) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        일괄 분석 요청 단위로 묶기
+        
+        Returns:
+            (묶음 목록, 예산 초과 콘텐츠) - 묶음마다 콘텐츠 수는 analysis_batch_size 이하,
+            콘텐츠 토큰 합은 입력 토큰 예산 이하. 예산을 넘는 콘텐츠는 개별 분석(청크 요약) 대상
+        """
+        size = max(settings.analysis_batch_size, 1)
+        budget = self.input_budget
+        groups, oversized = [], []
+        current, current_tokens = [], 0
+        for item in items:
+            tokens = estimate_tokens(item["content"] or "")
+            if tokens > budget:
+                oversized.append(item)
+                continue
+            if current and (len(current) >= size or current_tokens + tokens > budget):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups, oversized
+    
+    def batch_request_body(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """일괄 분석 요청 본문 (/v1/chat/completions) - 배치 작업 파일에도 그대로 사용"""
+        return {
+            "model": self.model,
+            "messages": self._batch_messages(items),
+            "max_tokens": settings.llm_max_output_tokens * len(items),
+            "temperature": 0.3,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def parse_batch_content(self, text: str, content_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """일괄 분석 응답(JSON 배열)을 콘텐츠 ID별 결과로 변환 - 요청하지 않은 id는 무시"""
+        data = json.loads(text)
+        entries = data.get("results", []) if isinstance(data, dict) else data
+        wanted = set(content_ids)
+        
+        analyses = {}
+        for entry in entries or []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                content_id = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if content_id in wanted and content_id not in analyses:
+                analyses[content_id] = self._parse_analysis(entry)
+        return analyses
+    
+    def _item_key(self, item: Dict[str, Any]) -> Optional[str]:
+        return self._cache_key(item["title"], item["content"] or "", item["source_type"], item["keyword"], item["language"])
+    
+    async def cached_analysis(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과 (item: id, title, content, source_type, keyword, language)"""
+        cache_key = self._item_key(item)
+        if cache_key is None:
+            return None
+        return await analysis_cache.get(cache_key)
+    
+    async def remember_analysis(self, item: Dict[str, Any], analysis: Dict[str, Any]):
+        """분석 결과를 캐시에 저장"""
+        cache_key = self._item_key(item)
+        if cache_key is not None:
+            await analysis_cache.put(cache_key, self.model, self.PROMPT_VERSION, analysis)
+    
+    async def analyze_batch(self, items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """
+        여러 콘텐츠를 한 요청으로 분석
+        
+        Args:
+            items: id, title, content, source_type, keyword, language를 담은 목록
+        
+        Returns:
+            콘텐츠 ID -> 분석 결과
+            (캐시된 항목은 요청에서 빼고, 입력 토큰 예산을 넘는 항목과 응답에서 빠졌거나
+            요청이 실패한 항목은 개별 요청으로 분석. 개별 요청도 실패한 항목은 결과에 없음)
+        """
+        analyses = {}
+        pending = []
+        for item in items:
+            cached = await self.cached_analysis(item)
+            if cached is not None:
+                analyses[item["id"]] = cached
+            else:
+                pending.append(item)
+        
+        groups, _ = self.batch_groups(pending)
+        parsed = {}
+        for result in await asyncio.gather(*(self._analyze_group(group) for group in groups if len(group) > 1)):
+            parsed.update(result)
+        
+        for item in pending:
+            analysis = parsed.get(item["id"])
+            if analysis is None:
+                analysis = await self._analyze_single(
+                    item["title"], item["content"] or "", item["source_type"], item["keyword"], item["language"],
+                    cache_key=self._item_key(item)
+                )
+                if analysis is not None:
+                    analyses[item["id"]] = analysis
+                continue
+            await self.remember_analysis(item, analysis)
+            analyses[item["id"]] = analysis
+        return analyses
+    
+    async def _analyze_group(self, group: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        try:
+            body = self.batch_request_body(group)
+            body.pop("model")
+            response = await self._chat(body.pop("messages"), **body)
+            return self.parse_batch_content(
+                response.choices[0].message.content, [item["id"] for item in group]
+            )
+        except Exception as e:
+            print(f"AI 일괄 분석 오류 ({len(group)}건): {e}")
+            return {}
+    
+    @staticmethod
+    def _digest_messages(contents: list) -> List[Dict[str, str]]:
         content_summaries = "\n".join([
             f"- [{c['source_type']}] {c['title']} (점수: {c['ai_share_score']})"
             for c in contents[:20]
@@ -113,19 +455,32 @@ class AIAnalyzer:
 
 한국어로 작성해주세요.
 """
+        return [
+            {"role": "system", "content": "You are an executive briefing specialist."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def write_daily_digest(self, contents: list) -> str:
+        """일일 콘텐츠 다이제스트 생성 (실패하면 예외 - 저장하는 쪽에서 사용)"""
+        response = await self._chat(self._digest_messages(contents), temperature=0.5)
+        return response.choices[0].message.content
+    
+    async def stream_daily_digest(self, contents: list) -> AsyncIterator[str]:
+        """일일 콘텐츠 다이제스트를 생성되는 대로 조각 단위로 반환 (실패하면 예외)"""
+        stream = await self._chat(self._digest_messages(contents), temperature=0.5, stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def generate_daily_digest(self, contents: list) -> str:
+        """일일 콘텐츠 다이제스트 생성"""
+        
+        if not contents:
+            return "오늘 수집된 콘텐츠가 없습니다."
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an executive briefing specialist."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5
-            )
-            
-            return response.choices[0].message.content
-            
+            return await self.write_daily_digest(contents)
+        
         except Exception as e:
             return f"다이제스트 생성 실패: {str(e)}"
 
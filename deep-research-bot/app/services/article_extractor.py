@@ -0,0 +1,151 @@
+import asyncio
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup
+from sqlalchemy import select
+
+from app.models.database import ArticleBody, async_session
+from app.core.resilience import host_guard
+from app.core.executor import parse_executor
+from app.core.http import http_client
+from app.services.urls import dedupe_key, is_google_news_url
+from app.config import settings
+
+# 본문 추출 대상 소스
+ARTICLE_SOURCE_TYPES = {"news", "blog"}
+
+
+def extract_article_text(html: str, url: str, max_chars: int) -> str:
+    """
+    HTML에서 기사 본문 추출 (워커 풀에서 실행)
+    
+    newspaper로 먼저 추출하고, 결과가 비면 <article>/<p> 태그 기준으로 다시 추출한다.
+    """
+    text = ""
+    try:
+        from newspaper import Article
+        
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()
+        text = article.text or ""
+    except Exception:
+        text = ""
+    
+    if not text.strip():
+        soup = BeautifulSoup(html, "html.parser")
+        for tag in soup(["script", "style", "nav", "header", "footer", "aside"]):
+            tag.decompose()
+        root = soup.find("article") or soup
+        paragraphs = [p.get_text(" ", strip=True) for p in root.find_all("p")]
+        text = "\n\n".join(p for p in paragraphs if len(p) > 40)
+    
+    return text.strip()[:max_chars]
+
+
+class ArticleExtractor:
+    """
+    기사 본문 추출기
+    
+    공유 HTTP 클라이언트로 페이지를 받고, 본문 추출은 파싱 워커 풀에서 실행해
+    이벤트 루프를 막지 않는다. 추출 결과는 정규화 URL 기준으로 압축해 DB(article_bodies)에
+    저장하므로 같은 글은 한 번만 받는다. 느린 페이지는 페이지당 제한 시간에서 끊는다.
+    """
+    
+    RETRY_FAILED_AFTER = timedelta(hours=24)
+    
+    def __init__(self):
+        self._write_lock = asyncio.Lock()
+        self.cache_hits = 0
+        self.extracted = 0
+        self.failed = 0
+        self.timeouts = 0
+    
+    @staticmethod
+    def supports(source_type: str, url: str) -> bool:
+        return source_type in ARTICLE_SOURCE_TYPES and bool(url) and not is_google_news_url(url)
+    
+    async def extract(self, url: str, canonical_url: Optional[str] = None) -> str:
+        """기사 본문 반환 (캐시 우선, 실패 시 빈 문자열)"""
+        key = canonical_url or dedupe_key(url)
+        
+        cached = await self._load(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        
+        try:
+            text = await asyncio.wait_for(
+                self._fetch_and_extract(url),
+                timeout=settings.article_fetch_timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            print(f"본문 추출 시간 초과 ({url})")
+            text = ""
+        except Exception as e:
+            print(f"기사 본문 가져오기 실패 ({url}): {e}")
+            text = ""
+        
+        if text:
+            self.extracted += 1
+        else:
+            self.failed += 1
+        await self._store(key, text)
+        return text
+    
+    async def _fetch_and_extract(self, url: str) -> str:
+        response = await host_guard.get(http_client.client, url)
+        response.raise_for_status()
+        
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and "html" not in content_type:
+            return ""
+        
+        return await parse_executor.run(
+            extract_article_text, response.text, str(response.url), settings.article_max_chars
+        )
+    
+    async def _load(self, key: str) -> Optional[str]:
+        """캐시된 본문 (없거나 재시도할 실패 항목이면 None)"""
+        async with async_session() as session:
+            result = await session.execute(select(ArticleBody).where(ArticleBody.canonical_url == key))
+            row = result.scalars().first()
+        
+        if row is None:
+            return None
+        if row.body is None:
+            if datetime.utcnow() - row.fetched_at >= self.RETRY_FAILED_AFTER:
+                return None
+            return ""
+        return zlib.decompress(row.body).decode("utf-8")
+    
+    async def _store(self, key: str, text: str):
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    result = await session.execute(select(ArticleBody).where(ArticleBody.canonical_url == key))
+                    row = result.scalars().first()
+                    if not row:
+                        row = ArticleBody(canonical_url=key)
+                        session.add(row)
+                    row.body = zlib.compress(text.encode("utf-8")) if text else None
+                    row.text_length = len(text)
+                    row.fetched_at = datetime.utcnow()
+                    await session.commit()
+            except Exception as e:
+                print(f"본문 캐시 저장 오류 ({key}): {e}")
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cache_hits": self.cache_hits,
+            "extracted": self.extracted,
+            "failed": self.failed,
+            "timeouts": self.timeouts
+        }
+
+
+# Singleton instance
+article_extractor = ArticleExtractor()
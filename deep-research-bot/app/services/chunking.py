@@ -0,0 +1,59 @@
+import re
+from typing import List
+
+from app.core.llm_limits import estimate_tokens
+
+# 문단 → 문장 → 단어 순으로 나눔 (트랜스크립트처럼 문단/문장 부호가 없는 텍스트도 단어에서 나뉨)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?。?!])\s+")
+_WORD_RE = re.compile(r"\s+")
+
+_SEPARATORS = [(_PARAGRAPH_RE, "\n\n"), (_SENTENCE_RE, " "), (_WORD_RE, " ")]
+
+
+def _split_hard(text: str, max_tokens: int) -> List[str]:
+    """구분자가 없는 긴 문자열 - 추정 토큰 비율로 글자 단위 분할"""
+    tokens = max(estimate_tokens(text), 1)
+    size = max(int(len(text) * max_tokens / tokens), 1)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _split(text: str, max_tokens: int, level: int) -> List[str]:
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    if level >= len(_SEPARATORS):
+        return _split_hard(text, max_tokens)
+    
+    pattern, joiner = _SEPARATORS[level]
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for piece in (p.strip() for p in pattern.split(text)):
+        if not piece:
+            continue
+        piece_tokens = estimate_tokens(piece)
+        if piece_tokens > max_tokens:
+            # 한 조각이 예산보다 크면 더 작은 단위로
+            if current:
+                chunks.append(joiner.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split(piece, max_tokens, level + 1))
+            continue
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append(joiner.join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append(joiner.join(current))
+    return chunks
+
+
+def split_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """텍스트를 추정 토큰 수가 max_tokens 이하인 청크로 분할 (문단/문장 경계 우선)"""
+    return _split(text or "", max(max_tokens, 1), 0)
+
+
+def fit_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 앞부분만 남김"""
+    return split_by_tokens(text, max_tokens)[0] if text else ""
@@ -4,6 +4,7 @@ from .news import NewsCollector
 from .blog import BlogCollector
 from .paper import PaperCollector
 from .podcast import PodcastCollector
+from .snapshot import FeedSnapshot
 
 __all__ = [
     "BaseCollector",
@@ -11,6 +12,7 @@ __all__ = [
     "NewsCollector",
     "BlogCollector",
     "PaperCollector",
-    "PodcastCollector"
+    "PodcastCollector",
+    "FeedSnapshot"
 ]
 
@@ -1,19 +1,54 @@
+import httpx
+import feedparser
+import hashlib
+import inspect
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import AsyncIterator, Awaitable, Callable, Hashable, List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
+from app.core.concurrency import run_tasks, iter_completed
+from app.core.resilience import host_guard
+from app.core.executor import parse_executor
+from app.core.http import HttpClientManager, http_client, USER_AGENT
+from app.core.singleflight import singleflight, request_key
+from app.services.http_cache import conditional_cache
+from app.services.watermarks import feed_watermarks
+
+if TYPE_CHECKING:
+    from .snapshot import FeedSnapshot
+
 class BaseCollector(ABC):
     """콘텐츠 수집기 베이스 클래스"""
     
     source_type: str = "unknown"
     
+    USER_AGENT = USER_AGENT
+    
+    # 고정 피드 항목의 최대 경과일 (None이면 제한 없음)
+    FEED_MAX_AGE_DAYS: Optional[int] = None
+    
+    def __init__(self, http: Optional[HttpClientManager] = None):
+        # 앱 수명 동안 공유되는 HTTP 클라이언트 (lifespan에서 시작/종료)
+        self.http = http or http_client
+    
+    def __getstate__(self):
+        # 파싱 워커 프로세스로 보낼 때 HTTP 클라이언트는 제외
+        state = self.__dict__.copy()
+        state.pop("http", None)
+        return state
+    
     @abstractmethod
-    async def search(self, keyword: str, language: str = "ko", limit: int = 10) -> List[Dict[str, Any]]:
+    def _search_sources(
+        self,
+        keyword: str,
+        language: str,
+        limit: int,
+        snapshot: Optional["FeedSnapshot"] = None
+    ) -> List[Awaitable[List[Dict[str, Any]]]]:
         """
-        키워드로 콘텐츠 검색
+        하위 소스별 검색 코루틴 목록 (예: 고정 피드 + 검색 API)
         
-        Returns:
-            List of content dictionaries with fields:
+        각 코루틴은 아래 필드를 가진 콘텐츠 목록을 반환한다:
             - title: str
             - url: str
             - source_type: str
@@ -26,6 +61,280 @@ class BaseCollector(ABC):
         """
         pass
     
+    async def search(
+        self,
+        keyword: str,
+        language: str = "ko",
+        limit: int = 10,
+        snapshot: Optional["FeedSnapshot"] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        키워드로 콘텐츠 검색 - 모든 하위 소스 결과를 모아 최신순 limit개 반환
+        
+        snapshot이 주어지면 고정 피드는 다시 받지 않고 스냅샷의 매칭 결과를 사용한다.
+        """
+        batches = await run_tasks(self._search_sources(keyword, language, limit, snapshot))
+        results = [item for batch in batches for item in batch]
+        
+        # 중복 제거 및 최신순 정렬
+        return self._dedupe_and_sort(results, limit)
+    
+    async def stream(
+        self,
+        keyword: str,
+        language: str = "ko",
+        limit: int = 10,
+        snapshot: Optional["FeedSnapshot"] = None,
+        feeds_only: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        search()의 스트리밍 버전 - 하위 소스 결과가 준비되는 대로 항목을 하나씩 yield
+        
+        URL 중복은 제거하고 최대 limit개까지 내보낸다. 전체 결과를 기다리지 않으므로
+        limit은 최신순이 아니라 도착 순서(소스 내에서는 최신순)로 적용된다.
+        feeds_only면 검색 API 없이 고정 피드 매칭 결과만 내보낸다.
+        
+        스냅샷의 고정 피드 매칭 항목은 limit과 관계없이 모두 내보낸다 - 워터마크가 이미
+        이 항목들 뒤로 넘어가므로 여기서 자르면 다음 실행에서도 다시 받을 수 없다.
+        """
+        seen_urls = set()
+        count = 0
+        
+        snapshot_urls = set()
+        if snapshot is not None and snapshot.has(self.source_type, language):
+            snapshot_urls = {item["url"] for item in snapshot.get_matches(self.source_type, language, keyword)}
+        
+        if feeds_only:
+            sources = [self._search_feeds(keyword, language, snapshot)]
+        else:
+            sources = self._search_sources(keyword, language, limit, snapshot)
+        
+        async for batch in iter_completed(sources):
+            batch.sort(key=lambda x: x.get("published_at") or datetime.min, reverse=True)
+            for item in batch:
+                if item["url"] in seen_urls:
+                    continue
+                if item["url"] in snapshot_urls:
+                    snapshot_urls.discard(item["url"])
+                elif count >= limit:
+                    continue
+                else:
+                    count += 1
+                seen_urls.add(item["url"])
+                yield item
+            if count >= limit and not snapshot_urls:
+                return
+    
+    # ============ 고정 피드 ============
+    
+    def get_feeds(self, language: str) -> List[Tuple[str, str]]:
+        """언어별 고정 피드 목록 [(출처명, 피드 URL), ...] - 피드 기반 수집기만 재정의"""
+        return []
+    
+    def _parse_feed_entries(self, feed, source_name: str, language: str) -> List[Dict[str, Any]]:
+        """
+        파싱된 피드를 키워드와 무관한 콘텐츠 목록으로 변환
+        
+        각 항목은 키워드 매칭용 소문자 텍스트(_match_text)를 함께 가진다.
+        """
+        return []
+    
+    async def fetch_feed_items(
+        self,
+        language: str,
+        scope: Optional[str] = None,
+        pending: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        고정 피드를 모두 다운로드/파싱하여 키워드 매칭 전 항목 목록 반환
+        
+        scope가 주어지면 scope별 워터마크 이후의 새 항목만 반환한다 (전체 키워드 스냅샷은 "*",
+        단일 키워드 실행은 키워드). 새 워터마크는 바로 저장하지 않고 pending에 모아 두며,
+        호출자가 항목을 저장한 뒤 기록한다 (FeedSnapshot.commit_watermarks).
+        """
+        
+        feeds = self.get_feeds(language)
+        if not feeds:
+            return []
+        
+        batches = await run_tasks([
+            self._fetch_feed(source_name, feed_url, language, scope, pending)
+            for source_name, feed_url in feeds
+        ])
+        
+        return [item for batch in batches for item in batch]
+    
+    async def _fetch_feed(
+        self,
+        source_name: str,
+        feed_url: str,
+        language: str,
+        scope: Optional[str] = None,
+        pending: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """단일 피드 다운로드/파싱 (실패 시 빈 목록, scope가 있으면 이미 처리한 항목은 제외)"""
+        try:
+            feed_key = feed_watermarks.key(scope, language, feed_url) if scope is not None else None
+            watermark = await feed_watermarks.get(feed_key) if feed_key else None
+            
+            def parse(text: str):
+                return parse_executor.run(self._parse_feed_text, text, source_name, language, watermark)
+            
+            # 캐시에는 URL별 원문과 엔트리 식별 정보가 있으므로 워터마크는 scope마다 따로 적용
+            # (304여도 이 scope가 아직 보지 못한 엔트리가 있으면 원문을 다시 파싱)
+            body, marks, items = await conditional_cache.fetch(
+                self._get,
+                feed_url,
+                parse,
+                headers={"User-Agent": self.USER_AGENT}
+            )
+            
+            new_count = self._count_new(marks, watermark)
+            if items is None:
+                items = (await parse(body))[1] if new_count else []
+            
+            if feed_key and new_count and pending is not None:
+                pending[feed_key] = marks[0]
+            
+            # 캐시된 원문은 이전 실행 기준이므로 기간 조건을 다시 적용
+            return [item for item in items if self._is_recent(item.get("published_at"))]
+        except Exception as e:
+            print(f"{self.source_type} 피드 오류 ({source_name}): {e}")
+            return []
+    
+    def _parse_feed_text(
+        self,
+        text: str,
+        source_name: str,
+        language: str,
+        watermark: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        피드 원문 파싱 + 정리 (파싱 워커에서 실행) - (엔트리 식별 정보, 새 항목) 반환
+        
+        워터마크 이전 엔트리는 feedparser 결과 단계에서 잘라내므로 HTML 정리는 새 엔트리에만 한다.
+        """
+        feed = feedparser.parse(text)
+        marks = [self._entry_mark(entry) for entry in feed.entries]
+        feed["entries"] = feed.entries[:self._count_new(marks, watermark)]
+        return marks, self._parse_feed_entries(feed, source_name, language)
+    
+    @staticmethod
+    def _entry_mark(entry) -> Dict[str, Any]:
+        """feedparser 엔트리 식별 정보 (id 또는 링크, 발행 시각, 원문 해시)"""
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        raw = "\n".join([entry.get("title", ""), entry.get("link", ""), entry.get("summary", "")])
+        return {
+            "guid": entry.get("id") or entry.get("link") or None,
+            "published_at": datetime(*published[:6]) if published else None,
+            "content_hash": hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        }
+    
+    @staticmethod
+    def _count_new(marks: List[Dict[str, Any]], watermark: Optional[Dict[str, Any]]) -> int:
+        """
+        워터마크 이후(아직 처리하지 않은) 엔트리 수
+        
+        피드는 최신순이라고 가정한다. id 또는 원문 해시가 같거나, 워터마크보다
+        먼저 발행된 엔트리를 만나면 거기서부터는 이미 본 엔트리로 본다.
+        """
+        if not watermark:
+            return len(marks)
+        
+        for count, mark in enumerate(marks):
+            if mark["guid"] and mark["guid"] == watermark.get("guid"):
+                return count
+            if mark["content_hash"] == watermark.get("content_hash"):
+                return count
+            if mark["published_at"] and watermark.get("published_at") and mark["published_at"] < watermark["published_at"]:
+                return count
+        return len(marks)
+    
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        모든 수집기 HTTP 요청의 공통 경로
+        
+        공유 클라이언트 + 전역/호스트별 동시 요청 제한 + 호스트별 속도 제한/서킷 브레이커/재시도
+        """
+        return await host_guard.get(self.http.client, url, **kwargs)
+    
+    async def _fetch_parsed(
+        self,
+        url: str,
+        parse: Callable[[httpx.Response], Any],
+        variant: Hashable = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        요청 + 파싱 (같은 요청은 진행 중이든 실행 내 완료됐든 한 번만 보냄)
+        
+        Args:
+            url: 요청 URL
+            parse: 응답 -> 항목 목록 (코루틴 함수도 가능)
+            variant: 같은 응답이라도 파싱 결과가 달라지는 값 (언어, 개수 등)
+            **kwargs: _get 인자 (params, headers)
+        """
+        key = request_key("GET", url, kwargs.get("params"))
+        
+        async def fetch_and_parse():
+            response = await singleflight.do(key, lambda: self._get(url, **kwargs))
+            result = parse(response)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        
+        items = await singleflight.do((*key, self.source_type, variant), fetch_and_parse)
+        # 결과 목록은 여러 호출자가 공유하므로 사본 반환
+        return list(items)
+    
+    async def _search_feeds(
+        self,
+        keyword: str,
+        language: str,
+        snapshot: Optional["FeedSnapshot"] = None
+    ) -> List[Dict[str, Any]]:
+        """고정 피드에서 키워드 매칭 항목 조회 (스냅샷이 있으면 재사용)"""
+        
+        if snapshot is not None and snapshot.has(self.source_type, language):
+            matched = snapshot.get_matches(self.source_type, language, keyword)
+        else:
+            # 스냅샷 없이 검색할 때는 워터마크를 쓰지 않음 (저장 여부를 알 수 없으므로)
+            keyword_lower = keyword.lower()
+            items = await self.fetch_feed_items(language)
+            matched = [item for item in items if keyword_lower in item["_match_text"]]
+        
+        return [self._strip_match_text(item) for item in matched]
+    
+    def _is_recent(self, published: Optional[datetime]) -> bool:
+        """FEED_MAX_AGE_DAYS 이내인지 여부 (발행일 없으면 통과)"""
+        if published is None or self.FEED_MAX_AGE_DAYS is None:
+            return True
+        return (datetime.utcnow() - published).days <= self.FEED_MAX_AGE_DAYS
+    
+    @staticmethod
+    def _match_text(title: str, summary: str) -> str:
+        """키워드 매칭용 텍스트 (대소문자 무시)"""
+        return f"{title}\n{summary}".lower()
+    
+    @staticmethod
+    def _strip_match_text(item: Dict[str, Any]) -> Dict[str, Any]:
+        """내부 매칭 필드를 제외한 사본 반환"""
+        return {k: v for k, v in item.items() if k != "_match_text"}
+    
+    @staticmethod
+    def _dedupe_and_sort(results: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """URL 기준 중복 제거 후 최신순 정렬"""
+        seen_urls = set()
+        unique_results = []
+        for r in results:
+            if r["url"] not in seen_urls:
+                seen_urls.add(r["url"])
+                unique_results.append(r)
+        
+        unique_results.sort(key=lambda x: x.get("published_at") or datetime.min, reverse=True)
+        
+        return unique_results[:limit]
+    
     def _parse_date(self, date_str: str) -> datetime:
         """날짜 문자열 파싱"""
         formats = [
@@ -49,4 +358,3 @@ class BaseCollector(ABC):
         if not text:
             return ""
         return " ".join(text.split())
-
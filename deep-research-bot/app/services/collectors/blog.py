@@ -1,14 +1,16 @@
-import httpx
 import feedparser
-from typing import List, Dict, Any
+from typing import Awaitable, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
+from app.core.executor import parse_executor
 from .base import BaseCollector
+from .snapshot import FeedSnapshot
 
 class BlogCollector(BaseCollector):
     """블로그/미디엄 글 수집기"""
     
     source_type = "blog"
+    FEED_MAX_AGE_DAYS = 30
     
     # 주요 기술 블로그 RSS 피드
     TECH_BLOGS = {
@@ -30,64 +32,51 @@ class BlogCollector(BaseCollector):
         ]
     }
     
-    async def search(self, keyword: str, language: str = "ko", limit: int = 10) -> List[Dict[str, Any]]:
-        """블로그에서 키워드 관련 글 검색"""
-        
-        results = []
-        blogs = self.TECH_BLOGS.get(language, self.TECH_BLOGS["en"])
-        keyword_lower = keyword.lower()
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for source_name, feed_url in blogs:
-                try:
-                    response = await client.get(feed_url, headers={
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-                    })
-                    feed = feedparser.parse(response.text)
-                    
-                    for entry in feed.entries[:15]:
-                        title = entry.get("title", "")
-                        summary = entry.get("summary", entry.get("content", [{}])[0].get("value", "") if entry.get("content") else "")
-                        
-                        # 키워드 매칭
-                        if keyword_lower in title.lower() or keyword_lower in summary.lower():
-                            published = self._extract_published_date(entry)
-                            
-                            # 30일 이내 글만 (블로그는 좀 더 넓게)
-                            if published and (datetime.utcnow() - published).days <= 30:
-                                clean_summary = BeautifulSoup(summary, "html.parser").get_text()
-                                
-                                results.append({
-                                    "title": self._clean_text(title),
-                                    "url": entry.get("link", ""),
-                                    "source_type": self.source_type,
-                                    "source_name": source_name,
-                                    "language": language,
-                                    "thumbnail_url": self._get_thumbnail(entry),
-                                    "description": self._clean_text(clean_summary)[:500],
-                                    "content_text": self._clean_text(clean_summary),
-                                    "published_at": published
-                                })
-                                
-                except Exception as e:
-                    print(f"블로그 피드 오류 ({source_name}): {e}")
-                    continue
-        
-        # Medium 검색 추가
-        medium_results = await self._search_medium(keyword, language, limit // 2)
-        results.extend(medium_results)
+    def get_feeds(self, language: str) -> List[Tuple[str, str]]:
+        return self.TECH_BLOGS.get(language, self.TECH_BLOGS["en"])
+    
+    def _search_sources(
+        self,
+        keyword: str,
+        language: str,
+        limit: int,
+        snapshot: Optional[FeedSnapshot] = None
+    ) -> List[Awaitable[List[Dict[str, Any]]]]:
+        """기술 블로그 피드 + Medium 태그 검색"""
+        return [
+            self._search_feeds(keyword, language, snapshot),
+            self._search_medium(keyword, language, limit // 2)
+        ]
+    
+    def _parse_feed_entries(self, feed, source_name: str, language: str) -> List[Dict[str, Any]]:
+        """블로그 피드 엔트리를 키워드 매칭 전 글 목록으로 변환"""
         
-        # 중복 제거 및 정렬
-        seen_urls = set()
-        unique_results = []
-        for r in results:
-            if r["url"] not in seen_urls:
-                seen_urls.add(r["url"])
-                unique_results.append(r)
+        items = []
         
-        unique_results.sort(key=lambda x: x.get("published_at") or datetime.min, reverse=True)
+        for entry in feed.entries[:15]:
+            title = entry.get("title", "")
+            summary = entry.get("summary", entry.get("content", [{}])[0].get("value", "") if entry.get("content") else "")
+            
+            published = self._extract_published_date(entry)
+            
+            # 30일 이내 글만 (블로그는 좀 더 넓게)
+            if self._is_recent(published):
+                clean_summary = BeautifulSoup(summary, "html.parser").get_text()
+                
+                items.append({
+                    "title": self._clean_text(title),
+                    "url": entry.get("link", ""),
+                    "source_type": self.source_type,
+                    "source_name": source_name,
+                    "language": language,
+                    "thumbnail_url": self._get_thumbnail(entry),
+                    "description": self._clean_text(clean_summary)[:500],
+                    "content_text": self._clean_text(clean_summary),
+                    "published_at": published,
+                    "_match_text": self._match_text(title, clean_summary)
+                })
         
-        return unique_results[:limit]
+        return items
     
     async def _search_medium(self, keyword: str, language: str, limit: int) -> List[Dict[str, Any]]:
         """Medium 태그 기반 검색"""
@@ -98,37 +87,47 @@ class BlogCollector(BaseCollector):
             tag = keyword.lower().replace(" ", "-")
             feed_url = f"https://medium.com/feed/tag/{tag}"
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(feed_url, headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-                })
-                feed = feedparser.parse(response.text)
-                
-                for entry in feed.entries[:limit]:
-                    published = self._extract_published_date(entry)
-                    summary = entry.get("summary", "")
-                    clean_summary = BeautifulSoup(summary, "html.parser").get_text()
-                    
-                    # 작성자 추출
-                    author = entry.get("author", "Unknown")
-                    
-                    results.append({
-                        "title": self._clean_text(entry.get("title", "")),
-                        "url": entry.get("link", ""),
-                        "source_type": self.source_type,
-                        "source_name": f"Medium - {author}",
-                        "language": language,
-                        "thumbnail_url": self._get_thumbnail(entry),
-                        "description": self._clean_text(clean_summary)[:500],
-                        "content_text": self._clean_text(clean_summary),
-                        "published_at": published
-                    })
-                    
+            # 태그 피드는 언어와 무관 - 응답은 ko/en이 공유하고 파싱만 언어별로
+            results = await self._fetch_parsed(
+                feed_url,
+                lambda response: parse_executor.run(self._parse_medium, response.text, language, limit),
+                variant=(language, limit),
+                headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
+            )
+        
         except Exception as e:
             print(f"Medium 검색 오류: {e}")
         
         return results
     
+    def _parse_medium(self, text: str, language: str, limit: int) -> List[Dict[str, Any]]:
+        """Medium 태그 피드 파싱 (파싱 워커에서 실행)"""
+        results = []
+        
+        feed = feedparser.parse(text)
+        
+        for entry in feed.entries[:limit]:
+            published = self._extract_published_date(entry)
+            summary = entry.get("summary", "")
+            clean_summary = BeautifulSoup(summary, "html.parser").get_text()
+            
+            # 작성자 추출
+            author = entry.get("author", "Unknown")
+            
+            results.append({
+                "title": self._clean_text(entry.get("title", "")),
+                "url": entry.get("link", ""),
+                "source_type": self.source_type,
+                "source_name": f"Medium - {author}",
+                "language": language,
+                "thumbnail_url": self._get_thumbnail(entry),
+                "description": self._clean_text(clean_summary)[:500],
+                "content_text": self._clean_text(clean_summary),
+                "published_at": published
+            })
+        
+        return results
+    
     def _extract_published_date(self, entry) -> datetime:
         """RSS 엔트리에서 발행일 추출"""
         if hasattr(entry, "published_parsed") and entry.published_parsed:
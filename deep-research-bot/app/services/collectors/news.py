@@ -1,14 +1,16 @@
-import httpx
 import feedparser
-from typing import List, Dict, Any
+from typing import Awaitable, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
+from app.core.executor import parse_executor
 from .base import BaseCollector
+from .snapshot import FeedSnapshot
 
 class NewsCollector(BaseCollector):
     """뉴스 기사 수집기"""
     
     source_type = "news"
+    FEED_MAX_AGE_DAYS = 7
     
     # 주요 뉴스 RSS 피드
     RSS_FEEDS = {
@@ -28,72 +30,58 @@ class NewsCollector(BaseCollector):
         ]
     }
     
-    async def search(self, keyword: str, language: str = "ko", limit: int = 10) -> List[Dict[str, Any]]:
-        """뉴스 RSS 피드에서 키워드 관련 기사 검색"""
-        
-        results = []
-        feeds = self.RSS_FEEDS.get(language, self.RSS_FEEDS["en"])
-        keyword_lower = keyword.lower()
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for source_name, feed_url in feeds:
-                try:
-                    response = await client.get(feed_url, headers={
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-                    })
-                    feed = feedparser.parse(response.text)
-                    
-                    for entry in feed.entries[:20]:  # 각 피드에서 최근 20개
-                        title = entry.get("title", "")
-                        summary = entry.get("summary", entry.get("description", ""))
-                        
-                        # 키워드 매칭 (대소문자 무시)
-                        if keyword_lower in title.lower() or keyword_lower in summary.lower():
-                            published = None
-                            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                                published = datetime(*entry.published_parsed[:6])
-                            elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
-                                published = datetime(*entry.updated_parsed[:6])
-                            else:
-                                published = datetime.utcnow()
-                            
-                            # 7일 이내 기사만
-                            if published and (datetime.utcnow() - published).days <= 7:
-                                # HTML 태그 제거
-                                clean_summary = BeautifulSoup(summary, "html.parser").get_text()
-                                
-                                results.append({
-                                    "title": self._clean_text(title),
-                                    "url": entry.get("link", ""),
-                                    "source_type": self.source_type,
-                                    "source_name": source_name,
-                                    "language": language,
-                                    "thumbnail_url": self._get_thumbnail(entry),
-                                    "description": self._clean_text(clean_summary)[:500],
-                                    "content_text": "",  # 본문은 별도로 가져옴
-                                    "published_at": published
-                                })
-                                
-                except Exception as e:
-                    print(f"뉴스 피드 오류 ({source_name}): {e}")
-                    continue
-        
-        # Google News 검색 추가
-        google_results = await self._search_google_news(keyword, language, limit // 2)
-        results.extend(google_results)
+    def get_feeds(self, language: str) -> List[Tuple[str, str]]:
+        return self.RSS_FEEDS.get(language, self.RSS_FEEDS["en"])
+    
+    def _search_sources(
+        self,
+        keyword: str,
+        language: str,
+        limit: int,
+        snapshot: Optional[FeedSnapshot] = None
+    ) -> List[Awaitable[List[Dict[str, Any]]]]:
+        """뉴스 RSS 피드 + Google News 검색"""
+        return [
+            self._search_feeds(keyword, language, snapshot),
+            self._search_google_news(keyword, language, limit // 2)
+        ]
+    
+    def _parse_feed_entries(self, feed, source_name: str, language: str) -> List[Dict[str, Any]]:
+        """RSS 엔트리를 키워드 매칭 전 기사 목록으로 변환"""
         
-        # 중복 제거 및 정렬
-        seen_urls = set()
-        unique_results = []
-        for r in results:
-            if r["url"] not in seen_urls:
-                seen_urls.add(r["url"])
-                unique_results.append(r)
+        items = []
         
-        # 최신순 정렬
-        unique_results.sort(key=lambda x: x.get("published_at") or datetime.min, reverse=True)
+        for entry in feed.entries[:20]:  # 각 피드에서 최근 20개
+            title = entry.get("title", "")
+            summary = entry.get("summary", entry.get("description", ""))
+            
+            published = None
+            if hasattr(entry, "published_parsed") and entry.published_parsed:
+                published = datetime(*entry.published_parsed[:6])
+            elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
+                published = datetime(*entry.updated_parsed[:6])
+            else:
+                published = datetime.utcnow()
+            
+            # 7일 이내 기사만
+            if self._is_recent(published):
+                # HTML 태그 제거
+                clean_summary = BeautifulSoup(summary, "html.parser").get_text()
+                
+                items.append({
+                    "title": self._clean_text(title),
+                    "url": entry.get("link", ""),
+                    "source_type": self.source_type,
+                    "source_name": source_name,
+                    "language": language,
+                    "thumbnail_url": self._get_thumbnail(entry),
+                    "description": self._clean_text(clean_summary)[:500],
+                    "content_text": "",  # 본문은 별도로 가져옴
+                    "published_at": published,
+                    "_match_text": self._match_text(title, clean_summary)
+                })
         
-        return unique_results[:limit]
+        return items
     
     async def _search_google_news(self, keyword: str, language: str, limit: int) -> List[Dict[str, Any]]:
         """Google News RSS 검색"""
@@ -105,40 +93,50 @@ class NewsCollector(BaseCollector):
             
             url = f"https://news.google.com/rss/search?q={keyword}&hl={hl}&gl={gl}&ceid={gl}:{hl}"
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                feed = feedparser.parse(response.text)
-                
-                for entry in feed.entries[:limit]:
-                    published = None
-                    if hasattr(entry, "published_parsed") and entry.published_parsed:
-                        published = datetime(*entry.published_parsed[:6])
-                    
-                    # 출처 추출
-                    source_name = "Google News"
-                    if " - " in entry.get("title", ""):
-                        parts = entry["title"].rsplit(" - ", 1)
-                        if len(parts) == 2:
-                            source_name = parts[1]
-                            entry["title"] = parts[0]
-                    
-                    results.append({
-                        "title": self._clean_text(entry.get("title", "")),
-                        "url": entry.get("link", ""),
-                        "source_type": self.source_type,
-                        "source_name": source_name,
-                        "language": language,
-                        "thumbnail_url": None,
-                        "description": self._clean_text(entry.get("summary", ""))[:500],
-                        "content_text": "",
-                        "published_at": published
-                    })
-                    
+            results = await self._fetch_parsed(
+                url,
+                lambda response: parse_executor.run(self._parse_google_news, response.text, language, limit),
+                variant=(language, limit)
+            )
+        
         except Exception as e:
             print(f"Google News 검색 오류: {e}")
         
         return results
     
+    def _parse_google_news(self, text: str, language: str, limit: int) -> List[Dict[str, Any]]:
+        """Google News RSS 응답 파싱 (파싱 워커에서 실행)"""
+        results = []
+        
+        feed = feedparser.parse(text)
+        
+        for entry in feed.entries[:limit]:
+            published = None
+            if hasattr(entry, "published_parsed") and entry.published_parsed:
+                published = datetime(*entry.published_parsed[:6])
+            
+            # 출처 추출
+            source_name = "Google News"
+            if " - " in entry.get("title", ""):
+                parts = entry["title"].rsplit(" - ", 1)
+                if len(parts) == 2:
+                    source_name = parts[1]
+                    entry["title"] = parts[0]
+            
+            results.append({
+                "title": self._clean_text(entry.get("title", "")),
+                "url": entry.get("link", ""),
+                "source_type": self.source_type,
+                "source_name": source_name,
+                "language": language,
+                "thumbnail_url": None,
+                "description": self._clean_text(entry.get("summary", ""))[:500],
+                "content_text": "",
+                "published_at": published
+            })
+        
+        return results
+    
     def _get_thumbnail(self, entry) -> str:
         """RSS 엔트리에서 썸네일 추출"""
         
@@ -165,17 +163,7 @@ class NewsCollector(BaseCollector):
         return ""
     
     async def get_article_content(self, url: str) -> str:
-        """기사 본문 가져오기"""
-        try:
-            from newspaper import Article
-            
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            return article.text
-            
-        except Exception as e:
-            print(f"기사 본문 가져오기 실패: {e}")
-            return ""
-
+        """기사 본문 가져오기 (본문 캐시 + 파싱 워커 풀 사용)"""
+        from app.services.article_extractor import article_extractor
+        
+        return await article_extractor.extract(url)
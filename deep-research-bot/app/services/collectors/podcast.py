@@ -1,14 +1,14 @@
-import httpx
-import feedparser
-from typing import List, Dict, Any
+from typing import Awaitable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 from .base import BaseCollector
+from .snapshot import FeedSnapshot
 
 class PodcastCollector(BaseCollector):
     """팟캐스트 수집기"""
     
     source_type = "podcast"
+    FEED_MAX_AGE_DAYS = 30
     
     # AI/Tech 관련 인기 팟캐스트 RSS
     PODCASTS = {
@@ -27,79 +27,66 @@ class PodcastCollector(BaseCollector):
         ]
     }
     
-    async def search(self, keyword: str, language: str = "ko", limit: int = 10) -> List[Dict[str, Any]]:
-        """팟캐스트에서 키워드 관련 에피소드 검색"""
-        
-        results = []
-        podcasts = self.PODCASTS.get(language, self.PODCASTS["en"])
-        keyword_lower = keyword.lower()
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for source_name, feed_url in podcasts:
-                try:
-                    response = await client.get(feed_url, headers={
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-                    })
-                    feed = feedparser.parse(response.text)
-                    
-                    for entry in feed.entries[:10]:
-                        title = entry.get("title", "")
-                        summary = entry.get("summary", entry.get("description", ""))
-                        
-                        # 키워드 매칭
-                        if keyword_lower in title.lower() or keyword_lower in summary.lower():
-                            published = None
-                            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                                published = datetime(*entry.published_parsed[:6])
-                            
-                            # 30일 이내만
-                            if published and (datetime.utcnow() - published).days > 30:
-                                continue
-                            
-                            clean_summary = BeautifulSoup(summary, "html.parser").get_text()
-                            
-                            # 오디오 URL 추출
-                            audio_url = ""
-                            if hasattr(entry, "enclosures") and entry.enclosures:
-                                for enc in entry.enclosures:
-                                    if "audio" in enc.get("type", ""):
-                                        audio_url = enc.get("href", enc.get("url", ""))
-                                        break
-                            
-                            # 에피소드 길이 추출
-                            duration = entry.get("itunes_duration", "")
-                            
-                            results.append({
-                                "title": self._clean_text(title),
-                                "url": entry.get("link", audio_url),
-                                "source_type": self.source_type,
-                                "source_name": source_name,
-                                "language": language,
-                                "thumbnail_url": self._get_thumbnail(entry, feed),
-                                "description": f"[{duration}] {self._clean_text(clean_summary)[:500]}" if duration else self._clean_text(clean_summary)[:500],
-                                "content_text": self._clean_text(clean_summary),
-                                "published_at": published
-                            })
-                            
-                except Exception as e:
-                    print(f"팟캐스트 피드 오류 ({source_name}): {e}")
-                    continue
-        
-        # iTunes Podcast 검색 추가
-        itunes_results = await self._search_itunes(keyword, language, limit // 2)
-        results.extend(itunes_results)
+    def get_feeds(self, language: str) -> List[Tuple[str, str]]:
+        return self.PODCASTS.get(language, self.PODCASTS["en"])
+    
+    def _search_sources(
+        self,
+        keyword: str,
+        language: str,
+        limit: int,
+        snapshot: Optional[FeedSnapshot] = None
+    ) -> List[Awaitable[List[Dict[str, Any]]]]:
+        """팟캐스트 피드 + iTunes Podcast 검색"""
+        return [
+            self._search_feeds(keyword, language, snapshot),
+            self._search_itunes(keyword, language, limit // 2)
+        ]
+    
+    def _parse_feed_entries(self, feed, source_name: str, language: str) -> List[Dict[str, Any]]:
+        """팟캐스트 피드 엔트리를 키워드 매칭 전 에피소드 목록으로 변환"""
         
-        # 중복 제거 및 정렬
-        seen_urls = set()
-        unique_results = []
-        for r in results:
-            if r["url"] not in seen_urls:
-                seen_urls.add(r["url"])
-                unique_results.append(r)
+        items = []
         
-        unique_results.sort(key=lambda x: x.get("published_at") or datetime.min, reverse=True)
+        for entry in feed.entries[:10]:
+            title = entry.get("title", "")
+            summary = entry.get("summary", entry.get("description", ""))
+            
+            published = None
+            if hasattr(entry, "published_parsed") and entry.published_parsed:
+                published = datetime(*entry.published_parsed[:6])
+            
+            # 30일 이내만
+            if not self._is_recent(published):
+                continue
+            
+            clean_summary = BeautifulSoup(summary, "html.parser").get_text()
+            
+            # 오디오 URL 추출
+            audio_url = ""
+            if hasattr(entry, "enclosures") and entry.enclosures:
+                for enc in entry.enclosures:
+                    if "audio" in enc.get("type", ""):
+                        audio_url = enc.get("href", enc.get("url", ""))
+                        break
+            
+            # 에피소드 길이 추출
+            duration = entry.get("itunes_duration", "")
+            
+            items.append({
+                "title": self._clean_text(title),
+                "url": entry.get("link", audio_url),
+                "source_type": self.source_type,
+                "source_name": source_name,
+                "language": language,
+                "thumbnail_url": self._get_thumbnail(entry, feed),
+                "description": f"[{duration}] {self._clean_text(clean_summary)[:500]}" if duration else self._clean_text(clean_summary)[:500],
+                "content_text": self._clean_text(clean_summary),
+                "published_at": published,
+                "_match_text": self._match_text(title, clean_summary)
+            })
         
-        return unique_results[:limit]
+        return items
     
     async def _search_itunes(self, keyword: str, language: str, limit: int) -> List[Dict[str, Any]]:
         """iTunes Podcast API 검색"""
@@ -109,43 +96,48 @@ class PodcastCollector(BaseCollector):
             country = "kr" if language == "ko" else "us"
             url = f"https://itunes.apple.com/search?term={keyword}&media=podcast&entity=podcastEpisode&limit={limit}&country={country}"
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    for item in data.get("results", []):
-                        # 발행일 파싱
-                        published = None
-                        release_date = item.get("releaseDate", "")
-                        if release_date:
-                            try:
-                                published = datetime.strptime(release_date[:19], "%Y-%m-%dT%H:%M:%S")
-                            except:
-                                pass
-                        
-                        # 30일 이내만
-                        if published and (datetime.utcnow() - published).days > 30:
-                            continue
-                        
-                        results.append({
-                            "title": item.get("trackName", ""),
-                            "url": item.get("trackViewUrl", item.get("episodeUrl", "")),
-                            "source_type": self.source_type,
-                            "source_name": item.get("collectionName", "iTunes Podcast"),
-                            "language": language,
-                            "thumbnail_url": item.get("artworkUrl600", item.get("artworkUrl100", "")),
-                            "description": item.get("description", "")[:500],
-                            "content_text": item.get("description", ""),
-                            "published_at": published
-                        })
-                        
+            results = await self._fetch_parsed(url, lambda response: self._parse_itunes(response, language), variant=language)
+        
         except Exception as e:
             print(f"iTunes 검색 오류: {e}")
         
         return results
     
+    def _parse_itunes(self, response, language: str) -> List[Dict[str, Any]]:
+        """iTunes Search API 응답 파싱"""
+        results = []
+        
+        if response.status_code == 200:
+            data = response.json()
+            
+            for item in data.get("results", []):
+                # 발행일 파싱
+                published = None
+                release_date = item.get("releaseDate", "")
+                if release_date:
+                    try:
+                        published = datetime.strptime(release_date[:19], "%Y-%m-%dT%H:%M:%S")
+                    except:
+                        pass
+                
+                # 30일 이내만
+                if published and (datetime.utcnow() - published).days > 30:
+                    continue
+                
+                results.append({
+                    "title": item.get("trackName", ""),
+                    "url": item.get("trackViewUrl", item.get("episodeUrl", "")),
+                    "source_type": self.source_type,
+                    "source_name": item.get("collectionName", "iTunes Podcast"),
+                    "language": language,
+                    "thumbnail_url": item.get("artworkUrl600", item.get("artworkUrl100", "")),
+                    "description": item.get("description", "")[:500],
+                    "content_text": item.get("description", ""),
+                    "published_at": published
+                })
+        
+        return results
+    
     def _get_thumbnail(self, entry, feed) -> str:
         """팟캐스트 썸네일 추출"""
         
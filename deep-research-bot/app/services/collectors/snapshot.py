@@ -0,0 +1,94 @@
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
+
+from app.core.concurrency import run_tasks
+from app.services.watermarks import feed_watermarks
+
+if TYPE_CHECKING:
+    from .base import BaseCollector
+
+class FeedSnapshot:
+    """
+    리서치 실행 단위 피드 스냅샷
+    
+    고정 RSS 피드(뉴스/블로그/팟캐스트)를 실행당 한 번만 다운로드/파싱하고,
+    파싱된 엔트리를 활성 키워드 전체와 한 번에 매칭한다.
+    수집 비용이 피드 수 × 키워드 수가 아니라 피드 수에 비례하게 된다.
+    
+    scope 워터마크 이후의 새 항목만 담고, 새 워터마크는 파이프라인이 항목을 저장한 뒤
+    commit_watermarks()로 기록한다 (저장 전에 중단되면 다음 실행에서 다시 수집).
+    """
+    
+    def __init__(self, scope: str = "*"):
+        # 워터마크 범위 (전체 키워드 "*", 단일 키워드 실행은 키워드 소문자)
+        self.scope = scope
+        # 피드 워터마크 키 -> 아직 기록하지 않은 새 워터마크
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # (source_type, language) -> 키워드 매칭 전 항목
+        self._items: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        # (source_type, language, keyword 소문자) -> 매칭된 항목
+        self._matches: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    
+    async def load(self, collectors: Dict[str, "BaseCollector"], languages: List[str]):
+        """피드 기반 수집기의 고정 피드를 언어별로 한 번씩 수집"""
+        
+        targets = [
+            (source_type, language, collector)
+            for source_type, collector in collectors.items()
+            for language in languages
+            if collector.get_feeds(language)
+        ]
+        batches = await run_tasks([
+            collector.fetch_feed_items(language, scope=self.scope, pending=self._pending)
+            for _, language, collector in targets
+        ])
+        
+        for (source_type, language, _), items in zip(targets, batches):
+            self._items[(source_type, language)] = items
+    
+    def skip(self, collectors: Dict[str, "BaseCollector"], languages: List[str]):
+        """고정 피드를 다른 작업이 수집하는 경우 - 빈 항목으로 채워 검색 시 피드를 받지 않게 함"""
+        for source_type, collector in collectors.items():
+            for language in languages:
+                if collector.get_feeds(language):
+                    self._items.setdefault((source_type, language), [])
+    
+    def match(self, keywords: List[str]):
+        """모든 항목을 활성 키워드 전체와 한 번에 매칭"""
+        
+        keyword_lowers = list(dict.fromkeys(k.lower() for k in keywords))
+        
+        for (source_type, language), items in self._items.items():
+            for keyword_lower in keyword_lowers:
+                self._matches.setdefault((source_type, language, keyword_lower), [])
+            
+            for item in items:
+                text = item["_match_text"]
+                for keyword_lower in keyword_lowers:
+                    if keyword_lower in text:
+                        self._matches[(source_type, language, keyword_lower)].append(item)
+    
+    def has(self, source_type: str, language: str) -> bool:
+        """해당 소스/언어의 피드가 스냅샷에 있는지 여부"""
+        return (source_type, language) in self._items
+    
+    def get_matches(self, source_type: str, language: str, keyword: str) -> List[Dict[str, Any]]:
+        """키워드 매칭 결과 조회 (match()에 없던 키워드는 즉시 매칭)"""
+        
+        keyword_lower = keyword.lower()
+        key = (source_type, language, keyword_lower)
+        if key not in self._matches:
+            self._matches[key] = [
+                item for item in self._items.get((source_type, language), [])
+                if keyword_lower in item["_match_text"]
+            ]
+        return self._matches[key]
+    
+    async def commit_watermarks(self):
+        """스냅샷 항목을 저장한 뒤 호출 - 새 워터마크 기록"""
+        pending, self._pending = self._pending, {}
+        for feed_key, mark in pending.items():
+            await feed_watermarks.save(feed_key, mark)
+    
+    @property
+    def item_count(self) -> int:
+        return sum(len(items) for items in self._items.values())
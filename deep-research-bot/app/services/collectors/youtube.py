@@ -1,7 +1,8 @@
-import httpx
-from typing import List, Dict, Any
+from typing import Awaitable, List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from app.core.http import HttpClientManager
 from .base import BaseCollector
+from .snapshot import FeedSnapshot
 from app.config import settings
 import re
 
@@ -10,11 +11,22 @@ class YouTubeCollector(BaseCollector):
     
     source_type = "youtube"
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClientManager] = None):
+        super().__init__(http)
         self.api_key = settings.youtube_api_key
         self.base_url = "https://www.googleapis.com/youtube/v3"
     
-    async def search(self, keyword: str, language: str = "ko", limit: int = 10) -> List[Dict[str, Any]]:
+    def _search_sources(
+        self,
+        keyword: str,
+        language: str,
+        limit: int,
+        snapshot: Optional[FeedSnapshot] = None
+    ) -> List[Awaitable[List[Dict[str, Any]]]]:
+        """YouTube Data API 검색 (API 키가 없으면 대체 검색)"""
+        return [self._search_videos(keyword, language, limit)]
+    
+    async def _search_videos(self, keyword: str, language: str, limit: int) -> List[Dict[str, Any]]:
         """유튜브에서 키워드로 영상 검색"""
         
         results = []
@@ -24,51 +36,61 @@ class YouTubeCollector(BaseCollector):
             return await self._search_without_api(keyword, language, limit)
         
         try:
-            async with httpx.AsyncClient() as client:
-                # 검색 쿼리
-                region_code = "KR" if language == "ko" else "US"
-                relevance_language = "ko" if language == "ko" else "en"
-                
-                params = {
-                    "part": "snippet",
-                    "q": keyword,
-                    "type": "video",
-                    "maxResults": limit,
-                    "order": "date",
-                    "publishedAfter": (datetime.utcnow() - timedelta(days=7)).isoformat() + "Z",
-                    "regionCode": region_code,
-                    "relevanceLanguage": relevance_language,
-                    "key": self.api_key
-                }
-                
-                response = await client.get(f"{self.base_url}/search", params=params)
-                data = response.json()
-                
-                for item in data.get("items", []):
-                    snippet = item.get("snippet", {})
-                    video_id = item.get("id", {}).get("videoId")
-                    
-                    if not video_id:
-                        continue
-                    
-                    results.append({
-                        "title": snippet.get("title", ""),
-                        "url": f"https://www.youtube.com/watch?v={video_id}",
-                        "source_type": self.source_type,
-                        "source_name": snippet.get("channelTitle", "YouTube"),
-                        "language": language,
-                        "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url"),
-                        "description": snippet.get("description", ""),
-                        "content_text": "",  # 트랜스크립트는 별도로 가져옴
-                        "published_at": self._parse_date(snippet.get("publishedAt", ""))
-                    })
-                    
+            # 검색 쿼리
+            region_code = "KR" if language == "ko" else "US"
+            relevance_language = "ko" if language == "ko" else "en"
+            
+            params = {
+                "part": "snippet",
+                "q": keyword,
+                "type": "video",
+                "maxResults": limit,
+                "order": "date",
+                "publishedAfter": (datetime.utcnow() - timedelta(days=7)).isoformat() + "Z",
+                "regionCode": region_code,
+                "relevanceLanguage": relevance_language,
+                "key": self.api_key
+            }
+            
+            results = await self._fetch_parsed(
+                f"{self.base_url}/search",
+                lambda response: self._parse_search_response(response, language),
+                variant=language,
+                params=params
+            )
+        
         except Exception as e:
             print(f"YouTube API 오류: {e}")
             return await self._search_without_api(keyword, language, limit)
         
         return results
     
+    def _parse_search_response(self, response, language: str) -> List[Dict[str, Any]]:
+        """YouTube Data API 검색 응답 파싱"""
+        results = []
+        data = response.json()
+        
+        for item in data.get("items", []):
+            snippet = item.get("snippet", {})
+            video_id = item.get("id", {}).get("videoId")
+            
+            if not video_id:
+                continue
+            
+            results.append({
+                "title": snippet.get("title", ""),
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "source_type": self.source_type,
+                "source_name": snippet.get("channelTitle", "YouTube"),
+                "language": language,
+                "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url"),
+                "description": snippet.get("description", ""),
+                "content_text": "",  # 트랜스크립트는 별도로 가져옴
+                "published_at": self._parse_date(snippet.get("publishedAt", ""))
+            })
+        
+        return results
+    
     async def _search_without_api(self, keyword: str, language: str, limit: int) -> List[Dict[str, Any]]:
         """API 키 없이 RSS 피드를 통한 검색 (제한적)"""
         results = []
@@ -82,51 +104,43 @@ class YouTubeCollector(BaseCollector):
             
             search_url = f"https://www.youtube.com/results?search_query={keyword}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(search_url, headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-                })
-                html = response.text
-                
-                # 간단한 파싱으로 비디오 ID 추출
-                video_ids = re.findall(r'watch\?v=([a-zA-Z0-9_-]{11})', html)
-                video_ids = list(dict.fromkeys(video_ids))[:limit]  # 중복 제거
-                
-                for vid in video_ids:
-                    results.append({
-                        "title": f"YouTube Video ({vid})",  # 제목은 별도 API 필요
-                        "url": f"https://www.youtube.com/watch?v={vid}",
-                        "source_type": self.source_type,
-                        "source_name": "YouTube",
-                        "language": language,
-                        "thumbnail_url": f"https://img.youtube.com/vi/{vid}/hqdefault.jpg",
-                        "description": "",
-                        "content_text": "",
-                        "published_at": datetime.utcnow()
-                    })
-                    
+            results = await self._fetch_parsed(
+                search_url,
+                lambda response: self._parse_search_page(response.text, language, limit),
+                variant=(language, limit),
+                headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
+            )
+        
         except Exception as e:
             print(f"YouTube 대체 검색 오류: {e}")
         
         return results
     
+    def _parse_search_page(self, html: str, language: str, limit: int) -> List[Dict[str, Any]]:
+        """검색 결과 페이지에서 비디오 ID 추출"""
+        results = []
+        
+        # 간단한 파싱으로 비디오 ID 추출
+        video_ids = re.findall(r'watch\?v=([a-zA-Z0-9_-]{11})', html)
+        video_ids = list(dict.fromkeys(video_ids))[:limit]  # 중복 제거
+        
+        for vid in video_ids:
+            results.append({
+                "title": f"YouTube Video ({vid})",  # 제목은 별도 API 필요
+                "url": f"https://www.youtube.com/watch?v={vid}",
+                "source_type": self.source_type,
+                "source_name": "YouTube",
+                "language": language,
+                "thumbnail_url": f"https://img.youtube.com/vi/{vid}/hqdefault.jpg",
+                "description": "",
+                "content_text": "",
+                "published_at": datetime.utcnow()
+            })
+        
+        return results
+    
     async def get_transcript(self, video_id: str, language: str = "ko") -> str:
-        """비디오 자막/트랜스크립트 가져오기"""
-        try:
-            from youtube_transcript_api import YouTubeTranscriptApi
-            
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            
-            # 한국어 또는 영어 자막 찾기
-            try:
-                transcript = transcript_list.find_transcript([language, 'en', 'ko'])
-            except:
-                transcript = transcript_list.find_generated_transcript([language, 'en', 'ko'])
-            
-            text_parts = [entry['text'] for entry in transcript.fetch()]
-            return " ".join(text_parts)
-            
-        except Exception as e:
-            print(f"트랜스크립트 가져오기 실패: {e}")
-            return ""
-
+        """비디오 자막/트랜스크립트 가져오기 (캐시 + 스레드 풀 사용)"""
+        from app.services.transcripts import transcript_fetcher
+        
+        return await transcript_fetcher.get(video_id, language)
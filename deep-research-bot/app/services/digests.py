@@ -0,0 +1,223 @@
+import asyncio
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, and_, desc
+from sqlalchemy.orm import selectinload
+
+from app.models.database import Content, DailyDigest, Keyword, async_session
+from app.services.analyzer import analyzer
+from app.config import settings
+
+# 다이제스트 대상 - 분석 완료, 공유 점수 기준 이상, 점수 순 상위
+DIGEST_MIN_SCORE = 60
+DIGEST_MAX_CONTENTS = 20
+
+EMPTY_MESSAGE = "오늘 수집된 고득점 콘텐츠가 없습니다."
+
+
+class DailyDigests:
+    """
+    일일 다이제스트 저장소
+    
+    날짜/키워드 필터별 다이제스트를 생성에 쓴 콘텐츠 ID와 함께 저장한다. 조회할 때는 현재 대상 콘텐츠
+    (점수 순 상위 DIGEST_MAX_CONTENTS건)의 ID 집합만 확인하고, 저장된 것과 같으면 LLM 호출 없이 바로 돌려준다.
+    새 고득점 콘텐츠가 들어오거나 분석 결과가 바뀌어 집합이 달라졌을 때만 다시 생성한다.
+    일일 리서치 직후 미리 생성해 두므로 보통은 조회가 바로 끝난다.
+    """
+    
+    def __init__(self):
+        # 같은 다이제스트를 동시에 여러 번 생성하지 않게 (날짜, 키워드)별 잠금
+        self._locks: Dict[Tuple[date, int], asyncio.Lock] = {}
+        self.hits = 0
+        self.generated = 0
+    
+    def _lock(self, day: date, keyword_id: int) -> asyncio.Lock:
+        return self._locks.setdefault((day, keyword_id), asyncio.Lock())
+    
+    @staticmethod
+    def contents_query(day: date, keyword_id: int = 0):
+        """다이제스트 대상 조회 쿼리 (keyword_id가 0이면 전체 키워드)"""
+        # func.date(created_at)로 비교하면 인덱스를 쓰지 못하므로 범위로 비교
+        day_start = datetime.combine(day, time.min)
+        conditions = [
+            Content.created_at >= day_start,
+            Content.created_at < day_start + timedelta(days=1),
+            Content.is_analyzed == True,
+            Content.ai_share_score >= DIGEST_MIN_SCORE
+        ]
+        if keyword_id:
+            conditions.append(Content.keyword_id == keyword_id)
+        
+        return (
+            select(Content)
+            .where(and_(*conditions))
+            .options(selectinload(Content.keyword))
+            .order_by(desc(Content.ai_share_score))
+            .limit(DIGEST_MAX_CONTENTS)
+        )
+    
+    async def select_contents(self, day: date, keyword_id: int = 0) -> List[Content]:
+        """다이제스트 대상 콘텐츠 (keyword_id가 0이면 전체 키워드)"""
+        async with async_session() as session:
+            result = await session.execute(self.contents_query(day, keyword_id))
+            return result.scalars().all()
+    
+    async def stored(self, day: date, keyword_id: int = 0) -> Optional[DailyDigest]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(DailyDigest).where(
+                    and_(DailyDigest.digest_date == day, DailyDigest.keyword_id == keyword_id)
+                )
+            )
+            return result.scalars().first()
+    
+    @staticmethod
+    def is_current(digest: Optional[DailyDigest], content_ids: List[int]) -> bool:
+        """저장된 다이제스트가 현재 대상 콘텐츠로 만든 것인지 (순서는 무시)"""
+        return digest is not None and set(json.loads(digest.content_ids)) == set(content_ids)
+    
+    async def save(self, day: date, keyword_id: int, content_ids: List[int], text: str):
+        async with async_session() as session:
+            result = await session.execute(
+                select(DailyDigest).where(
+                    and_(DailyDigest.digest_date == day, DailyDigest.keyword_id == keyword_id)
+                )
+            )
+            digest = result.scalars().first()
+            if not digest:
+                digest = DailyDigest(digest_date=day, keyword_id=keyword_id)
+                session.add(digest)
+            digest.content_ids = json.dumps(content_ids)
+            digest.digest = text
+            digest.model = analyzer.model
+            digest.updated_at = datetime.utcnow()
+            await session.commit()
+    
+    @staticmethod
+    def _response(day: date, keyword_id: int, text: str, contents: List[Dict[str, Any]], **extra) -> Dict[str, Any]:
+        return {
+            "digest": text,
+            "contents": contents,
+            "date": day.isoformat(),
+            "keyword_id": keyword_id or None,
+            **extra
+        }
+    
+    async def get(self, day: Optional[date] = None, keyword_id: int = 0) -> Dict[str, Any]:
+        """다이제스트 조회 - 대상 콘텐츠가 바뀌었거나 없을 때만 생성해 저장"""
+        day = day or datetime.utcnow().date()
+        contents = await self.select_contents(day, keyword_id)
+        if not contents:
+            return self._response(day, keyword_id, EMPTY_MESSAGE, [])
+        
+        content_dicts = [c.to_dict() for c in contents]
+        content_ids = [c.id for c in contents]
+        
+        async with self._lock(day, keyword_id):
+            digest = await self.stored(day, keyword_id)
+            if self.is_current(digest, content_ids):
+                self.hits += 1
+                return self._response(
+                    day, keyword_id, digest.digest, content_dicts,
+                    generated_at=digest.updated_at.isoformat() if digest.updated_at else None
+                )
+            
+            try:
+                text = await analyzer.write_daily_digest(content_dicts)
+            except Exception as e:
+                # 실패 결과는 저장하지 않음 (다음 조회에서 다시 생성)
+                print(f"다이제스트 생성 오류: {e}")
+                return self._response(day, keyword_id, f"다이제스트 생성 실패: {str(e)}", content_dicts)
+            
+            await self.save(day, keyword_id, content_ids, text)
+            self.generated += 1
+        
+        return self._response(day, keyword_id, text, content_dicts, generated_at=datetime.utcnow().isoformat())
+    
+    async def stream(self, day: Optional[date] = None, keyword_id: int = 0) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        다이제스트 스트리밍 - (이벤트, 데이터)를 차례로 반환
+        
+        contents: 대상 콘텐츠 목록 (DB 조회 직후 바로)
+        token: 생성 중인 다이제스트 조각 (저장된 다이제스트가 현재 것이면 전체를 한 번에)
+        done: 완료 (스트림이 끝까지 받아지면 전체 텍스트를 저장)
+        error: 생성 실패 (저장하지 않음)
+        """
+        day = day or datetime.utcnow().date()
+        contents = await self.select_contents(day, keyword_id)
+        content_dicts = [c.to_dict() for c in contents]
+        content_ids = [c.id for c in contents]
+        yield "contents", {"date": day.isoformat(), "keyword_id": keyword_id or None, "contents": content_dicts}
+        
+        if not contents:
+            yield "token", {"text": EMPTY_MESSAGE}
+            yield "done", {"cached": False}
+            return
+        
+        async with self._lock(day, keyword_id):
+            digest = await self.stored(day, keyword_id)
+            if self.is_current(digest, content_ids):
+                self.hits += 1
+                yield "token", {"text": digest.digest}
+                yield "done", {
+                    "cached": True,
+                    "generated_at": digest.updated_at.isoformat() if digest.updated_at else None
+                }
+                return
+            
+            parts = []
+            try:
+                async for delta in analyzer.stream_daily_digest(content_dicts):
+                    parts.append(delta)
+                    yield "token", {"text": delta}
+            except Exception as e:
+                print(f"다이제스트 생성 오류: {e}")
+                yield "error", {"message": f"다이제스트 생성 실패: {str(e)}"}
+                return
+            
+            # 클라이언트가 중간에 끊으면 여기까지 오지 않으므로 일부만 받은 텍스트는 저장되지 않음
+            await self.save(day, keyword_id, content_ids, "".join(parts))
+            self.generated += 1
+        
+        yield "done", {"cached": False, "generated_at": datetime.utcnow().isoformat()}
+    
+    async def refresh(self, day: Optional[date] = None) -> int:
+        """
+        다이제스트 미리 생성 (일일 리서치 / 배치 결과 반영 직후)
+        
+        전체 키워드 다이제스트와 그날 이미 조회된 키워드 필터의 다이제스트를, digest_prebuild_keywords가
+        켜져 있으면 모든 활성 키워드의 다이제스트를 갱신한다. 대상 콘텐츠가 같으면 다시 생성하지 않는다.
+        
+        Returns:
+            새로 생성한 다이제스트 수
+        """
+        day = day or datetime.utcnow().date()
+        async with async_session() as session:
+            result = await session.execute(
+                select(DailyDigest.keyword_id).where(DailyDigest.digest_date == day)
+            )
+            keyword_ids = {0, *result.scalars().all()}
+            if settings.digest_prebuild_keywords:
+                result = await session.execute(select(Keyword.id).where(Keyword.is_active == True))
+                keyword_ids.update(result.scalars().all())
+        
+        before = self.generated
+        for keyword_id in sorted(keyword_ids):
+            try:
+                await self.get(day, keyword_id)
+            except Exception as e:
+                print(f"다이제스트 미리 생성 오류 (키워드 {keyword_id}): {e}")
+        
+        created = self.generated - before
+        if created:
+            print(f"📋 다이제스트 {created}건 생성")
+        return created
+    
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "generated": self.generated}
+
+
+# Singleton instance
+daily_digests = DailyDigests()
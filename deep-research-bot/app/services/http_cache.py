@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import select
+
+from app.models.database import HttpCache, async_session
+
+class ConditionalGetCache:
+    """
+    조건부 GET 캐시 (ETag / Last-Modified)
+    
+    URL별 검증자와 본문, 본문 해시, 파싱 요약(피드는 엔트리 식별 정보)을 DB(http_cache 테이블)에 저장한다.
+    요청 시 If-None-Match / If-Modified-Since를 보내고, 304 응답이거나 본문 해시가
+    같으면 다운로드/파싱 없이 저장된 본문과 요약을 돌려준다. 호출자는 요약만 보고
+    다시 파싱할 필요가 있는지 판단한다 (피드는 워터마크 이후 엔트리가 있을 때만).
+    """
+    
+    def __init__(self):
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._load_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self.not_modified = 0  # 304 응답
+        self.unchanged = 0  # 200이지만 본문 해시 동일
+        self.misses = 0  # 새로 파싱
+    
+    async def _ensure_loaded(self):
+        """캐시 항목을 한 번에 메모리로 로드"""
+        if self._entries is not None:
+            return
+        async with self._load_lock:
+            if self._entries is not None:
+                return
+            async with async_session() as session:
+                result = await session.execute(select(HttpCache))
+                self._entries = {
+                    row.url: {
+                        "etag": row.etag,
+                        "last_modified": row.last_modified,
+                        "body_hash": row.body_hash,
+                        "body": row.body,
+                        "parsed_items": row.parsed_items
+                    }
+                    for row in result.scalars().all()
+                }
+    
+    async def fetch(
+        self,
+        get: Callable[..., Awaitable[httpx.Response]],
+        url: str,
+        parse: Callable[[str], Awaitable[Tuple[List[Dict[str, Any]], Any]]],
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[str, List[Dict[str, Any]], Optional[Any]]:
+        """
+        조건부 GET 후 (본문, 파싱 요약, 파싱 결과) 반환
+        
+        Args:
+            get: 실제 요청 함수 (BaseCollector._get)
+            url: 요청 URL
+            parse: 새 본문 -> (파싱 요약, 파싱 결과) 코루틴. 요약만 저장한다
+                (JSON 직렬화 가능한 dict 목록 + datetime)
+            headers: 추가 요청 헤더
+        
+        304이거나 본문이 같으면 파싱하지 않으므로 파싱 결과는 None이다. 이미 처리한 항목
+        제외(워터마크)는 호출자 몫 - 같은 URL을 여러 범위(scope)가 공유하므로 캐시가
+        범위별 상태를 가지면 안 된다.
+        """
+        await self._ensure_loaded()
+        entry = self._entries.get(url)
+        cached = bool(entry and entry["body"] is not None and entry["parsed_items"] is not None)
+        
+        request_headers = dict(headers or {})
+        if cached:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        
+        response = await get(url, headers=request_headers)
+        
+        if response.status_code == 304 and cached:
+            self.not_modified += 1
+            return entry["body"], self._decode(entry["parsed_items"]), None
+        
+        response.raise_for_status()
+        
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        
+        if cached and entry["body_hash"] == body_hash:
+            # 검증자를 지원하지 않는 서버 - 본문이 같으면 파싱 생략
+            self.unchanged += 1
+            if etag != entry["etag"] or last_modified != entry["last_modified"]:
+                await self._store(url, etag, last_modified, body_hash, entry["body"], entry["parsed_items"])
+            return entry["body"], self._decode(entry["parsed_items"]), None
+        
+        self.misses += 1
+        summary, parsed = await parse(response.text)
+        await self._store(url, etag, last_modified, body_hash, response.text, self._encode(summary))
+        return response.text, summary, parsed
+    
+    async def _store(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body_hash: str,
+        body: str,
+        parsed_items: str
+    ):
+        """캐시 항목 저장 (메모리 + DB)"""
+        self._entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body_hash": body_hash,
+            "body": body,
+            "parsed_items": parsed_items
+        }
+        
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    result = await session.execute(select(HttpCache).where(HttpCache.url == url))
+                    row = result.scalars().first()
+                    if not row:
+                        row = HttpCache(url=url)
+                        session.add(row)
+                    row.etag = etag
+                    row.last_modified = last_modified
+                    row.body_hash = body_hash
+                    row.body = body
+                    row.parsed_items = parsed_items
+                    row.fetched_at = datetime.utcnow()
+                    await session.commit()
+            except Exception as e:
+                print(f"HTTP 캐시 저장 오류 ({url}): {e}")
+    
+    @staticmethod
+    def _encode(items: List[Dict[str, Any]]) -> str:
+        return json.dumps(
+            items,
+            ensure_ascii=False,
+            default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o)
+        )
+    
+    @staticmethod
+    def _decode(data: str) -> List[Dict[str, Any]]:
+        items = json.loads(data)
+        for item in items:
+            if item.get("published_at"):
+                item["published_at"] = datetime.fromisoformat(item["published_at"])
+        return items
+    
+    def reset(self):
+        """메모리 캐시 비우기 (다음 요청 시 DB에서 다시 로드)"""
+        self._entries = None
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.not_modified + self.unchanged + self.misses
+        return {
+            "entries": len(self._entries) if self._entries is not None else None,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "misses": self.misses,
+            "hit_ratio": round((self.not_modified + self.unchanged) / total, 3) if total else 0.0
+        }
+
+
+# Singleton instance
+conditional_cache = ConditionalGetCache()
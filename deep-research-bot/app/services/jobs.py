@@ -0,0 +1,201 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.models.database import ResearchLog, async_session
+from app.services.researcher import researcher
+
+# 아직 끝나지 않은 작업 상태
+ACTIVE_STATUSES = ("queued", "running")
+
+# 메모리에 보관하는 최근 작업 결과 수
+MAX_RESULTS = 50
+
+
+class ResearchJobs:
+    """
+    백그라운드 리서치 작업 관리자
+    
+    실행 요청은 대기(queued) 실행 로그를 만들고 바로 작업 ID(= 실행 로그 ID)를 돌려준다.
+    작업은 큐에서 하나씩 실행되고, 진행 상황(단계별 건수, 현재 키워드, 예상 남은 시간)은
+    파이프라인이 실행 로그에 주기적으로 기록한다. 같은 범위(전체 / 키워드)의 작업이 대기 중이거나
+    실행 중이면 새로 만들지 않고 그 작업에 합친다. 작업 큐는 프로세스 안에만 있으므로
+    서버가 재시작되면 대기 중이던 작업은 실행되지 않는다 (시작 시 실행 로그를 정리).
+    """
+    
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._runner: Optional[asyncio.Task] = None
+        # 범위 -> 대기/실행 중인 작업 ID
+        self._active: Dict[str, int] = {}
+        self._running: Optional[Tuple[int, asyncio.Task]] = None
+        self._cancelled: Set[int] = set()
+        # 작업 ID -> 실행 결과 (최근 MAX_RESULTS건)
+        self._results: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.submitted = 0
+        self.merged = 0
+    
+    @staticmethod
+    def scope(keyword_id: Optional[int]) -> str:
+        return f"keyword:{keyword_id}" if keyword_id else "all"
+    
+    async def recover(self):
+        """
+        이전 프로세스에서 대기/실행 중이던 작업 정리 (앱 시작 시)
+        
+        남겨 두면 같은 범위의 새 작업이 끝나지 않을 작업에 합쳐진다 (uq_research_logs_active_scope).
+        워커 실행(workers)은 worker.py가 이어서 처리하므로 제외.
+        """
+        async with async_session() as session:
+            await session.execute(
+                update(ResearchLog)
+                .where(
+                    ResearchLog.status.in_(ACTIVE_STATUSES),
+                    or_(ResearchLog.scope == "all", ResearchLog.scope.like("keyword:%"))
+                )
+                .values(status="cancelled", completed_at=datetime.utcnow(), error_message="서버 재시작으로 취소")
+            )
+            await session.commit()
+    
+    async def submit(self, keyword_id: Optional[int] = None) -> Dict[str, Any]:
+        """리서치 작업 등록 - 같은 범위의 작업이 이미 있으면 그 작업 ID 반환 (merged=True)"""
+        scope = self.scope(keyword_id)
+        async with self._lock:
+            job_id = self._active.get(scope)
+            if job_id is not None:
+                self.merged += 1
+                return {"job_id": job_id, "scope": scope, "merged": True}
+            
+            async with async_session() as session:
+                log = ResearchLog(status="queued", scope=scope)
+                session.add(log)
+                try:
+                    await session.commit()
+                except IntegrityError:
+                    # 다른 프로세스에 같은 범위의 작업이 있음 (범위당 하나 - uq_research_logs_active_scope)
+                    await session.rollback()
+                    result = await session.execute(
+                        select(ResearchLog.id).where(
+                            ResearchLog.scope == scope, ResearchLog.status.in_(ACTIVE_STATUSES)
+                        )
+                    )
+                    self.merged += 1
+                    return {"job_id": result.scalars().first(), "scope": scope, "merged": True}
+                await session.refresh(log)
+            
+            self._active[scope] = log.id
+            self.submitted += 1
+            if self._runner is None or self._runner.done():
+                self._queue = asyncio.Queue()
+                self._runner = asyncio.create_task(self._run())
+            await self._queue.put((log.id, scope, keyword_id))
+        
+        print(f"🗂️ 리서치 작업 등록: #{log.id} ({scope})")
+        return {"job_id": log.id, "scope": scope, "merged": False}
+    
+    async def _run(self):
+        """작업을 하나씩 실행"""
+        while True:
+            job_id, scope, keyword_id = await self._queue.get()
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            
+            if keyword_id:
+                task = asyncio.create_task(researcher.research_single_keyword(keyword_id, log_id=job_id))
+            else:
+                task = asyncio.create_task(researcher.run_daily_research(log_id=job_id))
+            self._running = (job_id, task)
+            
+            # 작업 취소와 관리자 자신의 취소를 구분하기 위해 결과를 기다리지 않고 완료만 기다림
+            await asyncio.wait([task])
+            self._running = None
+            async with self._lock:
+                self._active.pop(scope, None)
+            
+            if task.cancelled():
+                result = {"status": "cancelled"}
+                await self._close(job_id, "cancelled")
+            elif task.exception() is not None:
+                result = {"status": "failed", "message": str(task.exception())}
+                print(f"리서치 작업 오류 (#{job_id}): {task.exception()}")
+                await self._close(job_id, "failed", str(task.exception()))
+            else:
+                result = task.result()
+            self._remember(job_id, result)
+            print(f"🗂️ 리서치 작업 종료: #{job_id} ({result.get('status')})")
+    
+    @staticmethod
+    async def _close(job_id: int, status: str, error_message: Optional[str] = None):
+        """실행 로그가 아직 대기/실행 중이면 종료 상태로 (실행 로그를 열기 전에 멈춘 경우 등)"""
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(ResearchLog)
+                    .where(ResearchLog.id == job_id, ResearchLog.status.in_(ACTIVE_STATUSES))
+                    .values(status=status, completed_at=datetime.utcnow(), error_message=error_message)
+                )
+                await session.commit()
+        except Exception as e:
+            print(f"실행 로그 정리 오류 (#{job_id}): {e}")
+    
+    def _remember(self, job_id: int, result: Dict[str, Any]):
+        self._results[job_id] = result
+        while len(self._results) > MAX_RESULTS:
+            self._results.popitem(last=False)
+    
+    async def cancel(self, job_id: int) -> Optional[str]:
+        """
+        작업 취소
+        
+        Returns:
+            cancelling (실행 중 - 파이프라인을 멈추는 중), cancelled (대기 중이던 작업),
+            None (대기/실행 중인 작업이 아님)
+        """
+        if self._running and self._running[0] == job_id:
+            self._running[1].cancel()
+            return "cancelling"
+        
+        async with self._lock:
+            scope = next((scope for scope, active_id in self._active.items() if active_id == job_id), None)
+            if scope is None:
+                return None
+            self._active.pop(scope)
+            self._cancelled.add(job_id)
+        await self._close(job_id, "cancelled")
+        return "cancelled"
+    
+    async def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """작업 상태 - 실행 로그(진행 상황 포함) + 끝난 작업의 결과"""
+        async with async_session() as session:
+            log = await session.get(ResearchLog, job_id)
+        if log is None:
+            return None
+        return {**log.to_dict(), "result": self._results.get(job_id)}
+    
+    async def active(self) -> List[Dict[str, Any]]:
+        """대기/실행 중인 작업"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(ResearchLog)
+                .where(ResearchLog.id.in_(list(self._active.values())))
+                .order_by(ResearchLog.id)
+            )
+            return [log.to_dict() for log in result.scalars().all()]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running[0] if self._running else None,
+            "queued": max(len(self._active) - (1 if self._running else 0), 0),
+            "submitted": self.submitted,
+            "merged": self.merged
+        }
+
+
+# Singleton instance
+research_jobs = ResearchJobs()
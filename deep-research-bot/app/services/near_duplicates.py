@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, and_
+
+from app.models.database import Content, async_session
+from app.config import settings
+
+SIMHASH_BITS = 64
+
+# 특징이 너무 적으면 SimHash가 우연히 가까워지기 쉬워 비교하지 않음
+MIN_FEATURES = 8
+
+# 한글 음절/자모, 그 외 문자(영문·숫자 등) 토큰
+_HANGUL_RE = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]+")
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# 짧은 기능어 - 제목마다 달라도 의미가 같은 경우가 많아 제외
+STOPWORDS = {
+    "a", "an", "the", "of", "to", "in", "on", "for", "and", "or", "is", "are", "with", "by", "at", "from",
+    "as", "its", "it", "this", "that", "be", "was", "will"
+}
+
+
+def normalize_text(text: str) -> str:
+    """NFKC 정규화 + 소문자화 + 구두점/공백 정리 (전각 문자, 호환 자모 통일)"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return " ".join(_WORD_RE.findall(text))
+
+
+def shingles(text: str) -> List[str]:
+    """
+    SimHash 특징 추출
+    
+    영문 등 공백으로 구분되는 언어는 단어와 단어 2-gram을 사용하고,
+    한글은 조사/어미가 단어에 붙어 단어 단위 비교가 흔들리므로 음절 2-gram을 사용한다.
+    (예: "오픈AI가" / "오픈AI는" 은 단어로는 다르지만 음절 2-gram은 대부분 같다)
+    """
+    features = []
+    words = []
+    for token in normalize_text(text).split():
+        hangul_runs = _HANGUL_RE.findall(token)
+        if hangul_runs:
+            for run in hangul_runs:
+                if len(run) == 1:
+                    features.append(run)
+                features.extend(run[i:i + 2] for i in range(len(run) - 1))
+            rest = _HANGUL_RE.sub(" ", token).split()
+            features.extend(rest)
+            continue
+        if token in STOPWORDS:
+            continue
+        words.append(token)
+        features.append(token)
+    
+    features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return features
+
+
+def _feature_hash(feature: str) -> int:
+    # 내장 hash()는 프로세스마다 달라지므로 저장 가능한 고정 해시 사용
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> Optional[int]:
+    """64비트 SimHash (특징이 너무 적으면 None)"""
+    features = shingles(text)
+    if len(features) < MIN_FEATURES:
+        return None
+    
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def content_fingerprint(title: str, description: str) -> Optional[str]:
+    """제목+설명의 SimHash (16자리 hex, DB 저장용)"""
+    value = simhash(f"{title or ''} {description or ''}")
+    return f"{value:016x}" if value is not None else None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    유사 중복 콘텐츠 인덱스 (SimHash + 밴드 분할 LSH)
+    
+    통신사 기사·보도자료처럼 URL만 다르고 제목/설명이 거의 같은 콘텐츠를 묶는다.
+    대표 콘텐츠의 SimHash를 키워드별로 메모리에 두고, 64비트를 (허용 거리 + 1)개 밴드로
+    나눠 색인한다. 해밍 거리가 허용 거리 이하인 두 값은 적어도 한 밴드가 정확히 같으므로
+    (비둘기집 원리) 해당 밴드 버킷만 비교하면 된다.
+    분석 결과는 키워드에 따라 달라지므로 같은 키워드 안에서만 묶는다.
+    
+    기준 데이터는 DB(contents.simhash)이고 메모리 인덱스는 프로세스별 사본이다. sync()가 다른
+    프로세스(워커)가 저장한 대표 콘텐츠를 ID 순으로 이어서 가져오고 비교 기간이 지난 항목은 뺀다.
+    여러 워커가 같은 글을 동시에 저장하면 서로를 보지 못해 둘 다 대표가 될 수 있다 (분석이 한 번 더 될 뿐).
+    """
+    
+    # 비교 기간이 지난 항목 정리 간격 (초)
+    PRUNE_INTERVAL = 3600
+    
+    def __init__(self):
+        self._buckets: Optional[Dict[Tuple[int, int, int], List[Tuple[int, int]]]] = None
+        # content_id -> (keyword_id, SimHash, 저장 시각)
+        self._entries: Dict[int, Tuple[int, int, datetime]] = {}
+        # DB에서 가져온 마지막 콘텐츠 ID
+        self._synced_id = 0
+        self._pruned_at: Optional[datetime] = None
+        self._load_lock = asyncio.Lock()
+        self.max_distance = settings.near_duplicate_max_distance
+        self._bands = self._band_ranges(self.max_distance + 1)
+        self.representatives = 0
+        self.duplicates = 0
+        self.pruned = 0
+    
+    @staticmethod
+    def _band_ranges(count: int) -> List[Tuple[int, int]]:
+        count = min(max(count, 1), SIMHASH_BITS)
+        width, extra = divmod(SIMHASH_BITS, count)
+        ranges, start = [], 0
+        for i in range(count):
+            size = width + (1 if i < extra else 0)
+            ranges.append((start, size))
+            start += size
+        return ranges
+    
+    def _band_keys(self, keyword_id: int, value: int):
+        for index, (start, size) in enumerate(self._bands):
+            yield (keyword_id, index, value >> start & ((1 << size) - 1))
+    
+    async def _ensure_loaded(self):
+        """최근 대표 콘텐츠의 SimHash를 한 번에 로드"""
+        if self._buckets is not None:
+            return
+        await self.sync()
+    
+    @staticmethod
+    def sync_query(after_id: int, since: datetime):
+        """after_id 이후에 저장된 비교 기간 내 대표 콘텐츠 조회 쿼리"""
+        return select(Content.id, Content.keyword_id, Content.simhash, Content.created_at).where(
+            and_(
+                Content.id > after_id,
+                Content.simhash.isnot(None),
+                Content.duplicate_of.is_(None),
+                Content.created_at >= since
+            )
+        ).order_by(Content.id)
+    
+    async def sync(self):
+        """
+        DB와 맞추기 - 처음에는 비교 기간 내 대표 콘텐츠 전체, 이후에는 마지막으로 가져온 ID 이후만 로드
+        
+        파이프라인이 저장 배치마다 호출하므로 다른 워커가 방금 저장한 대표 콘텐츠도 비교 대상이 된다.
+        """
+        async with self._load_lock:
+            now = datetime.utcnow()
+            since = now - timedelta(days=settings.near_duplicate_window_days)
+            if self._buckets is None:
+                self._buckets = {}
+                self._entries = {}
+                self._synced_id = 0
+                self._pruned_at = now
+            elif (now - self._pruned_at).total_seconds() >= self.PRUNE_INTERVAL:
+                self._prune(since)
+                self._pruned_at = now
+            
+            async with async_session() as session:
+                result = await session.execute(self.sync_query(self._synced_id, since))
+                for content_id, keyword_id, fingerprint, created_at in result.all():
+                    if content_id not in self._entries:
+                        self._add(content_id, keyword_id, int(fingerprint, 16), created_at or now)
+                    self._synced_id = content_id
+    
+    def _add(self, content_id: int, keyword_id: int, value: int, created_at: datetime):
+        self._entries[content_id] = (keyword_id, value, created_at)
+        for key in self._band_keys(keyword_id, value):
+            self._buckets.setdefault(key, []).append((content_id, value))
+    
+    def _prune(self, since: datetime):
+        """비교 기간이 지난 대표 콘텐츠 제거 (버킷 재구성)"""
+        expired = [cid for cid, (_, _, created_at) in self._entries.items() if created_at < since]
+        if not expired:
+            return
+        for content_id in expired:
+            del self._entries[content_id]
+        self._buckets = {}
+        for content_id, (keyword_id, value, _) in self._entries.items():
+            for key in self._band_keys(keyword_id, value):
+                self._buckets.setdefault(key, []).append((content_id, value))
+        self.pruned += len(expired)
+    
+    def _remove(self, content_id: int):
+        keyword_id, value, _ = self._entries.pop(content_id)
+        for key in self._band_keys(keyword_id, value):
+            self._buckets[key] = [entry for entry in self._buckets[key] if entry[0] != content_id]
+    
+    def _find(self, keyword_id: int, value: int, before_id: int) -> Optional[int]:
+        """before_id보다 먼저 저장된 가장 가까운 대표 (대표는 항상 먼저 저장된 쪽 - 서로를 가리키지 않게)"""
+        best_id, best_distance = None, self.max_distance + 1
+        for key in self._band_keys(keyword_id, value):
+            for content_id, candidate in self._buckets.get(key, []):
+                if content_id >= before_id:
+                    continue
+                distance = hamming_distance(value, candidate)
+                if distance < best_distance:
+                    best_id, best_distance = content_id, distance
+        return best_id
+    
+    async def assign(self, content_id: int, keyword_id: int, fingerprint: Optional[str]) -> Optional[int]:
+        """
+        새 콘텐츠를 클러스터에 배정
+        
+        Returns:
+            유사 중복이면 대표 콘텐츠 ID, 새 대표이면 None
+        """
+        if not fingerprint:
+            return None
+        await self._ensure_loaded()
+        
+        value = int(fingerprint, 16)
+        representative_id = self._find(keyword_id, value, content_id)
+        if representative_id is not None:
+            # sync()가 이미 가져온 경우 대표 후보에서 제외
+            if content_id in self._entries:
+                self._remove(content_id)
+            self.duplicates += 1
+            return representative_id
+        
+        if content_id not in self._entries:
+            self._add(content_id, keyword_id, value, datetime.utcnow())
+        self.representatives += 1
+        return None
+    
+    def reset(self):
+        """메모리 인덱스 비우기 (다음 사용 시 DB에서 다시 로드)"""
+        self._buckets = None
+        self._entries = {}
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "indexed": len(self._entries),
+            "representatives": self.representatives,
+            "duplicates": self.duplicates,
+            "pruned": self.pruned,
+            "max_distance": self.max_distance
+        }
+
+
+# Singleton instance
+near_duplicate_index = NearDuplicateIndex()
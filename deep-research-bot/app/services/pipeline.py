@@ -0,0 +1,754 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from sqlalchemy import select, update, and_, or_
+import asyncio
+import json
+import time
+
+from app.models.database import Keyword, Content, ResearchLog, async_session, insert_ignore_conflicts
+from app.services.collectors import BaseCollector, FeedSnapshot
+from app.services.analyzer import analyzer, analysis_values
+from app.services.analysis_batches import analysis_batches
+from app.services.urls import url_resolver, canonicalize_url, dedupe_key
+from app.services.near_duplicates import near_duplicate_index, content_fingerprint
+from app.services.article_extractor import article_extractor
+from app.services.transcripts import transcript_fetcher, video_id_from_url
+from app.services.relevance import relevance_scorer
+from app.core.concurrency import run_tasks
+from app.core.singleflight import singleflight
+from app.config import settings
+
+# 단계 종료 신호
+_DONE = object()
+
+class ResearchPipeline:
+    """
+    스트리밍 단계형 리서치 파이프라인
+    
+    collect → normalize/dedupe → persist → extract → analyze 단계를 bounded asyncio.Queue로 연결한다.
+    수집기는 항목을 파싱되는 대로 내보내고, 저장된 항목은 바로 분석 단계로 넘어가
+    분석이 수집과 겹쳐서 진행된다. 큐가 가득 차면 앞 단계가 기다리므로(backpressure)
+    전체 소요 시간은 각 단계의 합이 아니라 가장 느린 단계에 가까워진다.
+    """
+    
+    def __init__(
+        self,
+        collectors: Dict[str, BaseCollector],
+        languages: List[str],
+        snapshot: Optional[FeedSnapshot] = None,
+        analyze: bool = True,
+        log_id: Optional[int] = None,
+        feeds_only: bool = False,
+        load_backlog: bool = True,
+        backlog_before: Optional[datetime] = None
+    ):
+        self.collectors = collectors
+        self.languages = languages
+        self.snapshot = snapshot
+        # False면 수집/저장/본문 추출까지만 하고 분석은 배치 작업에 맡김
+        self.analyze = analyze
+        # 진행 상황을 기록할 실행 로그 (ResearchLog.progress)
+        self.log_id = log_id
+        # True면 검색 API 없이 스냅샷의 고정 피드 매칭 항목만 수집 (워커의 피드 작업)
+        self.feeds_only = feeds_only
+        # False면 이전 실행의 미분석 항목은 다루지 않음 (같은 항목을 다른 작업이 맡는 경우)
+        self.load_backlog = load_backlog
+        # 이 시각 이전에 저장된 미분석 항목만 다룸 (같은 실행의 다른 작업이 저장하고 분석 중인 항목 제외)
+        self.backlog_before = backlog_before
+        self.stats = {
+            "collected": 0,
+            "collect_failed": 0,  # 오류로 중단된 수집 단위
+            "duplicates": 0,
+            "persisted": 0,
+            "skipped": 0,
+            "persist_failed": 0,  # DB 오류로 저장하지 못한 항목
+            "update_failed": 0,  # DB 오류로 본문/관련도 점수를 저장하지 못한 항목
+            "extracted": 0,  # 본문을 추출한 항목
+            "transcribed": 0,  # 트랜스크립트를 가져온 영상
+            "analyzed": 0,
+            "near_duplicates": 0,  # 대표 콘텐츠 결과를 복사한 항목
+            "analysis_failed": 0,
+            "analysis_queued": 0,  # 분석 단계로 넘긴 항목
+            "deferred": 0,  # 배치 작업으로 넘긴 항목
+            "low_priority": 0,  # 관련도 점수가 기준 미만인 항목 (나중에 분석하거나 건너뜀)
+            "coalesced_requests": 0,  # 병합되어 보내지 않은 외부 요청
+            "analysis_seconds": 0.0,  # 첫 분석 시작 ~ 마지막 분석 완료
+            "analysis_per_minute": 0.0  # 분석 처리량
+        }
+        # keyword_id -> {"found": n, "skipped": n, "analyzed": n}
+        self.keyword_stats: Dict[int, Dict[str, int]] = {}
+        # 대표 콘텐츠 ID -> 분석 결과를 기다리는 유사 중복 작업
+        self._siblings: Dict[int, List[Dict[str, Any]]] = {}
+        # 이번 실행에서 분석된 대표 콘텐츠 ID -> 저장된 분석 결과
+        self._results: Dict[int, Dict[str, Any]] = {}
+        # 저순위 항목 - 다른 항목을 모두 분석 단계로 넘긴 뒤 처리
+        self._delayed: List[Dict[str, Any]] = []
+        self._analysis_started: Optional[float] = None
+        self._analysis_finished: Optional[float] = None
+        # 진행 상황 - 수집 단위(키워드 × 소스 × 언어) 수, 키워드별 남은 수집 단위 (키워드 순서대로)
+        self._units_total = 0
+        self._units_done = 0
+        self._units_left: Dict[str, int] = {}
+        self._started: Optional[float] = None
+    
+    async def run(self, keywords: List[Keyword]) -> Dict[int, Dict[str, int]]:
+        """파이프라인 실행 - 키워드별 수집/분석 건수 반환"""
+        
+        # 실행 안에서 같은 외부 요청은 한 번만 보냄 (언어/키워드가 겹치는 검색)
+        async with singleflight.scope() as scope:
+            try:
+                keyword_stats = await self._run_stages(keywords)
+            finally:
+                self.stats["coalesced_requests"] = scope.saved
+        
+        # 피드 워터마크는 항목이 저장된 뒤에만 기록 (수집/저장 실패가 있으면 다음 실행에서 다시 수집)
+        if self.snapshot is not None:
+            if self.stats["persist_failed"] or self.stats["collect_failed"]:
+                print(
+                    f"⚠️ 수집 실패 {self.stats['collect_failed']}건, 저장 실패 {self.stats['persist_failed']}건"
+                    f" - 피드 워터마크를 갱신하지 않음"
+                )
+            else:
+                await self.snapshot.commit_watermarks()
+        return keyword_stats
+    
+    async def _run_stages(self, keywords: List[Keyword]) -> Dict[int, Dict[str, int]]:
+        self.keyword_stats = {k.id: {"found": 0, "skipped": 0, "analyzed": 0} for k in keywords}
+        self._keyword_names = {k.id: k.name for k in keywords}
+        
+        queue_size = settings.pipeline_queue_size
+        collect_queue = asyncio.Queue(maxsize=queue_size)
+        persist_queue = asyncio.Queue(maxsize=queue_size)
+        extract_queue = asyncio.Queue(maxsize=queue_size)
+        analyze_queue = asyncio.Queue(maxsize=queue_size)
+        extract_workers = max(settings.article_extraction_workers, 1)
+        analyze_workers = max(settings.pipeline_analyze_workers, 1)
+        
+        # 이번 실행에서 저장될 항목과 겹치지 않도록 미분석 항목은 시작 전에 조회
+        backlog = await self._load_backlog(keywords) if self.load_backlog else []
+        if settings.relevance_filter:
+            await relevance_scorer.prepare(keywords)
+        
+        async def collect_stage():
+            units = [
+                self._collect(collect_queue, keyword, source_type, collector, language)
+                for keyword in keywords
+                for source_type, collector in self.collectors.items()
+                for language in self.languages
+            ]
+            self._units_total = len(units)
+            per_keyword = len(self.collectors) * len(self.languages)
+            self._units_left = {keyword.name: per_keyword for keyword in keywords}
+            await run_tasks(units)
+            await collect_queue.put(_DONE)
+        
+        async def analysis_feed_stage():
+            # 새로 저장된 항목 + 이전 실행에서 남은 미분석 항목
+            await asyncio.gather(
+                self._persist(persist_queue, extract_queue),
+                self._enqueue(backlog, extract_queue)
+            )
+            for _ in range(extract_workers):
+                await extract_queue.put(_DONE)
+        
+        async def extract_stage():
+            await asyncio.gather(*[self._extract(extract_queue, analyze_queue) for _ in range(extract_workers)])
+            self.stats["analysis_queued"] += len(self._delayed)
+            await self._enqueue(self._delayed, analyze_queue)
+            for _ in range(analyze_workers):
+                await analyze_queue.put(_DONE)
+        
+        self._started = time.monotonic()
+        tasks = [
+            asyncio.create_task(collect_stage()),
+            asyncio.create_task(self._normalize(collect_queue, persist_queue)),
+            asyncio.create_task(analysis_feed_stage()),
+            asyncio.create_task(extract_stage()),
+            *[asyncio.create_task(self._analyze(analyze_queue)) for _ in range(analyze_workers)]
+        ]
+        reporter = asyncio.create_task(self._report_progress()) if self.log_id else None
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            if reporter:
+                reporter.cancel()
+        
+        self._report_throughput()
+        if self.log_id:
+            await self._save_progress()
+        return self.keyword_stats
+    
+    def progress(self) -> Dict[str, Any]:
+        """
+        진행 상황 - 단계별 건수, 현재 키워드, 예상 남은 시간
+        
+        남은 시간은 (끝난 수집 단위 + 끝난 분석) / (전체 수집 단위 + 분석 단계로 넘어간 항목) 비율로
+        추정한다. 수집 중에는 분석할 항목이 계속 늘어나므로 실제보다 짧게 나올 수 있다.
+        """
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        analysis_done = self.stats["analyzed"] + self.stats["analysis_failed"] + self.stats["deferred"]
+        total = self._units_total + self.stats["analysis_queued"]
+        done = self._units_done + analysis_done
+        eta = None
+        if total and done:
+            eta = round(elapsed * (total - done) / done, 1)
+        # 수집이 끝나지 않은 첫 키워드 (동시 수집 중에도 앞 키워드가 끝나야 넘어감)
+        current_keyword = next((name for name, left in self._units_left.items() if left > 0), None)
+        return {
+            "stages": {name: value for name, value in self.stats.items() if isinstance(value, int)},
+            "units_total": self._units_total,
+            "units_done": self._units_done,
+            "analysis_done": analysis_done,
+            "current_keyword": current_keyword,
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": eta
+        }
+    
+    async def _save_progress(self):
+        progress = self.progress()
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(ResearchLog)
+                    .where(ResearchLog.id == self.log_id)
+                    .values(
+                        progress=json.dumps(progress, ensure_ascii=False),
+                        current_keyword=progress["current_keyword"],
+                        updated_at=datetime.utcnow()
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            print(f"진행 상황 기록 오류: {e}")
+    
+    async def _report_progress(self):
+        """실행 중 research_progress_interval초마다 진행 상황을 실행 로그에 기록"""
+        while True:
+            await self._save_progress()
+            await asyncio.sleep(settings.research_progress_interval)
+    
+    def _report_throughput(self):
+        """분석 단계 처리량 기록"""
+        if self._analysis_started is None or self._analysis_finished is None:
+            return
+        elapsed = max(self._analysis_finished - self._analysis_started, 0.001)
+        self.stats["analysis_seconds"] = round(elapsed, 1)
+        self.stats["analysis_per_minute"] = round(self.stats["analyzed"] * 60 / elapsed, 1)
+        print(
+            f"🤖 분석 {self.stats['analyzed']}건 / {elapsed:.1f}초 "
+            f"({self.stats['analysis_per_minute']}건/분, 실패 {self.stats['analysis_failed']}건)"
+        )
+    
+    # ============ Stages ============
+    
+    async def _collect(
+        self,
+        queue: asyncio.Queue,
+        keyword: Keyword,
+        source_type: str,
+        collector: BaseCollector,
+        language: str
+    ):
+        """수집 단계 - 수집기가 내보내는 항목을 바로 큐에 넣음"""
+        try:
+            async for content_data in collector.stream(
+                keyword=keyword.name,
+                language=language,
+                limit=10,
+                snapshot=self.snapshot,
+                feeds_only=self.feeds_only
+            ):
+                self.stats["collected"] += 1
+                content_data = await self._resolve_url(content_data)
+                await queue.put((keyword.id, source_type, language, content_data))
+        except Exception as e:
+            self.stats["collect_failed"] += 1
+            print(f"수집 오류 ({source_type}/{language}/{keyword.name}): {e}")
+        finally:
+            self._units_done += 1
+            self._units_left[keyword.name] -= 1
+    
+    async def _resolve_url(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
+        """리다이렉트 링크를 원문 URL로 바꾸고 추적 파라미터 제거"""
+        url = content_data.get("url") or ""
+        if settings.url_resolve_redirects:
+            canonical = await url_resolver.canonicalize(url)
+        else:
+            canonical = canonicalize_url(url)
+        if canonical and canonical != url:
+            content_data = {**content_data, "url": canonical}
+        return content_data
+    
+    async def _normalize(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        """정규화/중복 제거 단계 - 실행 내에서 같은 정규화 URL은 한 번만 통과"""
+        seen_keys = set()
+        
+        while True:
+            entry = await in_queue.get()
+            if entry is _DONE:
+                await out_queue.put(_DONE)
+                return
+            
+            keyword_id, source_type, language, content_data = entry
+            url = (content_data.get("url") or "").strip()
+            if not url:
+                continue
+            # http/https, www, 끝 슬래시만 다른 URL도 같은 글로 취급
+            key = dedupe_key(url)
+            if key in seen_keys:
+                self.stats["duplicates"] += 1
+                continue
+            seen_keys.add(key)
+            
+            title = (content_data.get("title") or "").strip()
+            content_data = {
+                **content_data,
+                "url": url,
+                "canonical_url": key,
+                "title": title
+            }
+            if settings.near_duplicate_detection:
+                content_data["simhash"] = content_fingerprint(title, content_data.get("description", ""))
+            await out_queue.put((keyword_id, source_type, language, content_data))
+    
+    async def _persist(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        """저장 단계 - 배치 단위로 저장 후 새 콘텐츠를 분석 큐로 전달"""
+        batch = []
+        
+        while True:
+            entry = await in_queue.get()
+            if entry is _DONE:
+                break
+            batch.append(entry)
+            
+            # 배치가 찼거나 당장 들어올 항목이 없으면 바로 저장해 분석을 앞당김
+            if len(batch) >= settings.pipeline_persist_batch or in_queue.empty():
+                await self._flush(batch, out_queue)
+                batch = []
+        
+        if batch:
+            await self._flush(batch, out_queue)
+    
+    async def _flush(self, batch: List[tuple], out_queue: asyncio.Queue):
+        """배치 저장 - 실패한 배치는 한 건씩 다시 저장해 문제 항목만 건너뜀"""
+        
+        rows = [
+            {
+                "keyword_id": keyword_id,
+                "title": content_data["title"],
+                "url": content_data["url"],
+                "canonical_url": content_data["canonical_url"],
+                "simhash": content_data.get("simhash"),
+                "source_type": source_type,
+                "source_name": content_data.get("source_name", ""),
+                "language": language,
+                "thumbnail_url": content_data.get("thumbnail_url"),
+                "description": content_data.get("description", ""),
+                "content_text": content_data.get("content_text", ""),
+                "published_at": content_data.get("published_at")
+            }
+            for keyword_id, source_type, language, content_data in batch
+        ]
+        
+        failed_urls = set()
+        try:
+            inserted = await self._insert_rows(rows)
+        except Exception as e:
+            # 배치 하나의 DB 오류(제약 조건, 잠금 시간 초과, 연결 끊김)로 실행 전체를 멈추지 않도록
+            # 한 건씩 다시 저장하고, 그래도 실패한 항목만 건너뜀
+            print(f"배치 저장 오류 ({len(rows)}건, 한 건씩 다시 시도): {e}")
+            inserted = []
+            for row in rows:
+                try:
+                    inserted.extend(await self._insert_rows([row]))
+                except Exception as row_error:
+                    failed_urls.add(row["url"])
+                    self.stats["persist_failed"] += 1
+                    print(f"저장 실패 ({row['url']}): {row_error}")
+        
+        inserted_ids = {url: content_id for content_id, url in inserted}
+        
+        jobs = []
+        for row in rows:
+            keyword_stats = self.keyword_stats[row["keyword_id"]]
+            if row["url"] in failed_urls:
+                continue
+            if row["url"] not in inserted_ids:
+                self.stats["skipped"] += 1
+                keyword_stats["skipped"] += 1
+                continue
+            
+            self.stats["persisted"] += 1
+            keyword_stats["found"] += 1
+            jobs.append({
+                "id": inserted_ids[row["url"]],
+                "keyword_id": row["keyword_id"],
+                "title": row["title"],
+                "content": row["content_text"] or row["description"] or "",
+                "source_type": row["source_type"],
+                "source_name": row["source_name"],
+                "language": row["language"],
+                "url": row["url"],
+                "canonical_url": row["canonical_url"],
+                "has_text": bool(row["content_text"]),
+                "simhash": row["simhash"]
+            })
+        
+        if settings.near_duplicate_detection:
+            try:
+                jobs = await self._cluster(jobs)
+            except Exception as e:
+                # 클러스터링에 실패하면 모두 각각 분석
+                print(f"유사 중복 클러스터링 오류: {e}")
+        
+        for job in jobs:
+            await out_queue.put(job)
+    
+    async def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        새 콘텐츠 저장 - URL/정규화 URL 존재 여부를 한 번에 조회하고 ON CONFLICT DO NOTHING으로 삽입
+        
+        Returns:
+            저장된 (id, url) 목록 (오류가 나면 롤백하고 예외를 그대로 올림)
+        """
+        async with async_session() as session:
+            try:
+                # 중복 체크 (배치 전체를 한 번에)
+                result = await session.execute(
+                    select(Content.url, Content.canonical_url).where(
+                        or_(
+                            Content.url.in_([row["url"] for row in rows]),
+                            Content.canonical_url.in_([row["canonical_url"] for row in rows])
+                        )
+                    )
+                )
+                existing = result.all()
+                existing_urls = {url for url, _ in existing}
+                existing_keys = {key for _, key in existing if key}
+                new_rows = [
+                    row for row in rows
+                    if row["url"] not in existing_urls and row["canonical_url"] not in existing_keys
+                ]
+                
+                inserted = []
+                if new_rows:
+                    # 동시 실행 중인 다른 리서치가 먼저 넣은 URL은 조용히 건너뜀
+                    stmt = insert_ignore_conflicts(
+                        Content, session.bind.dialect.name, ["url"]
+                    ).returning(Content.id, Content.url)
+                    result = await session.execute(stmt, new_rows)
+                    inserted = result.all()
+                
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        return inserted
+    
+    async def _cluster(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        유사 중복 클러스터링 - 대표 콘텐츠만 분석 대상으로 반환
+        
+        나머지는 duplicate_of에 대표 ID를 기록하고, 대표의 분석 결과가 나오면 복사한다.
+        """
+        representatives = []
+        duplicates = []
+        # 다른 워커 프로세스가 저장한 대표 콘텐츠까지 비교하도록 DB와 맞춤
+        await near_duplicate_index.sync()
+        for job in jobs:
+            representative_id = await near_duplicate_index.assign(job["id"], job["keyword_id"], job["simhash"])
+            if representative_id is None:
+                representatives.append(job)
+            else:
+                duplicates.append((job, representative_id))
+        
+        if not duplicates:
+            return representatives
+        
+        async with async_session() as session:
+            await session.execute(
+                update(Content),
+                [{"id": job["id"], "duplicate_of": representative_id} for job, representative_id in duplicates]
+            )
+            await session.commit()
+        
+        # 이전 실행에서 이미 분석된 대표는 결과를 바로 복사
+        pending_ids = {rid for _, rid in duplicates if rid not in self._results}
+        if pending_ids:
+            self._results.update(await self._load_results(pending_ids))
+        
+        for job, representative_id in duplicates:
+            await self._attach(job, representative_id)
+        
+        return representatives
+    
+    async def _attach(self, job: Dict[str, Any], representative_id: int):
+        """유사 중복 작업을 대표 콘텐츠에 연결 (결과가 있으면 바로 복사)"""
+        if representative_id in self._results:
+            await self._copy_analysis(self._results[representative_id], [job])
+        else:
+            self._siblings.setdefault(representative_id, []).append(job)
+    
+    async def _load_results(self, content_ids) -> Dict[int, Dict[str, Any]]:
+        """분석이 끝난 콘텐츠의 분석 결과 조회"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(Content).where(
+                    and_(Content.id.in_(list(content_ids)), Content.is_analyzed == True)
+                )
+            )
+            return {
+                content.id: {
+                    "ai_summary": content.ai_summary,
+                    "ai_insights": content.ai_insights,
+                    "ai_business_relevance": content.ai_business_relevance,
+                    "ai_share_score": content.ai_share_score,
+                    "ai_share_reason": content.ai_share_reason,
+                    "is_analyzed": True
+                }
+                for content in result.scalars().all()
+            }
+    
+    async def _copy_analysis(self, values: Dict[str, Any], jobs: List[Dict[str, Any]]):
+        """대표 콘텐츠의 분석 결과를 유사 중복 콘텐츠에 복사"""
+        if not jobs:
+            return
+        async with async_session() as session:
+            await session.execute(
+                update(Content),
+                [{"id": job["id"], **values} for job in jobs]
+            )
+            await session.commit()
+        
+        for job in jobs:
+            self.stats["near_duplicates"] += 1
+            self.keyword_stats[job["keyword_id"]]["analyzed"] += 1
+    
+    @classmethod
+    def backlog_query(cls, keyword_ids: List[int], source_types: List[str], before: Optional[datetime] = None):
+        """미분석 콘텐츠 조회 쿼리 (실행 계획 점검에도 사용 - app/models/migrations.py)"""
+        conditions = [Content.created_at < before] if before is not None else []
+        return select(Content).where(
+            and_(
+                Content.keyword_id.in_(keyword_ids),
+                # 소스 일부만 맡은 실행(워커 작업 단위)은 그 소스의 항목만
+                Content.source_type.in_(source_types),
+                Content.is_analyzed == False,
+                *cls._skipped_low_priority(),
+                *conditions
+            )
+        )
+    
+    async def _load_backlog(self, keywords: List[Keyword]) -> List[Dict[str, Any]]:
+        """이전 실행에서 분석되지 않은 콘텐츠 조회 (진행 중인 배치 작업에 들어간 항목 제외)"""
+        async with async_session() as session:
+            result = await session.execute(
+                self.backlog_query([k.id for k in keywords], list(self.collectors), self.backlog_before)
+            )
+            contents = result.scalars().all()
+        
+        in_batch = await analysis_batches.pending_content_ids()
+        jobs = [self._analysis_job(content) for content in contents if content.id not in in_batch]
+        if not settings.near_duplicate_detection:
+            return jobs
+        
+        # 대표가 함께 대기 중이면 대표 결과를 기다리고, 이미 분석됐으면 복사
+        backlog_ids = {job["id"] for job in jobs}
+        waiting = [job for job in jobs if job["duplicate_of"] and job["duplicate_of"] not in backlog_ids]
+        if waiting:
+            self._results.update(await self._load_results({job["duplicate_of"] for job in waiting}))
+        
+        representatives = []
+        for job in jobs:
+            representative_id = job["duplicate_of"]
+            if representative_id in backlog_ids or representative_id in self._results:
+                await self._attach(job, representative_id)
+            else:
+                representatives.append(job)
+        return representatives
+    
+    @staticmethod
+    def _skipped_low_priority() -> list:
+        """건너뛰기 모드에서 저순위로 표시된 항목 제외 조건"""
+        if settings.relevance_filter and settings.relevance_action == "skip":
+            return [Content.is_low_priority.isnot(True)]
+        return []
+    
+    async def _enqueue(self, jobs: List[Dict[str, Any]], out_queue: asyncio.Queue):
+        for job in jobs:
+            await out_queue.put(job)
+    
+    async def _extract(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        """본문 추출 단계 - 설명만 있는 항목의 본문(기사 본문, 유튜브 트랜스크립트)을 받아 저장"""
+        while True:
+            job = await in_queue.get()
+            if job is _DONE:
+                return
+            
+            text = ""
+            if job["has_text"]:
+                pass
+            elif settings.article_extraction and article_extractor.supports(job["source_type"], job["url"]):
+                text = await article_extractor.extract(job["url"], job["canonical_url"])
+                if text:
+                    self.stats["extracted"] += 1
+            elif settings.youtube_transcripts and job["source_type"] == "youtube":
+                video_id = video_id_from_url(job["url"])
+                if video_id:
+                    text = await transcript_fetcher.get(video_id, job["language"])
+                if text:
+                    self.stats["transcribed"] += 1
+            
+            if text:
+                # 저장에 실패해도 추출한 본문으로 분석은 계속 (다음 실행에서 다시 추출)
+                try:
+                    async with async_session() as session:
+                        await session.execute(
+                            update(Content).where(Content.id == job["id"]).values(content_text=text)
+                        )
+                        await session.commit()
+                except Exception as e:
+                    self.stats["update_failed"] += 1
+                    print(f"본문 저장 오류 ({job['title']}): {e}")
+                job = {**job, "content": text, "has_text": True}
+            
+            if settings.relevance_filter and not await self._prioritize(job):
+                continue
+            self.stats["analysis_queued"] += 1
+            await out_queue.put(job)
+    
+    async def _prioritize(self, job: Dict[str, Any]) -> bool:
+        """관련도 점수 기록 - 기준 미만이면 저순위로 표시하고 False (나중에 분석하거나 건너뜀)"""
+        score = relevance_scorer.score(job, self._keyword_names[job["keyword_id"]])
+        low_priority = score < settings.relevance_threshold
+        
+        # 저장에 실패해도 이번 실행에서는 계산한 점수대로 처리
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(Content)
+                    .where(Content.id == job["id"])
+                    .values(relevance_score=score, is_low_priority=low_priority)
+                )
+                await session.commit()
+        except Exception as e:
+            self.stats["update_failed"] += 1
+            print(f"관련도 저장 오류 ({job['title']}): {e}")
+        
+        if not low_priority:
+            return True
+        self.stats["low_priority"] += 1
+        if settings.relevance_action == "delay":
+            self._delayed.append(job)
+        return False
+    
+    async def _analyze(self, in_queue: asyncio.Queue):
+        """분석 단계 - AI 분석 후 결과 저장 (analysis_batch_size > 1이면 대기 중인 작업을 묶어 한 요청으로)"""
+        batch_size = max(settings.analysis_batch_size, 1)
+        done = False
+        while not done:
+            job = await in_queue.get()
+            if job is _DONE:
+                return
+            
+            # 이미 큐에 쌓여 있는 작업만 묶음 (묶기 위해 기다리지 않음)
+            jobs = [job]
+            while len(jobs) < batch_size:
+                try:
+                    job = in_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if job is _DONE:
+                    done = True
+                    break
+                jobs.append(job)
+            
+            if not self.analyze:
+                # 배치 작업 모드 - 미분석 상태로 두고 실행 후 한 번에 제출
+                self.stats["deferred"] += len(jobs)
+                continue
+            
+            if self._analysis_started is None:
+                self._analysis_started = time.monotonic()
+            
+            try:
+                # AI 분석 (동시 요청 수 / RPM / TPM은 analyzer가 제한)
+                if len(jobs) == 1:
+                    analyses = {job["id"]: await analyzer.analyze_content(
+                        title=job["title"],
+                        content=job["content"],
+                        source_type=job["source_type"],
+                        keyword=self._keyword_names[job["keyword_id"]],
+                        language=job["language"]
+                    )}
+                else:
+                    analyses = await analyzer.analyze_batch([self._analysis_item(job) for job in jobs])
+            except Exception as e:
+                print(f"분석 오류 ({len(jobs)}건): {e}")
+                analyses = {}
+            
+            for job in jobs:
+                if analyses.get(job["id"]) is not None:
+                    await self._save_analysis(job, analyses[job["id"]])
+                else:
+                    # 실패한 항목과 유사 중복은 미분석으로 남겨 다음 실행에서 다시 분석
+                    self.stats["analysis_failed"] += 1
+                    self._siblings.pop(job["id"], None)
+            self._analysis_finished = time.monotonic()
+    
+    async def _save_analysis(self, job: Dict[str, Any], analysis: Dict[str, Any]):
+        try:
+            values = analysis_values(analysis)
+            
+            # 분석 결과 저장
+            async with async_session() as session:
+                await session.execute(
+                    update(Content)
+                    .where(Content.id == job["id"])
+                    .values(**values)
+                )
+                await session.commit()
+            
+            self.stats["analyzed"] += 1
+            self.keyword_stats[job["keyword_id"]]["analyzed"] += 1
+            
+            # 유사 중복 콘텐츠에 결과 복사
+            self._results[job["id"]] = values
+            await self._copy_analysis(values, self._siblings.pop(job["id"], []))
+        
+        except Exception as e:
+            self.stats["analysis_failed"] += 1
+            print(f"분석 오류 ({job['title']}): {e}")
+    
+    def _analysis_item(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """일괄 분석 요청 항목"""
+        return {
+            "id": job["id"],
+            "title": job["title"],
+            "content": job["content"],
+            "source_type": job["source_type"],
+            "keyword": self._keyword_names[job["keyword_id"]],
+            "language": job["language"]
+        }
+    
+    @staticmethod
+    def _analysis_job(content: Content) -> Dict[str, Any]:
+        """분석에 필요한 값만 담은 작업 (세션과 분리)"""
+        return {
+            "id": content.id,
+            "keyword_id": content.keyword_id,
+            "title": content.title,
+            "content": content.content_text or content.description or "",
+            "source_type": content.source_type,
+            "source_name": content.source_name,
+            "language": content.language,
+            "url": content.url,
+            "canonical_url": content.canonical_url,
+            "has_text": bool(content.content_text),
+            "simhash": content.simhash,
+            "duplicate_of": content.duplicate_of
+        }
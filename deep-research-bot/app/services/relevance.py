@@ -0,0 +1,291 @@
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, and_, desc
+
+from app.models.database import Content, Keyword, async_session
+from app.services.near_duplicates import normalize_text, shingles
+from app.core.executor import parse_executor
+from app.config import settings
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 키워드 이름 / 설명 용어 가중치
+NAME_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# 키워드 설명의 상투어 - 어떤 글에나 나오거나 글에 나오지 않는 말이라 질의에서 제외
+# (예: "인공지능 관련 콘텐츠" -> "인공지능")
+DESCRIPTION_STOPWORDS = {
+    "관련", "관한", "대한", "위한", "콘텐츠", "컨텐츠", "내용", "소식", "뉴스", "정보", "자료", "기사", "글",
+    "동향", "및", "등", "모든", "각종",
+    "related", "about", "content", "contents", "news", "articles", "article", "posts", "information",
+    "topics", "topic", "stuff", "things", "etc"
+}
+
+# 상투어 뒤에 붙는 조사/어미 (예: "관련된", "콘텐츠를")
+_PARTICLES = ("으로", "된", "한", "을", "를", "이", "가", "은", "는", "의", "에", "와", "과", "로")
+
+# 점수 계산에 쓰는 본문 최대 길이
+MAX_TEXT_CHARS = 3000
+
+# 학습 모델 재학습 주기 (초)
+MODEL_MAX_AGE = 24 * 3600
+
+
+def document_terms(title: str, text: str) -> List[str]:
+    """문서 용어 (제목 + 설명/본문 앞부분)"""
+    return shingles(f"{title or ''} {(text or '')[:MAX_TEXT_CHARS]}")
+
+
+def model_features(
+    title: str,
+    text: str,
+    source_type: str,
+    source_name: Optional[str],
+    language: str,
+    keyword: str
+) -> List[str]:
+    """공유 점수 모델 특징 (용어 + 출처/언어/키워드)"""
+    features = set(document_terms(title, text))
+    features.update({
+        f"source:{source_type}",
+        f"name:{(source_name or '').lower()}",
+        f"lang:{language}",
+        f"keyword:{keyword.lower()}"
+    })
+    return sorted(features)
+
+
+def train_share_model(
+    samples: List[Tuple[List[str], float]],
+    epochs: int = 5,
+    learning_rate: float = 0.05,
+    l2: float = 1e-4,
+    seed: int = 0
+) -> Tuple[Dict[str, float], float, Optional[float]]:
+    """
+    과거 공유 점수로 선형 회귀 모델 학습 (SGD, 워커 풀에서 실행)
+    
+    Args:
+        samples: (특징 목록, 공유 점수 0-100) 목록
+    
+    Returns:
+        (특징 가중치, bias, 검증 MAE) - 검증 MAE는 마지막 10%로 계산 (0-100 기준)
+    """
+    rng = random.Random(seed)
+    samples = list(samples)
+    rng.shuffle(samples)
+    holdout = samples[:len(samples) // 10]
+    train = samples[len(samples) // 10:] or samples
+    
+    bias = sum(score for _, score in train) / len(train) / 100
+    weights: Dict[str, float] = {}
+    for _ in range(epochs):
+        rng.shuffle(train)
+        for features, score in train:
+            if not features:
+                continue
+            # 특징 수가 많은 문서가 한 번에 크게 움직이지 않도록 정규화
+            scale = 1 / math.sqrt(len(features))
+            predicted = bias + sum(weights.get(f, 0.0) for f in features) * scale
+            error = predicted - score / 100
+            bias -= learning_rate * error * 0.1
+            for f in features:
+                w = weights.get(f, 0.0)
+                weights[f] = w - learning_rate * (error * scale + l2 * w)
+    
+    mae = None
+    if holdout:
+        errors = [
+            abs(min(max(_predict(weights, bias, features), 0.0), 1.0) * 100 - score)
+            for features, score in holdout
+        ]
+        mae = sum(errors) / len(errors)
+    return weights, bias, mae
+
+
+def _predict(weights: Dict[str, float], bias: float, features: List[str]) -> float:
+    if not features:
+        return bias
+    return bias + sum(weights.get(f, 0.0) for f in features) / math.sqrt(len(features))
+
+
+class RelevanceScorer:
+    """
+    LLM 분석 전 로컬 관련도 점수
+    
+    키워드 이름(가중치 2)과 설명(가중치 1, 상투어 제외)을 질의로 BM25 점수를 계산하고, 모든 질의 용어가
+    충분히 나왔을 때의 상한으로 나눠 0-100으로 만든다. 문서 빈도(IDF)는 최근 수집 콘텐츠로 계산한다.
+    과거 ai_share_score가 충분히 쌓이면 용어/출처/언어/키워드 특징의 선형 모델을 학습해
+    예상 공유 점수를 섞는다. 점수가 relevance_threshold 미만이면 저순위로 표시한다.
+    """
+    
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._df: Counter = Counter()
+        self._documents = 0
+        self._avg_length = 0.0
+        self._queries: Dict[str, Dict[str, float]] = {}
+        self._model: Optional[Tuple[Dict[str, float], float]] = None
+        self._model_trained_at: Optional[float] = None
+        self.model_samples = 0
+        self.model_mae: Optional[float] = None
+        self.scored = 0
+        self.low_priority = 0
+    
+    async def prepare(self, keywords: List[Keyword]):
+        """실행 시작 시 질의/문서 빈도 갱신, 필요하면 모델 재학습"""
+        async with self._lock:
+            self._queries = {k.name: self._query(k.name, k.description) for k in keywords}
+            await self._load_corpus()
+            if settings.relevance_model and (
+                self._model_trained_at is None or time.monotonic() - self._model_trained_at >= MODEL_MAX_AGE
+            ):
+                await self._train()
+    
+    @staticmethod
+    def _description_text(description: Optional[str]) -> str:
+        """설명에서 상투어 제거"""
+        words = []
+        for word in normalize_text(description or "").split():
+            stem = word
+            for particle in _PARTICLES:
+                if word.endswith(particle) and word[:-len(particle)] in DESCRIPTION_STOPWORDS:
+                    stem = word[:-len(particle)]
+                    break
+            if stem not in DESCRIPTION_STOPWORDS:
+                words.append(word)
+        return " ".join(words)
+    
+    @classmethod
+    def _query(cls, name: str, description: Optional[str]) -> Dict[str, float]:
+        query: Dict[str, float] = {}
+        for term in shingles(cls._description_text(description)):
+            query[term] = DESCRIPTION_WEIGHT
+        for term in shingles(name):
+            query[term] = NAME_WEIGHT
+        return query
+    
+    async def _load_corpus(self):
+        async with async_session() as session:
+            result = await session.execute(
+                select(Content.title, Content.description, Content.content_text)
+                .order_by(desc(Content.created_at))
+                .limit(settings.relevance_corpus_size)
+            )
+            rows = result.all()
+        
+        df: Counter = Counter()
+        total_length = 0
+        for title, description, content_text in rows:
+            terms = document_terms(title, content_text or description)
+            total_length += len(terms)
+            df.update(set(terms))
+        self._df = df
+        self._documents = len(rows)
+        self._avg_length = total_length / len(rows) if rows else 0.0
+    
+    async def _train(self):
+        """분석된 대표 콘텐츠의 공유 점수로 모델 학습 (표본이 부족하면 BM25만 사용)"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(Content, Keyword.name)
+                .join(Keyword, Content.keyword_id == Keyword.id)
+                .where(
+                    and_(
+                        Content.is_analyzed == True,
+                        Content.duplicate_of.is_(None),
+                        Content.ai_share_score.isnot(None)
+                    )
+                )
+                .order_by(desc(Content.created_at))
+                .limit(settings.relevance_corpus_size)
+            )
+            samples = [
+                (
+                    model_features(
+                        content.title, content.content_text or content.description,
+                        content.source_type, content.source_name, content.language, keyword_name
+                    ),
+                    content.ai_share_score
+                )
+                for content, keyword_name in result.all()
+            ]
+        
+        self._model_trained_at = time.monotonic()
+        self.model_samples = len(samples)
+        if len(samples) < settings.relevance_model_min_samples:
+            self._model = None
+            return
+        
+        try:
+            weights, bias, mae = await parse_executor.run(train_share_model, samples)
+        except Exception as e:
+            print(f"공유 점수 모델 학습 오류: {e}")
+            self._model = None
+            return
+        self._model = (weights, bias)
+        self.model_mae = mae
+        print(f"📈 공유 점수 모델 학습: 표본 {len(samples)}건, 검증 MAE {mae or 0:.1f}")
+    
+    def bm25(self, keyword: str, title: str, text: str) -> float:
+        """키워드 질의 대비 BM25 관련도 (0-100)"""
+        query = self._queries.get(keyword) or self._query(keyword, None)
+        terms = Counter(document_terms(title, text))
+        length = sum(terms.values())
+        avg_length = self._avg_length or length or 1
+        
+        score = upper = 0.0
+        for term, weight in query.items():
+            df = self._df.get(term, 0)
+            idf = math.log(1 + (self._documents - df + 0.5) / (df + 0.5))
+            upper += weight * idf * (BM25_K1 + 1)
+            tf = terms.get(term, 0)
+            if tf:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                score += weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return 100 * score / upper if upper else 0.0
+    
+    def predicted_share_score(self, job: Dict[str, Any], keyword: str) -> Optional[float]:
+        """학습 모델의 예상 공유 점수 (0-100, 모델이 없으면 None)"""
+        if self._model is None:
+            return None
+        weights, bias = self._model
+        features = model_features(
+            job["title"], job["content"], job["source_type"], job.get("source_name"), job["language"], keyword
+        )
+        return min(max(_predict(weights, bias, features), 0.0), 1.0) * 100
+    
+    def score(self, job: Dict[str, Any], keyword: str) -> float:
+        """우선순위 점수 (0-100) - BM25 관련도, 모델이 있으면 예상 공유 점수와 가중 평균"""
+        relevance = self.bm25(keyword, job["title"], job["content"])
+        predicted = self.predicted_share_score(job, keyword)
+        if predicted is not None:
+            weight = settings.relevance_model_weight
+            relevance = (1 - weight) * relevance + weight * predicted
+        
+        self.scored += 1
+        if relevance < settings.relevance_threshold:
+            self.low_priority += 1
+        return relevance
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scored": self.scored,
+            "low_priority": self.low_priority,
+            "corpus_documents": self._documents,
+            "model": self._model is not None,
+            "model_samples": self.model_samples,
+            "model_mae": round(self.model_mae, 1) if self.model_mae is not None else None
+        }
+
+
+# Singleton instance
+relevance_scorer = RelevanceScorer()
@@ -1,44 +1,66 @@
-from typing import List, Dict, Any
-from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
 import asyncio
-import json
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from sqlalchemy import select
 
-from app.models.database import Keyword, Content, ResearchLog, async_session
+from app.models.database import Keyword, ResearchLog, async_session
 from app.services.collectors import (
     YouTubeCollector,
     NewsCollector,
     BlogCollector,
     PaperCollector,
-    PodcastCollector
+    PodcastCollector,
+    FeedSnapshot
 )
-from app.services.analyzer import analyzer
+from app.services.pipeline import ResearchPipeline
+from app.services.analysis_cache import analysis_cache
+from app.services.analysis_batches import analysis_batches
+from app.services.digests import daily_digests
+from app.core.http import HttpClientManager, http_client
 from app.config import settings
 
 class DeepResearcher:
     """딥 리서치 서비스 - 키워드 기반 콘텐츠 수집 및 분석"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClientManager] = None):
+        # 모든 수집기가 같은 HTTP 커넥션 풀을 공유
+        self.http = http or http_client
         self.collectors = {
-            "youtube": YouTubeCollector(),
-            "news": NewsCollector(),
-            "blog": BlogCollector(),
-            "paper": PaperCollector(),
-            "podcast": PodcastCollector()
+            "youtube": YouTubeCollector(self.http),
+            "news": NewsCollector(self.http),
+            "blog": BlogCollector(self.http),
+            "paper": PaperCollector(self.http),
+            "podcast": PodcastCollector(self.http)
         }
         self.languages = ["ko", "en"]
     
-    async def run_daily_research(self) -> Dict[str, Any]:
-        """일일 리서치 실행"""
+    async def _open_log(self, session, log_id: Optional[int], scope: str) -> ResearchLog:
+        """실행 로그 시작 - 작업 관리자가 미리 만든 대기(queued) 로그가 있으면 그 로그를 사용"""
+        log = await session.get(ResearchLog, log_id) if log_id else None
+        if log is None:
+            log = ResearchLog(scope=scope)
+            session.add(log)
+        log.status = "running"
+        log.started_at = datetime.utcnow()
+        await session.commit()
+        await session.refresh(log)
+        return log
+    
+    @staticmethod
+    async def _close_log(session, log: ResearchLog, status: str, error_message: Optional[str] = None, **totals):
+        log.status = status
+        log.completed_at = datetime.utcnow()
+        log.error_message = error_message
+        for name, value in totals.items():
+            setattr(log, name, value)
+        await session.commit()
+    
+    async def run_daily_research(self, log_id: Optional[int] = None) -> Dict[str, Any]:
+        """일일 리서치 실행 (log_id: 작업 관리자가 만든 실행 로그)"""
         
         async with async_session() as session:
             # 리서치 로그 시작
-            log = ResearchLog(status="running")
-            session.add(log)
-            await session.commit()
-            await session.refresh(log)
+            log = await self._open_log(session, log_id, "all")
             
             try:
                 # 활성화된 키워드 가져오기
@@ -48,152 +70,102 @@ class DeepResearcher:
                 keywords = result.scalars().all()
                 
                 if not keywords:
-                    log.status = "completed"
-                    log.completed_at = datetime.utcnow()
-                    log.error_message = "활성화된 키워드가 없습니다."
-                    await session.commit()
+                    await self._close_log(session, log, "completed", "활성화된 키워드가 없습니다.")
                     return {"status": "no_keywords", "message": "활성화된 키워드가 없습니다."}
                 
-                total_found = 0
-                total_analyzed = 0
+                # 고정 피드는 실행당 한 번만 수집하고 모든 키워드와 한 번에 매칭
+                snapshot = FeedSnapshot()
+                await snapshot.load(self.collectors, self.languages)
+                snapshot.match([k.name for k in keywords])
+                
+                # 수집 → 정규화/중복 제거 → 저장 → 분석 스트리밍 파이프라인
+                # (배치 모드에서는 분석하지 않고 실행 후 미분석 항목을 배치 작업으로 제출)
+                batch_mode = settings.analysis_mode == "batch"
+                pipeline = ResearchPipeline(
+                    self.collectors, self.languages, snapshot, analyze=not batch_mode, log_id=log.id
+                )
+                keyword_stats = await pipeline.run(keywords)
+                if batch_mode:
+                    await analysis_batches.submit()
+                total_found = sum(s["found"] for s in keyword_stats.values())
+                total_skipped = sum(s["skipped"] for s in keyword_stats.values())
+                total_analyzed = sum(s["analyzed"] for s in keyword_stats.values())
+                
+                # 오늘의 다이제스트 미리 생성 (고득점 콘텐츠가 그대로면 다시 생성하지 않음)
+                if settings.digest_prebuild:
+                    await daily_digests.refresh()
                 
-                # 각 키워드별로 리서치 수행
-                for keyword in keywords:
-                    found, analyzed = await self._research_keyword(session, keyword)
-                    total_found += found
-                    total_analyzed += analyzed
+                # 오래 쓰이지 않은 분석 캐시 정리
+                if settings.analysis_cache:
+                    await analysis_cache.evict()
                 
                 # 로그 완료
-                log.status = "completed"
-                log.completed_at = datetime.utcnow()
-                log.total_found = total_found
-                log.total_analyzed = total_analyzed
-                await session.commit()
+                await self._close_log(
+                    session, log, "completed",
+                    total_found=total_found,
+                    total_skipped=total_skipped,
+                    total_analyzed=total_analyzed
+                )
                 
                 return {
                     "status": "success",
                     "total_found": total_found,
+                    "total_skipped": total_skipped,
                     "total_analyzed": total_analyzed,
                     "keywords_processed": len(keywords)
                 }
-                
+            
+            except asyncio.CancelledError:
+                await self._close_log(session, log, "cancelled")
+                raise
             except Exception as e:
-                log.status = "failed"
-                log.completed_at = datetime.utcnow()
-                log.error_message = str(e)
-                await session.commit()
+                await self._close_log(session, log, "failed", str(e))
                 raise e
     
-    async def _research_keyword(self, session: AsyncSession, keyword: Keyword) -> tuple:
-        """단일 키워드에 대한 리서치 수행"""
-        
-        found_count = 0
-        analyzed_count = 0
-        
-        # 각 소스 유형별로 수집
-        for source_type, collector in self.collectors.items():
-            for language in self.languages:
-                try:
-                    # 콘텐츠 수집
-                    contents = await collector.search(
-                        keyword=keyword.name,
-                        language=language,
-                        limit=10
-                    )
-                    
-                    for content_data in contents:
-                        # 중복 체크
-                        existing = await session.execute(
-                            select(Content).where(Content.url == content_data["url"])
-                        )
-                        if existing.scalars().first():
-                            continue
-                        
-                        # 콘텐츠 저장
-                        content = Content(
-                            keyword_id=keyword.id,
-                            title=content_data["title"],
-                            url=content_data["url"],
-                            source_type=source_type,
-                            source_name=content_data.get("source_name", ""),
-                            language=language,
-                            thumbnail_url=content_data.get("thumbnail_url"),
-                            description=content_data.get("description", ""),
-                            content_text=content_data.get("content_text", ""),
-                            published_at=content_data.get("published_at")
-                        )
-                        session.add(content)
-                        found_count += 1
-                        
-                except Exception as e:
-                    print(f"수집 오류 ({source_type}/{language}/{keyword.name}): {e}")
-                    continue
-        
-        await session.commit()
-        
-        # 수집된 콘텐츠 분석 (아직 분석되지 않은 것만)
-        result = await session.execute(
-            select(Content).where(
-                and_(
-                    Content.keyword_id == keyword.id,
-                    Content.is_analyzed == False
-                )
-            ).options(selectinload(Content.keyword))
-        )
-        unanalyzed = result.scalars().all()
-        
-        for content in unanalyzed:
-            try:
-                # AI 분석
-                analysis = await analyzer.analyze_content(
-                    title=content.title,
-                    content=content.content_text or content.description or "",
-                    source_type=content.source_type,
-                    keyword=keyword.name,
-                    language=content.language
-                )
-                
-                # 분석 결과 저장
-                content.ai_summary = analysis["summary"]
-                content.ai_insights = json.dumps(analysis["insights"], ensure_ascii=False)
-                content.ai_business_relevance = analysis["business_relevance"]
-                content.ai_share_score = analysis["share_score"]
-                content.ai_share_reason = analysis["share_reason"]
-                content.is_analyzed = True
-                
-                analyzed_count += 1
-                
-                # Rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                print(f"분석 오류 ({content.title}): {e}")
-                continue
-        
-        await session.commit()
-        
-        return found_count, analyzed_count
-    
-    async def research_single_keyword(self, keyword_id: int) -> Dict[str, Any]:
-        """단일 키워드 리서치"""
+    async def research_single_keyword(self, keyword_id: int, log_id: Optional[int] = None) -> Dict[str, Any]:
+        """단일 키워드 리서치 (log_id: 작업 관리자가 만든 실행 로그)"""
         
         async with async_session() as session:
             result = await session.execute(
                 select(Keyword).where(Keyword.id == keyword_id)
             )
             keyword = result.scalars().first()
+            log = await self._open_log(session, log_id, f"keyword:{keyword_id}")
             
             if not keyword:
+                await self._close_log(session, log, "failed", "키워드를 찾을 수 없습니다.")
                 return {"status": "error", "message": "키워드를 찾을 수 없습니다."}
             
-            found, analyzed = await self._research_keyword(session, keyword)
+            try:
+                # 단일 키워드 실행은 키워드별 워터마크로 전체 실행과 서로 건드리지 않음
+                snapshot = FeedSnapshot(scope=keyword.name.lower())
+                await snapshot.load(self.collectors, self.languages)
+                snapshot.match([keyword.name])
+                
+                pipeline = ResearchPipeline(self.collectors, self.languages, snapshot, log_id=log.id)
+                keyword_stats = await pipeline.run([keyword])
+                stats = keyword_stats[keyword.id]
+                
+                await self._close_log(
+                    session, log, "completed",
+                    total_found=stats["found"],
+                    total_skipped=stats["skipped"],
+                    total_analyzed=stats["analyzed"]
+                )
+                return {
+                    "status": "success",
+                    "keyword": keyword.name,
+                    "found": stats["found"],
+                    "skipped": stats["skipped"],
+                    "analyzed": stats["analyzed"]
+                }
             
-            return {
-                "status": "success",
-                "keyword": keyword.name,
-                "found": found,
-                "analyzed": analyzed
-            }
+            except asyncio.CancelledError:
+                await self._close_log(session, log, "cancelled")
+                raise
+            except Exception as e:
+                await self._close_log(session, log, "failed", str(e))
+                raise e
 
 
 # Singleton instance
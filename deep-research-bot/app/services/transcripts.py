@@ -0,0 +1,177 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+
+from sqlalchemy import select, and_
+
+from app.models.database import VideoTranscript, async_session
+from app.config import settings
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    """유튜브 URL에서 영상 ID 추출 (watch?v=, youtu.be/, shorts/)"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    
+    host = (parts.hostname or "").lower()
+    if host.endswith("youtu.be"):
+        return parts.path.strip("/").split("/")[0] or None
+    if "youtube.com" not in host:
+        return None
+    if parts.path.startswith("/shorts/"):
+        return parts.path.split("/")[2] or None
+    return parse_qs(parts.query).get("v", [None])[0]
+
+
+def fetch_transcript(video_id: str, language: str) -> Optional[str]:
+    """
+    트랜스크립트 가져오기 (동기 - 스레드 풀에서 실행)
+    
+    Returns:
+        자막 텍스트, 자막이 없는 영상이면 None
+        (일시적인 오류는 예외로 전달해 캐시하지 않음)
+    """
+    from youtube_transcript_api import (
+        YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound,
+        NoTranscriptAvailable, VideoUnavailable, InvalidVideoId
+    )
+    
+    try:
+        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        
+        # 요청 언어 → 영어 → 한국어 순서로 자막 찾기
+        try:
+            transcript = transcript_list.find_transcript([language, 'en', 'ko'])
+        except NoTranscriptFound:
+            transcript = transcript_list.find_generated_transcript([language, 'en', 'ko'])
+        
+        text_parts = [entry['text'] for entry in transcript.fetch()]
+        return " ".join(text_parts)
+    
+    except (TranscriptsDisabled, NoTranscriptFound, NoTranscriptAvailable, VideoUnavailable, InvalidVideoId):
+        return None
+
+
+class TranscriptFetcher:
+    """
+    유튜브 트랜스크립트 수집기
+    
+    youtube_transcript_api는 동기 라이브러리이므로 전용 스레드 풀에서 실행한다.
+    동시 요청 수는 transcript_workers로 제한하고, 영상마다 제한 시간을 둔다.
+    결과는 (video_id, language)별로 DB(video_transcripts)에 저장하며,
+    자막이 없는 영상도 기록해 같은 영상을 다시 요청하지 않는다.
+    """
+    
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._write_lock = asyncio.Lock()
+        self.cache_hits = 0
+        self.fetched = 0
+        self.unavailable = 0
+        self.failed = 0
+        self.timeouts = 0
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.transcript_workers,
+                thread_name_prefix="transcript"
+            )
+        return self._executor
+    
+    async def get(self, video_id: str, language: str = "ko") -> str:
+        """트랜스크립트 반환 (캐시 우선, 없거나 실패하면 빈 문자열)"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(VideoTranscript).where(
+                    and_(VideoTranscript.video_id == video_id, VideoTranscript.language == language)
+                )
+            )
+            cached = result.scalars().first()
+        
+        if cached is not None:
+            self.cache_hits += 1
+            return cached.transcript or ""
+        
+        future = await self._submit(video_id, language)
+        try:
+            text = await asyncio.wait_for(asyncio.shield(future), timeout=settings.transcript_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            print(f"트랜스크립트 시간 초과 ({video_id})")
+            # 늦게 끝난 결과도 캐시에 저장해 다음 실행에서 다시 요청하지 않음
+            future.add_done_callback(lambda f: self._store_late(f, video_id, language))
+            return ""
+        except Exception as e:
+            self.failed += 1
+            print(f"트랜스크립트 가져오기 실패 ({video_id}): {e}")
+            return ""
+        
+        if text:
+            self.fetched += 1
+        else:
+            self.unavailable += 1
+        await self._store(video_id, language, text)
+        return text or ""
+    
+    async def _submit(self, video_id: str, language: str) -> asyncio.Future:
+        """스레드 풀에 요청 제출 (동시 요청 수 제한)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.transcript_workers)
+        
+        # 시간 초과로 기다림을 멈춰도 스레드는 끝날 때까지 자리를 차지하므로
+        # 세마포어는 실제 작업이 끝날 때 반환한다
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, fetch_transcript, video_id, language)
+        future.add_done_callback(lambda _: self._semaphore.release())
+        return future
+    
+    def _store_late(self, future: asyncio.Future, video_id: str, language: str):
+        if future.cancelled() or future.exception() is not None:
+            return
+        asyncio.ensure_future(self._store(video_id, language, future.result()))
+    
+    async def _store(self, video_id: str, language: str, text: Optional[str]):
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    result = await session.execute(
+                        select(VideoTranscript).where(
+                            and_(VideoTranscript.video_id == video_id, VideoTranscript.language == language)
+                        )
+                    )
+                    row = result.scalars().first()
+                    if not row:
+                        row = VideoTranscript(video_id=video_id, language=language)
+                        session.add(row)
+                    row.transcript = text
+                    row.is_available = bool(text)
+                    row.fetched_at = datetime.utcnow()
+                    await session.commit()
+            except Exception as e:
+                print(f"트랜스크립트 캐시 저장 오류 ({video_id}): {e}")
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cache_hits": self.cache_hits,
+            "fetched": self.fetched,
+            "unavailable": self.unavailable,
+            "failed": self.failed,
+            "timeouts": self.timeouts
+        }
+
+
+# Singleton instance
+transcript_fetcher = TranscriptFetcher()
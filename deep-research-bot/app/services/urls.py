@@ -0,0 +1,272 @@
+import asyncio
+import base64
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from sqlalchemy import select
+
+from app.models.database import UrlRedirect, async_session
+from app.core.resilience import host_guard
+from app.core.http import http_client
+
+# 추적용 쿼리 파라미터 (모든 호스트)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "ref_src", "cmpid", "ncid", "sr_share", "guccounter", "spm"
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# 호스트별 추가 추적 파라미터
+HOST_TRACKING_PARAMS = {
+    "medium.com": {"source"},
+    "news.google.com": {"oc"},
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+GOOGLE_NEWS_HOST = "news.google.com"
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL 정리 - 추적 파라미터 제거, scheme/host 소문자화, 기본 포트/fragment 제거
+    
+    링크로 그대로 쓸 수 있는 형태를 유지한다 (scheme과 www는 보존).
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if not scheme or not host:
+        return url
+    
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    
+    extra_params = set()
+    for domain, params in HOST_TRACKING_PARAMS.items():
+        if _host_matches(host, domain):
+            extra_params |= params
+    
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and key.lower() not in extra_params
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+def dedupe_key(url: str) -> str:
+    """
+    중복 판별용 키 - canonicalize_url에 더해 scheme, www., 끝 슬래시, 파라미터 순서를 무시
+    
+    http/https, www 유무만 다른 같은 글을 하나로 본다.
+    """
+    url = canonicalize_url(url)
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.hostname:
+        return url
+    
+    host = parts.netloc
+    if host.startswith("www."):
+        host = host[4:]
+    
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def is_google_news_url(url: str) -> bool:
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    return (parts.hostname or "").lower() == GOOGLE_NEWS_HOST and "/articles/" in parts.path
+
+
+def decode_google_news_url(url: str) -> Optional[str]:
+    """
+    Google News 기사 URL의 ID에 직접 들어있는 원문 URL 추출 (네트워크 없이)
+    
+    구형 ID는 protobuf(base64)에 원문 URL을 그대로 담고 있다.
+    신형 ID(AU_yqL...)는 원문 URL이 없으므로 None을 반환한다.
+    """
+    try:
+        article_id = urlsplit(url).path.split("/articles/", 1)[1].split("/")[0]
+        decoded = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except Exception:
+        return None
+    
+    prefix = b"\x08\x13\x22"
+    if decoded.startswith(prefix):
+        decoded = decoded[len(prefix):]
+        # 길이(varint) 뒤에 URL
+        length, shift, index = 0, 0, 0
+        while index < len(decoded):
+            byte = decoded[index]
+            length |= (byte & 0x7F) << shift
+            index += 1
+            if not byte & 0x80:
+                break
+            shift += 7
+        candidate = decoded[index:index + length]
+    else:
+        match = re.search(rb"https?://[\x21-\x7e]+", decoded)
+        candidate = match.group(0) if match else b""
+    
+    try:
+        candidate_url = candidate.decode("ascii")
+    except UnicodeDecodeError:
+        return None
+    
+    if candidate_url.startswith(("http://", "https://")) and not candidate_url.startswith("https://news.google.com"):
+        return candidate_url
+    return None
+
+
+class UrlResolver:
+    """
+    리다이렉트 URL 해석기
+    
+    Google News 기사 링크를 원문 URL로 바꾸고 결과를 DB(url_redirects)에 저장해
+    같은 링크는 한 번만 해석한다. 해석에 실패한 링크는 일정 시간 뒤에만 다시 시도한다.
+    """
+    
+    RETRY_FAILED_AFTER = timedelta(hours=24)
+    
+    def __init__(self):
+        self._cache: Optional[Dict[str, Dict]] = None
+        self._load_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.cache_hits = 0
+        self.resolved = 0
+        self.failed = 0
+    
+    async def _ensure_loaded(self):
+        if self._cache is not None:
+            return
+        async with self._load_lock:
+            if self._cache is not None:
+                return
+            async with async_session() as session:
+                result = await session.execute(select(UrlRedirect))
+                self._cache = {
+                    row.source_url: {"resolved_url": row.resolved_url, "resolved_at": row.resolved_at}
+                    for row in result.scalars().all()
+                }
+    
+    async def canonicalize(self, url: str) -> str:
+        """리다이렉트 해석 + 정리된 URL 반환"""
+        url = canonicalize_url(url)
+        if is_google_news_url(url):
+            resolved = await self.resolve(url)
+            if resolved:
+                url = canonicalize_url(resolved)
+        return url
+    
+    async def resolve(self, url: str) -> Optional[str]:
+        """리다이렉트 URL을 원문 URL로 해석 (캐시 우선, 같은 URL 동시 요청은 한 번만 해석)"""
+        await self._ensure_loaded()
+        
+        cached = self._cache.get(url)
+        if cached and (
+            cached["resolved_url"]
+            or datetime.utcnow() - cached["resolved_at"] < self.RETRY_FAILED_AFTER
+        ):
+            self.cache_hits += 1
+            return cached["resolved_url"]
+        
+        if url in self._inflight:
+            # 기다리는 쪽이 취소되어도 공유 future는 취소되지 않게
+            return await asyncio.shield(self._inflight[url])
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        resolved = None
+        try:
+            resolved = decode_google_news_url(url) or await self._fetch_redirect(url)
+            if resolved:
+                self.resolved += 1
+            else:
+                self.failed += 1
+            await self._store(url, resolved)
+            return resolved
+        except Exception as e:
+            resolved = None
+            print(f"URL 해석 오류 ({url}): {e}")
+            return None
+        finally:
+            # 먼저 요청한 쪽이 취소되거나 BaseException으로 끝나도 기다리는 쪽은 결과(해석 실패면 None)를 받음
+            if not future.done():
+                future.set_result(resolved)
+            del self._inflight[url]
+    
+    async def _fetch_redirect(self, url: str) -> Optional[str]:
+        """리다이렉트를 따라가 최종 URL 확인 (원문 링크가 페이지 안에만 있으면 추출)"""
+        try:
+            response = await host_guard.get(http_client.client, url)
+        except Exception as e:
+            print(f"리다이렉트 해석 실패 ({url}): {e}")
+            return None
+        
+        final_url = str(response.url)
+        if (response.url.host or "").lower() != GOOGLE_NEWS_HOST:
+            return final_url
+        
+        match = re.search(r'data-n-au="(https?://[^"]+)"', response.text)
+        if match:
+            return match.group(1)
+        return None
+    
+    async def _store(self, source_url: str, resolved_url: Optional[str]):
+        now = datetime.utcnow()
+        self._cache[source_url] = {"resolved_url": resolved_url, "resolved_at": now}
+        
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    result = await session.execute(
+                        select(UrlRedirect).where(UrlRedirect.source_url == source_url)
+                    )
+                    row = result.scalars().first()
+                    if not row:
+                        row = UrlRedirect(source_url=source_url)
+                        session.add(row)
+                    row.resolved_url = resolved_url
+                    row.resolved_at = now
+                    await session.commit()
+            except Exception as e:
+                print(f"URL 캐시 저장 오류 ({source_url}): {e}")
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached": len(self._cache) if self._cache is not None else 0,
+            "cache_hits": self.cache_hits,
+            "resolved": self.resolved,
+            "failed": self.failed
+        }
+
+
+# Singleton instance
+url_resolver = UrlResolver()
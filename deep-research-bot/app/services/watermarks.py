@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.models.database import FeedWatermark, async_session
+
+class FeedWatermarkStore:
+    """
+    피드 워터마크 저장소
+    
+    피드(+조회 범위)별로 마지막으로 처리한 엔트리의 GUID, 발행 시각, 내용 해시를
+    DB(feed_watermarks 테이블)에 저장한다. 수집기는 다음 실행에서 이미 본 엔트리를 만나면
+    처리를 멈추므로, 새 엔트리만 HTML 정리/키워드 매칭/중복 조회 단계로 넘어간다.
+    """
+    
+    def __init__(self):
+        self._marks: Optional[Dict[str, Dict[str, Any]]] = None
+        self._load_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+    
+    @staticmethod
+    def key(scope: str, language: str, feed_url: str) -> str:
+        return f"{scope}|{language}|{feed_url}"
+    
+    async def _ensure_loaded(self):
+        if self._marks is not None:
+            return
+        async with self._load_lock:
+            if self._marks is not None:
+                return
+            async with async_session() as session:
+                result = await session.execute(select(FeedWatermark))
+                self._marks = {
+                    row.feed_key: {
+                        "guid": row.last_guid,
+                        "published_at": row.last_published_at,
+                        "content_hash": row.content_hash
+                    }
+                    for row in result.scalars().all()
+                }
+    
+    async def get(self, feed_key: str) -> Optional[Dict[str, Any]]:
+        await self._ensure_loaded()
+        return self._marks.get(feed_key)
+    
+    async def save(self, feed_key: str, mark: Dict[str, Any]):
+        """워터마크 갱신 (메모리 + DB)"""
+        await self._ensure_loaded()
+        self._marks[feed_key] = mark
+        
+        async with self._write_lock:
+            try:
+                async with async_session() as session:
+                    result = await session.execute(
+                        select(FeedWatermark).where(FeedWatermark.feed_key == feed_key)
+                    )
+                    row = result.scalars().first()
+                    if not row:
+                        row = FeedWatermark(feed_key=feed_key)
+                        session.add(row)
+                    row.last_guid = mark.get("guid")
+                    row.last_published_at = mark.get("published_at")
+                    row.content_hash = mark.get("content_hash")
+                    row.updated_at = datetime.utcnow()
+                    await session.commit()
+            except Exception as e:
+                print(f"피드 워터마크 저장 오류 ({feed_key}): {e}")
+    
+    def reset(self):
+        """메모리 캐시 비우기 (다음 요청 시 DB에서 다시 로드)"""
+        self._marks = None
+
+
+# Singleton instance
+feed_watermarks = FeedWatermarkStore()
@@ -0,0 +1,337 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.exc import IntegrityError
+
+from app.models.database import Keyword, ResearchLog, WorkUnit, async_session
+from app.services.jobs import ACTIVE_STATUSES
+from app.config import settings
+
+# worker.py가 처리하는 실행 로그의 범위
+WORKERS_SCOPE = "workers"
+
+# 고정 피드 작업의 source_type - 실행당 피드를 한 번만 받아 모든 키워드와 매칭
+# (keyword_id는 실행의 첫 키워드, 키워드 작업은 검색 API만 사용)
+FEEDS_UNIT = "feeds"
+
+# 한 번에 임대를 시도하는 후보 수 (다른 워커가 먼저 가져가면 다음 후보로)
+LEASE_CANDIDATES = 10
+
+
+class WorkQueue:
+    """
+    워커 작업 큐 (work_units 테이블)
+    
+    전체 리서치 실행 1건(실행 로그 1개)을 고정 피드 작업 1개 + 활성 키워드 × 소스 단위 작업으로 나눠 등록한다.
+    worker.py의 워커 프로세스들이 작업을 하나씩 임대(lease)해 처리하고, 처리 중에는 주기적으로
+    임대를 연장(heartbeat)한다. 워커가 죽어 임대가 만료된 작업은 다른 워커가 다시 임대하며,
+    worker_max_attempts번 임대된 작업은 실패로 처리한다. 임대는 상태 조건을 건 UPDATE의 영향받은 행 수로
+    판정하므로 여러 프로세스가 같은 DB를 써도 한 작업은 한 워커만 가져간다.
+    """
+    
+    @staticmethod
+    def _leasable(now: datetime):
+        """임대 가능한 작업 - 대기 중이거나 임대가 만료된 작업"""
+        return or_(
+            WorkUnit.status == "pending",
+            and_(WorkUnit.status == "leased", WorkUnit.lease_expires_at < now)
+        )
+    
+    @staticmethod
+    async def _active_run(session) -> Optional[int]:
+        """진행 중인 워커 실행 ID"""
+        result = await session.execute(
+            select(ResearchLog.id).where(
+                and_(ResearchLog.scope == WORKERS_SCOPE, ResearchLog.status.in_(ACTIVE_STATUSES))
+            )
+        )
+        return result.scalars().first()
+    
+    async def enqueue_run(self) -> Dict[str, Any]:
+        """전체 리서치 실행 등록 - 진행 중인 워커 실행이 있으면 그 실행 ID 반환 (merged=True)"""
+        from app.services.researcher import researcher
+        
+        async with async_session() as session:
+            job_id = await self._active_run(session)
+            if job_id is not None:
+                return {"job_id": job_id, "scope": WORKERS_SCOPE, "merged": True}
+            
+            result = await session.execute(
+                select(Keyword.id).where(Keyword.is_active == True).order_by(Keyword.id)
+            )
+            keyword_ids = result.scalars().all()
+            if not keyword_ids:
+                return {"status": "no_keywords", "message": "활성화된 키워드가 없습니다."}
+            
+            log = ResearchLog(status="running", scope=WORKERS_SCOPE)
+            session.add(log)
+            try:
+                await session.flush()
+            except IntegrityError:
+                # 다른 프로세스가 먼저 등록함 (범위당 진행 중 실행은 하나 - uq_research_logs_active_scope)
+                await session.rollback()
+                job_id = await self._active_run(session)
+                return {"job_id": job_id, "scope": WORKERS_SCOPE, "merged": True}
+            # 고정 피드 작업을 먼저 등록해 가장 먼저 임대되게 함
+            has_feeds = any(
+                collector.get_feeds(language)
+                for collector in researcher.collectors.values()
+                for language in researcher.languages
+            )
+            work_units = [WorkUnit(log_id=log.id, keyword_id=keyword_ids[0], source_type=FEEDS_UNIT)] if has_feeds else []
+            work_units += [
+                WorkUnit(log_id=log.id, keyword_id=keyword_id, source_type=source_type)
+                for keyword_id in keyword_ids
+                for source_type in researcher.collectors
+            ]
+            session.add_all(work_units)
+            await session.commit()
+            units = len(work_units)
+        
+        print(f"🗂️ 워커 리서치 등록: #{log.id} (작업 {units}개)")
+        return {"job_id": log.id, "scope": WORKERS_SCOPE, "merged": False, "units": units}
+    
+    async def lease(self, worker_id: str) -> Optional[WorkUnit]:
+        """작업 하나 임대 - 없으면 None"""
+        now = datetime.utcnow()
+        async with async_session() as session:
+            # 임대 횟수를 다 쓴 채 만료된 작업은 다시 임대하지 않고 실패 처리
+            await session.execute(
+                update(WorkUnit)
+                .where(
+                    WorkUnit.status == "leased",
+                    WorkUnit.lease_expires_at < now,
+                    WorkUnit.attempts >= settings.worker_max_attempts
+                )
+                .values(status="failed", completed_at=now, error_message="임대 만료 (워커 중단)")
+            )
+            await session.commit()
+            
+            result = await session.execute(
+                select(WorkUnit.id)
+                .where(self._leasable(now))
+                .order_by(WorkUnit.id)
+                .limit(LEASE_CANDIDATES)
+            )
+            candidates = result.scalars().all()
+            # 읽기 트랜잭션을 끝내고 후보마다 짧은 쓰기 트랜잭션으로 임대 시도
+            await session.commit()
+            for unit_id in candidates:
+                leased = await session.execute(
+                    update(WorkUnit)
+                    .where(WorkUnit.id == unit_id, self._leasable(now))
+                    .values(
+                        status="leased",
+                        worker_id=worker_id,
+                        lease_expires_at=now + timedelta(seconds=settings.worker_lease_seconds),
+                        heartbeat_at=now,
+                        attempts=WorkUnit.attempts + 1
+                    )
+                )
+                await session.commit()
+                if leased.rowcount == 1:
+                    return await session.get(WorkUnit, unit_id)
+        return None
+    
+    @staticmethod
+    def _owned(unit_id: int, worker_id: str):
+        return and_(WorkUnit.id == unit_id, WorkUnit.worker_id == worker_id, WorkUnit.status == "leased")
+    
+    async def heartbeat(self, unit_id: int, worker_id: str) -> bool:
+        """임대 연장 - 임대를 잃었으면 (만료 후 회수, 실행 취소) False"""
+        now = datetime.utcnow()
+        async with async_session() as session:
+            result = await session.execute(
+                update(WorkUnit)
+                .where(self._owned(unit_id, worker_id))
+                .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=settings.worker_lease_seconds))
+            )
+            await session.commit()
+            return result.rowcount == 1
+    
+    async def complete(self, unit_id: int, worker_id: str, stats: Dict[str, int]) -> bool:
+        """작업 완료 기록 - 임대를 잃었으면 기록하지 않고 False"""
+        async with async_session() as session:
+            result = await session.execute(
+                update(WorkUnit)
+                .where(self._owned(unit_id, worker_id))
+                .values(
+                    status="done",
+                    completed_at=datetime.utcnow(),
+                    found=stats["found"],
+                    skipped=stats["skipped"],
+                    analyzed=stats["analyzed"]
+                )
+            )
+            await session.commit()
+            return result.rowcount == 1
+    
+    async def fail(self, unit_id: int, worker_id: str, error_message: str):
+        """작업 실패 - 임대 횟수가 남았으면 다시 대기 상태로"""
+        async with async_session() as session:
+            unit = await session.get(WorkUnit, unit_id)
+            if unit is None or unit.worker_id != worker_id or unit.status != "leased":
+                return
+            if unit.attempts < settings.worker_max_attempts:
+                unit.status = "pending"
+                unit.worker_id = None
+                unit.lease_expires_at = None
+            else:
+                unit.status = "failed"
+                unit.completed_at = datetime.utcnow()
+            unit.error_message = error_message
+            await session.commit()
+    
+    async def update_progress(self, log_id: int):
+        """실행 로그에 진행 상황 기록 (작업 단위 집계)"""
+        async with async_session() as session:
+            log = await session.get(ResearchLog, log_id)
+            if log is None or log.status != "running":
+                return
+            
+            result = await session.execute(
+                select(
+                    WorkUnit.status,
+                    func.count(WorkUnit.id),
+                    func.sum(WorkUnit.found),
+                    func.sum(WorkUnit.skipped),
+                    func.sum(WorkUnit.analyzed)
+                )
+                .where(WorkUnit.log_id == log_id)
+                .group_by(WorkUnit.status)
+            )
+            counts: Dict[str, int] = {}
+            found = skipped = analyzed = 0
+            for status, count, unit_found, unit_skipped, unit_analyzed in result.all():
+                counts[status] = count
+                found += unit_found or 0
+                skipped += unit_skipped or 0
+                analyzed += unit_analyzed or 0
+            
+            result = await session.execute(
+                select(Keyword.name, WorkUnit.worker_id)
+                .join(Keyword, Keyword.id == WorkUnit.keyword_id)
+                .where(WorkUnit.log_id == log_id, WorkUnit.status == "leased")
+                .order_by(WorkUnit.id)
+            )
+            leased = result.all()
+            
+            total = sum(counts.values())
+            done = total - counts.get("pending", 0) - counts.get("leased", 0)
+            elapsed = (datetime.utcnow() - log.started_at).total_seconds() if log.started_at else 0.0
+            eta = elapsed / done * (total - done) if done else None
+            
+            log.progress = json.dumps({
+                "stages": {"found": found, "skipped": skipped, "analyzed": analyzed},
+                "units_total": total,
+                "units_done": done,
+                "units_leased": counts.get("leased", 0),
+                "units_failed": counts.get("failed", 0),
+                "workers": len({worker_id for _, worker_id in leased}),
+                "analysis_done": analyzed,
+                "current_keyword": leased[0][0] if leased else None,
+                "elapsed_seconds": round(elapsed, 1),
+                "eta_seconds": round(eta, 1) if eta is not None else None
+            })
+            log.current_keyword = leased[0][0] if leased else None
+            log.updated_at = datetime.utcnow()
+            await session.commit()
+    
+    async def finish_runs(self) -> List[int]:
+        """
+        남은 작업이 없는 워커 실행을 완료 처리
+        
+        여러 워커가 동시에 호출해도 실행 로그 상태 조건을 건 UPDATE로 한 워커만 완료 처리한다.
+        
+        Returns:
+            이번 호출에서 완료 처리한 실행 로그 ID (실행 후 작업은 호출한 워커가 맡음)
+        """
+        async with async_session() as session:
+            result = await session.execute(
+                select(ResearchLog.id).where(
+                    and_(ResearchLog.scope == WORKERS_SCOPE, ResearchLog.status == "running")
+                )
+            )
+            log_ids = result.scalars().all()
+        
+        finished = []
+        for log_id in log_ids:
+            async with async_session() as session:
+                result = await session.execute(
+                    select(
+                        func.count(WorkUnit.id).filter(WorkUnit.status.in_(("pending", "leased"))),
+                        func.count(WorkUnit.id).filter(WorkUnit.status == "failed"),
+                        func.coalesce(func.sum(WorkUnit.found), 0),
+                        func.coalesce(func.sum(WorkUnit.skipped), 0),
+                        func.coalesce(func.sum(WorkUnit.analyzed), 0)
+                    ).where(WorkUnit.log_id == log_id)
+                )
+                remaining, failed, found, skipped, analyzed = result.one()
+            if remaining:
+                continue
+            
+            await self.update_progress(log_id)
+            async with async_session() as session:
+                closed = await session.execute(
+                    update(ResearchLog)
+                    .where(ResearchLog.id == log_id, ResearchLog.status == "running")
+                    .values(
+                        status="completed",
+                        completed_at=datetime.utcnow(),
+                        current_keyword=None,
+                        total_found=found,
+                        total_skipped=skipped,
+                        total_analyzed=analyzed,
+                        error_message=f"실패한 작업 {failed}개" if failed else None
+                    )
+                )
+                await session.commit()
+            if closed.rowcount == 1:
+                finished.append(log_id)
+        return finished
+    
+    async def cancel(self, log_id: int) -> Optional[str]:
+        """
+        워커 실행 취소 - 남은 작업을 취소하고, 처리 중인 워커는 다음 heartbeat에서 임대를 잃고 멈춘다
+        
+        Returns:
+            cancelled, None (진행 중인 워커 실행이 아님)
+        """
+        now = datetime.utcnow()
+        async with async_session() as session:
+            result = await session.execute(
+                update(ResearchLog)
+                .where(
+                    ResearchLog.id == log_id,
+                    ResearchLog.scope == WORKERS_SCOPE,
+                    ResearchLog.status.in_(ACTIVE_STATUSES)
+                )
+                .values(status="cancelled", completed_at=now, current_keyword=None)
+            )
+            if result.rowcount != 1:
+                await session.rollback()
+                return None
+            await session.execute(
+                update(WorkUnit)
+                .where(WorkUnit.log_id == log_id, WorkUnit.status.in_(("pending", "leased")))
+                .values(status="cancelled", completed_at=now)
+            )
+            await session.commit()
+        return "cancelled"
+    
+    async def stats(self) -> Dict[str, int]:
+        """상태별 작업 수 (진행 중인 워커 실행)"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(WorkUnit.status, func.count(WorkUnit.id))
+                .join(ResearchLog, ResearchLog.id == WorkUnit.log_id)
+                .where(ResearchLog.status == "running")
+                .group_by(WorkUnit.status)
+            )
+            return dict(result.all())
+
+
+# Singleton instance
+work_queue = WorkQueue()
@@ -6,11 +6,17 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from app.config import settings
 from app.models.database import init_db
 from app.api.routes import router as api_router
-from app.services.researcher import researcher
+from app.services.jobs import research_jobs
+from app.services.work_queue import work_queue
+from app.core.http import http_client
+from app.core.executor import parse_executor
+from app.services.transcripts import transcript_fetcher
+from app.services.analysis_batches import analysis_batches
 
 # Scheduler
 scheduler = AsyncIOScheduler()
@@ -22,14 +28,26 @@ async def lifespan(app: FastAPI):
     print("🚀 Deep Research Bot 시작...")
     await init_db()
     print("✅ 데이터베이스 초기화 완료")
+    await http_client.start()
+    await research_jobs.recover()
     
-    # 일일 리서치 스케줄링
+    # 일일 리서치 스케줄링 (작업 관리자에 등록 - 실행 중인 전체 리서치가 있으면 합침)
+    # workers 모드에서는 작업 큐에 등록하고 worker.py 프로세스가 처리
     scheduler.add_job(
-        researcher.run_daily_research,
+        work_queue.enqueue_run if settings.research_mode == "workers" else research_jobs.submit,
         CronTrigger(hour=settings.research_schedule_hour, minute=0),
         id="daily_research",
         replace_existing=True
     )
+    
+    # 배치 분석 모드: 제출한 배치 작업 상태 확인 / 결과 반영
+    if settings.analysis_mode == "batch":
+        scheduler.add_job(
+            analysis_batches.poll,
+            IntervalTrigger(minutes=settings.analysis_batch_poll_minutes),
+            id="analysis_batch_poll",
+            replace_existing=True
+        )
     scheduler.start()
     print(f"⏰ 매일 {settings.research_schedule_hour}:00에 자동 리서치 예약됨")
     
@@ -37,6 +55,9 @@ async def lifespan(app: FastAPI):
     
     # 종료 시
     scheduler.shutdown()
+    await http_client.close()
+    parse_executor.shutdown()
+    transcript_fetcher.shutdown()
     print("👋 Deep Research Bot 종료")
 
 # FastAPI 앱 생성
@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+# 설정은 import 시점에 읽으므로 app을 import하기 전에 테스트용 DB / API 키 지정
+_data_dir = tempfile.mkdtemp(prefix="deep-research-test-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_data_dir, 'test.db')}"
+os.environ["DEBUG"] = "false"
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """테스트마다 빈 DB (기본 키워드 AI(1), Agent(2) 포함)"""
+    from app.models.database import Base, engine, init_db
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+    yield
+    # 테스트마다 이벤트 루프가 바뀌므로 풀의 연결을 닫음
+    await engine.dispose()
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """analyzer가 가짜 OpenAI 호환 서버를 쓰도록 (재시도 / 다이제스트 미리 생성 없음)"""
+    from app.config import settings
+    from app.services.analyzer import analyzer
+    from tests.fake_openai import FakeOpenAI
+
+    fake = FakeOpenAI()
+    monkeypatch.setattr(analyzer, "client", fake.client())
+    monkeypatch.setattr(settings, "llm_max_retries", 0)
+    monkeypatch.setattr(settings, "digest_prebuild", False)
+    return fake
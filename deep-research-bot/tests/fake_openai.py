@@ -0,0 +1,152 @@
+"""
+테스트용 OpenAI 호환 서버 (/v1/chat/completions, /v1/files, /v1/batches)
+
+네트워크 없이 httpx.ASGITransport로 연결한다.
+
+    fake = FakeOpenAI()
+    client = fake.client()   # AsyncOpenAI - analyzer.client 대신 사용
+"""
+import json
+import re
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse
+from openai import AsyncOpenAI
+
+_ID_RE = re.compile(r"\[id: (\d+)\]")
+
+
+class FakeOpenAI:
+    """
+    요청을 기록하고 정해진 규칙으로 응답하는 가짜 서버
+
+    - 단건 분석 (response_format 있음, id 없음): share_score=single_score
+    - 일괄 분석 (프롬프트에 [id: n]): id마다 결과, drop_ids에 있는 id는 응답에서 뺌
+    - response_format 없는 요청 (청크 요약 등): 짧은 요약 텍스트
+    - 배치 작업: complete_after_polls번째 조회에서 batch_status로 끝남 (completed면 결과 파일 생성)
+    """
+
+    def __init__(self):
+        self.app = FastAPI()
+        self.chat_requests: List[Dict[str, Any]] = []
+        self.files: Dict[str, str] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.single_score = 55
+        self.drop_ids: set = set()
+        self.fail_chat = False
+        self.complete_after_polls = 2
+        self.batch_status = "completed"
+        self._routes()
+
+    def client(self) -> AsyncOpenAI:
+        transport = httpx.ASGITransport(app=self.app)
+        return AsyncOpenAI(
+            api_key="test-key",
+            base_url="http://fake-openai/v1",
+            max_retries=0,
+            http_client=httpx.AsyncClient(transport=transport, base_url="http://fake-openai/v1")
+        )
+
+    def _completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = body["messages"][-1]["content"]
+        if "response_format" not in body:
+            content = "chunk summary"
+        else:
+            ids = [int(value) for value in _ID_RE.findall(prompt)]
+            if ids:
+                content = json.dumps({"results": [
+                    {
+                        "id": content_id,
+                        "summary": f"summary {content_id}",
+                        "insights": ["insight"],
+                        "business_relevance": "relevance",
+                        "share_score": 70,
+                        "share_reason": "reason"
+                    }
+                    for content_id in ids if content_id not in self.drop_ids
+                ]})
+            else:
+                content = json.dumps({
+                    "summary": "single",
+                    "insights": ["insight"],
+                    "business_relevance": "relevance",
+                    "share_score": self.single_score,
+                    "share_reason": "reason"
+                })
+        return {
+            "id": "chatcmpl-" + uuid.uuid4().hex[:8],
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+        }
+
+    def _finish(self, batch: Dict[str, Any]):
+        batch["status"] = self.batch_status
+        if self.batch_status != "completed":
+            batch["errors"] = {"data": [{"message": "fake batch failure"}]}
+            return
+        lines = []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            request = json.loads(line)
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": self._completion(request["body"])}
+            }))
+        output_id = "file-out-" + batch["id"]
+        self.files[output_id] = "\n".join(lines)
+        batch["output_file_id"] = output_id
+
+    def batch_lines(self, batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """제출된 배치 입력 파일의 요청 목록"""
+        batch = self.batches[batch_id] if batch_id else list(self.batches.values())[-1]
+        return [json.loads(line) for line in self.files[batch["input_file_id"]].splitlines()]
+
+    def _routes(self):
+        app = self.app
+
+        @app.post("/v1/chat/completions")
+        async def chat(request: Request):
+            body = await request.json()
+            self.chat_requests.append(body)
+            if self.fail_chat:
+                return JSONResponse({"error": {"message": "fake failure", "type": "server_error"}}, status_code=500)
+            return self._completion(body)
+
+        @app.post("/v1/files")
+        async def upload(file: UploadFile = File(...), purpose: str = Form(...)):
+            file_id = "file-" + uuid.uuid4().hex[:8]
+            self.files[file_id] = (await file.read()).decode("utf-8")
+            return {
+                "id": file_id, "object": "file", "bytes": len(self.files[file_id]), "created_at": 0,
+                "filename": file.filename, "purpose": purpose, "status": "uploaded"
+            }
+
+        @app.get("/v1/files/{file_id}/content")
+        async def file_content(file_id: str):
+            return PlainTextResponse(self.files[file_id])
+
+        @app.post("/v1/batches")
+        async def create_batch(request: Request):
+            body = await request.json()
+            batch_id = "batch-" + uuid.uuid4().hex[:8]
+            self.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "status": "validating", "polls": 0,
+                "endpoint": body["endpoint"], "input_file_id": body["input_file_id"]
+            }
+            return self.batches[batch_id]
+
+        @app.get("/v1/batches/{batch_id}")
+        async def get_batch(batch_id: str):
+            batch = self.batches[batch_id]
+            batch["polls"] += 1
+            if batch["status"] in ("validating", "in_progress"):
+                if batch["polls"] >= self.complete_after_polls:
+                    self._finish(batch)
+                else:
+                    batch["status"] = "in_progress"
+            return batch
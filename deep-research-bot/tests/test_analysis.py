@@ -0,0 +1,142 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.database import AnalysisBatch, Content, async_session
+from app.services.analysis_batches import analysis_batches
+from app.services.analyzer import analyzer
+
+pytestmark = pytest.mark.anyio
+
+
+async def _add_contents(*texts: str) -> list:
+    async with async_session() as session:
+        contents = [
+            Content(
+                keyword_id=1, title=f"title {i}", url=f"https://example.com/{i}",
+                source_type="news", language="ko", content_text=text
+            )
+            for i, text in enumerate(texts)
+        ]
+        session.add_all(contents)
+        await session.commit()
+        return [content.id for content in contents]
+
+
+async def _contents() -> dict:
+    async with async_session() as session:
+        result = await session.execute(select(Content).order_by(Content.id))
+        return {content.id: content for content in result.scalars().all()}
+
+
+def _item(content_id: int, text: str = "short text") -> dict:
+    return {
+        "id": content_id, "title": f"title {content_id}", "content": text,
+        "source_type": "news", "keyword": "AI", "language": "ko"
+    }
+
+
+# ============ 실시간 (sync) ============
+
+async def test_analyze_content_calls_the_api_once_and_caches(db, fake_openai):
+    fake_openai.single_score = 77
+
+    first = await analyzer.analyze_content("title", "short text", "news", "AI")
+    second = await analyzer.analyze_content("title", "short text", "news", "AI")
+
+    assert first["share_score"] == 77 and first["summary"] == "single"
+    assert second == first
+    assert len(fake_openai.chat_requests) == 1
+    assert fake_openai.chat_requests[0]["response_format"] == {"type": "json_object"}
+
+
+async def test_failed_analysis_is_not_cached(db, fake_openai):
+    fake_openai.fail_chat = True
+    assert await analyzer.analyze_content("title", "short text", "news", "AI") is None
+
+    fake_openai.fail_chat = False
+    retried = await analyzer.analyze_content("title", "short text", "news", "AI")
+    assert retried["summary"] == "single"
+    assert len(fake_openai.chat_requests) == 2
+
+
+async def test_grouped_analysis_falls_back_to_single_requests(db, fake_openai, monkeypatch):
+    monkeypatch.setattr(settings, "analysis_batch_size", 3)
+    fake_openai.drop_ids = {2}
+
+    analyses = await analyzer.analyze_batch([_item(1), _item(2), _item(3)])
+
+    # 묶음 요청 1건 + 응답에서 빠진 id 2의 개별 요청 1건
+    assert len(fake_openai.chat_requests) == 2
+    assert analyses[1]["summary"] == "summary 1"
+    assert analyses[2]["summary"] == "single"
+    assert analyses[3]["summary"] == "summary 3"
+
+
+# ============ 배치 작업 (batch) ============
+
+async def test_batch_submit_poll_and_ingest(db, fake_openai, monkeypatch):
+    monkeypatch.setattr(settings, "analysis_batch_size", 2)
+    ids = await _add_contents("text a", "text b", "text c")
+
+    submitted = await analysis_batches.submit()
+    assert submitted["status"] == "submitted"
+    assert submitted["contents"] == 3 and submitted["requests"] == 2
+    lines = fake_openai.batch_lines()
+    assert [line["url"] for line in lines] == ["/v1/chat/completions"] * 2
+    # 결과를 기다리는 동안에는 다시 제출하지 않음
+    assert await analysis_batches.pending_content_ids() == set(ids)
+    assert (await analysis_batches.submit())["status"] == "empty"
+
+    # 첫 조회는 진행 중, 두 번째 조회에서 완료 → 결과 반영
+    (batch,) = await analysis_batches.poll()
+    assert batch["status"] == "in_progress"
+    (batch,) = await analysis_batches.poll()
+    assert batch["status"] == "ingested"
+    assert batch["analyzed_count"] == 3
+
+    contents = await _contents()
+    assert all(contents[i].is_analyzed for i in ids)
+    assert contents[ids[0]].ai_summary == f"summary {ids[0]}"
+    assert json.loads(contents[ids[0]].ai_insights) == ["insight"]
+    assert await analysis_batches.pending_content_ids() == set()
+    # 배치 모드는 실시간 요청을 쓰지 않음
+    assert fake_openai.chat_requests == []
+
+
+async def test_oversized_content_is_analyzed_in_realtime(db, fake_openai, monkeypatch):
+    monkeypatch.setattr(settings, "analysis_input_tokens", 200)
+    monkeypatch.setattr(settings, "analysis_input_tokens_models", {})
+    short_id, long_id = await _add_contents("short text", "long paragraph text " * 300)
+
+    submitted = await analysis_batches.submit()
+
+    assert submitted["realtime"] == 1 and submitted["contents"] == 1
+    assert fake_openai.batch_lines()[0]["body"]["messages"][-1]["content"].count("[id: ") == 1
+    # 긴 콘텐츠는 청크 요약 후 실시간 분석으로 바로 저장
+    contents = await _contents()
+    assert contents[long_id].is_analyzed and contents[long_id].ai_summary == "single"
+    assert not contents[short_id].is_analyzed
+    assert any("response_format" not in body for body in fake_openai.chat_requests)
+
+
+async def test_failed_batch_leaves_contents_for_the_next_submit(db, fake_openai):
+    ids = await _add_contents("text a", "text b")
+    fake_openai.batch_status = "failed"
+    fake_openai.complete_after_polls = 1
+
+    await analysis_batches.submit()
+    (batch,) = await analysis_batches.poll()
+
+    assert batch["status"] == "failed"
+    async with async_session() as session:
+        stored = (await session.execute(select(AnalysisBatch))).scalars().one()
+    assert stored.error_message == "fake batch failure"
+    assert not any(content.is_analyzed for content in (await _contents()).values())
+
+    # 실패한 작업의 콘텐츠는 다음 제출에 다시 포함
+    fake_openai.batch_status = "completed"
+    resubmitted = await analysis_batches.submit()
+    assert resubmitted["status"] == "submitted" and resubmitted["contents"] == len(ids)
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.core.executor import parse_executor
+from app.services.collectors import BaseCollector, FeedSnapshot
+from app.services.http_cache import conditional_cache
+from app.services.watermarks import feed_watermarks
+
+pytestmark = pytest.mark.anyio
+
+FEED_URL = "https://feeds.example.com/rss"
+
+
+def _rss(*titles: str) -> str:
+    now = datetime.utcnow()
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{title}</link>"
+        f"<pubDate>{(now - timedelta(hours=i)).strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate></item>"
+        for i, title in enumerate(titles)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'
+
+
+class FeedServer:
+    """ETag를 지원하는 가짜 피드 서버"""
+
+    def __init__(self, body: str):
+        self.body = body
+        self.downloads = 0
+
+    async def get(self, url, headers=None, **kwargs):
+        etag = f'"{hash(self.body)}"'
+        request = httpx.Request("GET", url)
+        if (headers or {}).get("If-None-Match") == etag:
+            return httpx.Response(304, request=request)
+        self.downloads += 1
+        return httpx.Response(200, text=self.body, headers={"ETag": etag}, request=request)
+
+
+class StubCollector(BaseCollector):
+    source_type = "news"
+    cleaned = 0  # _parse_feed_entries로 넘어간 엔트리 수
+
+    def _search_sources(self, keyword, language, limit, snapshot=None):
+        return [self._search_feeds(keyword, language, snapshot)]
+
+    def get_feeds(self, language):
+        return [("Example", FEED_URL)]
+
+    def _parse_feed_entries(self, feed, source_name, language):
+        self.cleaned += len(feed.entries)
+        return [
+            {
+                "title": entry.title,
+                "url": entry.link,
+                "description": "",
+                "published_at": datetime(*entry.published_parsed[:6]),
+                "_match_text": entry.title.lower(),
+            }
+            for entry in feed.entries
+        ]
+
+
+@pytest.fixture
+def collector(db, monkeypatch):
+    conditional_cache.reset()
+    feed_watermarks.reset()
+
+    async def run_inline(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(parse_executor, "run", run_inline)
+    server = FeedServer(_rss("ai-b", "ai-a"))
+    collector = StubCollector()
+    monkeypatch.setattr(collector, "_get", server.get)
+    return collector, server
+
+
+async def _load(collector, scope="*") -> FeedSnapshot:
+    snapshot = FeedSnapshot(scope=scope)
+    await snapshot.load({"news": collector}, ["en"])
+    return snapshot
+
+
+def _titles(snapshot: FeedSnapshot):
+    return [item["title"] for item in snapshot.get_matches("news", "en", "ai")]
+
+
+async def test_watermark_is_saved_only_after_commit(collector):
+    collector, server = collector
+
+    first = await _load(collector)
+    assert _titles(first) == ["ai-b", "ai-a"]
+
+    # 저장(commit) 전에 중단된 실행 - 다음 실행은 같은 항목을 다시 받음
+    retry = await _load(collector)
+    assert _titles(retry) == ["ai-b", "ai-a"]
+    await retry.commit_watermarks()
+
+    assert _titles(await _load(collector)) == []
+    assert server.downloads == 1
+
+
+async def test_not_modified_feed_still_serves_unseen_scope(collector):
+    collector, server = collector
+
+    await (await _load(collector)).commit_watermarks()
+
+    # 304지만 키워드 범위는 아직 이 항목들을 본 적이 없음
+    keyword = await _load(collector, scope="ai")
+    assert _titles(keyword) == ["ai-b", "ai-a"]
+    await keyword.commit_watermarks()
+    assert await feed_watermarks.get(feed_watermarks.key("ai", "en", FEED_URL)) is not None
+
+    # 새 항목이 생기면 각 범위는 자기 워터마크 이후만 받음
+    server.body = _rss("ai-c", "ai-b", "ai-a")
+    assert _titles(await _load(collector)) == ["ai-c"]
+    assert _titles(await _load(collector, scope="ai")) == ["ai-c"]
+    assert server.downloads == 2
+
+
+async def test_only_new_entries_are_cleaned(collector):
+    collector, server = collector
+
+    await (await _load(collector)).commit_watermarks()
+    assert collector.cleaned == 2
+
+    # 변경된 피드도 워터마크 이전 엔트리는 정리하지 않음
+    server.body = _rss("ai-c", "ai-b", "ai-a")
+    snapshot = await _load(collector)
+    assert _titles(snapshot) == ["ai-c"]
+    assert collector.cleaned == 3
+    await snapshot.commit_watermarks()
+
+    # 304이고 새 엔트리가 없으면 원문을 다시 파싱하지 않음
+    assert _titles(await _load(collector)) == []
+    assert collector.cleaned == 3
+
+
+async def test_stream_does_not_cap_snapshot_feed_matches(collector):
+    collector, server = collector
+    server.body = _rss(*[f"ai-{i}" for i in range(12)])
+
+    snapshot = await _load(collector)
+    streamed = [item async for item in collector.stream("ai", "en", limit=10, snapshot=snapshot)]
+
+    # 워터마크는 12개 모두를 지나가므로 limit으로 자르면 나머지는 다시 받을 수 없음
+    assert len(streamed) == 12
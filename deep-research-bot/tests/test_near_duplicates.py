@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.database import Content, async_session
+from app.services.near_duplicates import NearDuplicateIndex, content_fingerprint
+
+pytestmark = pytest.mark.anyio
+
+TITLE = "OpenAI releases a new reasoning model for coding agents and research assistants"
+FINGERPRINT = content_fingerprint(TITLE, "")
+
+
+async def _insert(url: str, created_at=None) -> int:
+    async with async_session() as session:
+        content = Content(
+            keyword_id=1, title=TITLE, url=url, source_type="news", simhash=FINGERPRINT,
+            created_at=created_at or datetime.utcnow()
+        )
+        session.add(content)
+        await session.commit()
+        return content.id
+
+
+async def test_sync_sees_representatives_saved_by_other_processes(db):
+    index = NearDuplicateIndex()
+    await index.sync()
+
+    # 다른 워커가 저장한 대표 콘텐츠
+    other = await _insert("https://a.example.com/1")
+    mine = await _insert("https://b.example.com/1")
+
+    await index.sync()
+    assert await index.assign(mine, 1, FINGERPRINT) == other
+    # 중복으로 배정된 콘텐츠는 대표 후보에서 빠짐
+    assert mine not in index._entries
+
+
+async def test_batch_loaded_by_sync_does_not_point_at_itself(db):
+    index = NearDuplicateIndex()
+    first = await _insert("https://a.example.com/1")
+    second = await _insert("https://b.example.com/1")
+
+    # 저장 직후 sync가 같은 배치를 가져와도 먼저 저장된 쪽이 대표
+    await index.sync()
+    assert await index.assign(first, 1, FINGERPRINT) is None
+    assert await index.assign(second, 1, FINGERPRINT) == first
+
+
+async def test_expired_representatives_are_pruned(db, monkeypatch):
+    index = NearDuplicateIndex()
+    old = await _insert("https://a.example.com/1")
+    await index.sync()
+    assert old in index._entries
+
+    # 비교 기간이 지난 것처럼 만들고 정리 주기를 넘김
+    keyword_id, value, _ = index._entries[old]
+    index._entries[old] = (keyword_id, value, datetime.utcnow() - timedelta(days=30))
+    monkeypatch.setattr(NearDuplicateIndex, "PRUNE_INTERVAL", 0)
+
+    await index.sync()
+    assert old not in index._entries
+    new = await _insert("https://b.example.com/1")
+    assert await index.assign(new, 1, FINGERPRINT) is None
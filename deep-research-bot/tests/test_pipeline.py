@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.database import Content, async_session
+from app.services import pipeline as pipeline_module
+from app.services.pipeline import ResearchPipeline, _DONE
+
+pytestmark = pytest.mark.anyio
+
+
+def _entry(url: str, title="AI agent news"):
+    return (1, "news", "ko", {"title": title, "url": url, "canonical_url": url, "description": "AI"})
+
+
+async def test_flush_skips_only_the_failing_row(db):
+    pipeline = ResearchPipeline({}, ["ko"])
+    pipeline.keyword_stats = {1: {"found": 0, "skipped": 0, "analyzed": 0}}
+    queue = asyncio.Queue()
+
+    # title NOT NULL 위반 - 배치 저장이 실패해도 나머지 항목은 저장되고 분석 단계로 넘어가야 함
+    batch = [
+        _entry("https://example.com/1"),
+        _entry("https://example.com/bad", title=None),
+        _entry("https://example.com/2"),
+    ]
+    await pipeline._flush(batch, queue)
+
+    async with async_session() as session:
+        urls = set((await session.execute(select(Content.url))).scalars().all())
+    assert urls == {"https://example.com/1", "https://example.com/2"}
+    assert pipeline.stats["persist_failed"] == 1
+    assert pipeline.stats["persisted"] == 2
+    assert pipeline.stats["skipped"] == 0
+    assert queue.qsize() == 2
+
+    # 다음 배치는 그대로 저장 (이미 있는 URL은 중복으로 건너뜀)
+    await pipeline._flush([_entry("https://example.com/2"), _entry("https://example.com/3")], queue)
+    assert pipeline.stats["persisted"] == 3
+    assert pipeline.stats["skipped"] == 1
+
+
+
+async def test_failed_analysis_leaves_the_row_unanalyzed(db, fake_openai):
+    fake_openai.fail_chat = True
+    pipeline = ResearchPipeline({}, ["ko"])
+    pipeline.keyword_stats = {1: {"found": 0, "skipped": 0, "analyzed": 0}}
+    pipeline._keyword_names = {1: "AI"}
+    queue = asyncio.Queue()
+    await pipeline._flush([_entry("https://example.com/1")], queue)
+    await queue.put(_DONE)
+
+    await pipeline._analyze(queue)
+
+    # 실패 결과는 저장하지 않고 다음 실행에서 다시 분석
+    async with async_session() as session:
+        content = (await session.execute(select(Content))).scalars().one()
+    assert content.is_analyzed is False
+    assert content.ai_summary is None
+    assert pipeline.stats["analysis_failed"] == 1
+    assert pipeline.stats["analyzed"] == 0
+    assert pipeline.keyword_stats[1]["analyzed"] == 0
+
+
+async def test_extract_continues_when_updates_fail(db, monkeypatch):
+    pipeline = ResearchPipeline({}, ["ko"])
+    pipeline.keyword_stats = {1: {"found": 0, "skipped": 0, "analyzed": 0}}
+    pipeline._keyword_names = {1: "AI"}
+    queue = asyncio.Queue()
+    await pipeline._flush([_entry("https://example.com/1")], queue)
+    await queue.put(_DONE)
+
+    def broken_session():
+        raise RuntimeError("database is locked")
+
+    async def extract(url, canonical_url):
+        return "article body"
+
+    monkeypatch.setattr(settings, "article_extraction", True)
+    monkeypatch.setattr(settings, "relevance_filter", True)
+    monkeypatch.setattr(pipeline_module.article_extractor, "supports", lambda source_type, url: True)
+    monkeypatch.setattr(pipeline_module.article_extractor, "extract", extract)
+    monkeypatch.setattr(pipeline_module.relevance_scorer, "score", lambda job, keyword: 100.0)
+    monkeypatch.setattr(pipeline_module, "async_session", broken_session)
+
+    # 본문/관련도 저장이 실패해도 작업은 분석 단계로 넘어가야 함
+    out_queue = asyncio.Queue()
+    await pipeline._extract(queue, out_queue)
+
+    job = out_queue.get_nowait()
+    assert job["content"] == "article body"
+    assert pipeline.stats["update_failed"] == 2
+    assert pipeline.stats["analysis_queued"] == 1
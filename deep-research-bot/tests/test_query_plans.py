@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytest
+
+from app.api.routes import contents_query, daily_count_query
+from app.models.database import engine
+from app.models.migrations import _plan, hot_queries
+from app.services.pipeline import ResearchPipeline
+
+pytestmark = pytest.mark.anyio
+
+
+async def _explain(statement):
+    async with engine.connect() as conn:
+        return await conn.run_sync(_plan, statement)
+
+
+@pytest.mark.parametrize("statement, index", [
+    (lambda: contents_query(), "ix_contents_analyzed_score"),
+    (lambda: contents_query(sort_by="published_at"), "ix_contents_analyzed_published"),
+    (lambda: contents_query(sort_by="created_at"), "ix_contents_analyzed_created"),
+    (lambda: contents_query(min_score=80), "ix_contents_analyzed_score"),
+    (lambda: contents_query(keyword_id=1), "ix_contents_keyword_analyzed_score"),
+    (lambda: contents_query(source_type="news"), "ix_contents_source_analyzed_score"),
+    (lambda: contents_query(language="ko"), "ix_contents_language_analyzed_score"),
+    (lambda: contents_query(is_starred=True), "ix_contents_starred_analyzed_score"),
+    (lambda: daily_count_query(datetime(2024, 1, 1)), "ix_contents_created"),
+    # 키워드 / 소스 조건 모두 (조건, is_analyzed) 인덱스가 있어 통계에 따라 둘 중 하나를 고름
+    (
+        lambda: ResearchPipeline.backlog_query([1, 2], ["news", "blog"]),
+        ("ix_contents_keyword_analyzed_score", "ix_contents_source_analyzed_score")
+    ),
+])
+async def test_route_and_pipeline_queries_use_index(db, statement, index):
+    indexes = index if isinstance(index, tuple) else (index,)
+    plan, full_scan = await _explain(statement())
+    assert not full_scan, plan
+    assert any(name in line for line in plan for name in indexes), plan
+
+
+async def test_hot_queries_do_not_scan_contents(db):
+    for name, statement in hot_queries():
+        plan, full_scan = await _explain(statement)
+        assert not full_scan, (name, plan)
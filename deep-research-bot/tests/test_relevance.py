@@ -0,0 +1,22 @@
+from app.services.relevance import RelevanceScorer
+
+
+def test_description_boilerplate_is_not_part_of_the_query():
+    query = RelevanceScorer._query("AI", "인공지능 관련 콘텐츠")
+    assert "관련" not in query
+    assert "콘텐" not in query
+    assert "지능" in query and query["ai"] == 2.0
+
+    query = RelevanceScorer._query("LLM", "Related news and articles about large language models")
+    assert {"related", "news", "articles", "about"}.isdisjoint(query)
+    assert "language" in query
+
+
+def test_boilerplate_only_document_scores_zero():
+    scorer = RelevanceScorer()
+    scorer._queries = {"AI": RelevanceScorer._query("AI", "인공지능 관련된 콘텐츠를 모은 뉴스")}
+
+    boilerplate = scorer.bm25("AI", "관련 콘텐츠 모음", "최신 뉴스 관련 콘텐츠")
+    relevant = scorer.bm25("AI", "인공지능 스타트업 투자 확대", "생성형 AI 모델 경쟁")
+    assert boilerplate == 0.0
+    assert relevant > boilerplate
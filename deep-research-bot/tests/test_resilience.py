@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core.resilience import CircuitOpenError, HostGuard
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://feeds.example.com/rss"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "retry_max_attempts", 3)
+    monkeypatch.setattr(settings, "retry_backoff_base", 0.001)
+    monkeypatch.setattr(settings, "breaker_failure_threshold", 3)
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _open(guard: HostGuard):
+    """차단된 뒤 cooldown이 끝난 상태 (다음 요청이 시험 요청)"""
+    breaker = guard.breaker(guard.host_of(URL))
+    breaker.state = "open"
+    breaker.opened_at = 0.0
+    return breaker
+
+
+async def test_retries_count_as_one_failure():
+    guard = HostGuard()
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    async with _client(handler) as client:
+        response = await guard.get(client, URL)
+
+    breaker = guard.breaker(guard.host_of(URL))
+    assert response.status_code == 503
+    assert calls == 3
+    # 재시도 3번이어도 논리 요청 하나 = 실패 1회 (바로 차단되지 않음)
+    assert breaker.failures == 1
+    assert breaker.state == "closed"
+
+
+async def test_cancelled_trial_does_not_block_the_host():
+    guard = HostGuard()
+    breaker = _open(guard)
+    started = asyncio.Event()
+
+    async def slow(request):
+        started.set()
+        await asyncio.sleep(60)
+        return httpx.Response(200)
+
+    async with _client(slow) as client:
+        trial = asyncio.create_task(guard.get(client, URL))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    assert breaker.trial_in_progress is False
+
+    # 다음 요청이 시험 요청이 되어 성공하면 닫힘
+    async with _client(lambda request: httpx.Response(200)) as client:
+        response = await guard.get(client, URL)
+    assert response.status_code == 200
+    assert breaker.state == "closed"
+
+
+async def test_unexpected_error_releases_the_trial():
+    guard = HostGuard()
+    breaker = _open(guard)
+
+    def broken(request):
+        raise httpx.UnsupportedProtocol("bad scheme")
+
+    async with _client(broken) as client:
+        with pytest.raises(httpx.UnsupportedProtocol):
+            await guard.get(client, URL)
+        assert breaker.trial_in_progress is False
+        # 시험 요청이 남아 있지 않으므로 거부되지 않음
+        with pytest.raises(httpx.UnsupportedProtocol):
+            await guard.get(client, URL)
+
+
+async def test_failed_trial_reopens():
+    guard = HostGuard()
+    breaker = _open(guard)
+
+    def down(request):
+        raise httpx.ConnectError("refused")
+
+    async with _client(down) as client:
+        with pytest.raises(httpx.ConnectError):
+            await guard.get(client, URL)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await guard.get(client, URL)
+
+
+@pytest.mark.parametrize("status, failures", [(403, 1), (401, 1), (404, 0), (410, 0), (200, 0)])
+async def test_client_errors_are_recorded_without_retries(status, failures):
+    guard = HostGuard()
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(status)
+
+    async with _client(handler) as client:
+        response = await guard.get(client, URL)
+
+    # 403 등은 재시도해도 같으므로 바로 실패 1회, 404/410은 그 URL만의 문제라 기록하지 않음
+    assert response.status_code == status
+    assert calls == 1
+    assert guard.breaker(guard.host_of(URL)).failures == failures
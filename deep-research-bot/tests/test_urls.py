@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.services.urls import UrlResolver
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://news.example.com/redirect/1"
+
+
+async def test_waiters_are_released_when_the_leader_is_cancelled(db, monkeypatch):
+    resolver = UrlResolver()
+    started = asyncio.Event()
+
+    async def slow_redirect(url):
+        started.set()
+        await asyncio.sleep(60)
+        return "https://example.com/article"
+
+    monkeypatch.setattr(resolver, "_fetch_redirect", slow_redirect)
+
+    leader = asyncio.create_task(resolver.resolve(URL))
+    await started.wait()
+    waiter = asyncio.create_task(resolver.resolve(URL))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    # 기다리던 쪽은 멈추지 않고 해석 실패(None)를 받아야 함
+    assert await asyncio.wait_for(waiter, timeout=1) is None
+    assert URL not in resolver._inflight
+
+
+async def test_cancelled_waiter_does_not_cancel_the_leader(db, monkeypatch):
+    resolver = UrlResolver()
+    started = asyncio.Event()
+
+    async def slow_redirect(url):
+        started.set()
+        await asyncio.sleep(0.1)
+        return "https://example.com/article"
+
+    monkeypatch.setattr(resolver, "_fetch_redirect", slow_redirect)
+
+    leader = asyncio.create_task(resolver.resolve(URL))
+    await started.wait()
+    waiter = asyncio.create_task(resolver.resolve(URL))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    assert await asyncio.wait_for(leader, timeout=1) == "https://example.com/article"
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.models.database import ResearchLog, WorkUnit, async_session
+from app.services.work_queue import WorkQueue, work_queue
+
+pytestmark = pytest.mark.anyio
+
+
+async def _active_runs() -> int:
+    async with async_session() as session:
+        result = await session.execute(
+            select(func.count(ResearchLog.id)).where(ResearchLog.status.in_(("queued", "running")))
+        )
+        return result.scalar()
+
+
+async def test_concurrent_enqueue_creates_one_run(db):
+    first, second = await asyncio.gather(work_queue.enqueue_run(), work_queue.enqueue_run())
+
+    assert sorted([first["merged"], second["merged"]]) == [False, True]
+    assert first["job_id"] == second["job_id"]
+    assert await _active_runs() == 1
+
+
+async def test_enqueue_merges_when_another_process_wins(db, monkeypatch):
+    created = await work_queue.enqueue_run()
+
+    # 확인 직후 다른 프로세스가 등록한 상황 - 유니크 인덱스에 막혀 그 실행에 합쳐야 함
+    checks = []
+    active_run = WorkQueue._active_run
+
+    async def stale_check(session):
+        checks.append(session)
+        return None if len(checks) == 1 else await active_run(session)
+
+    monkeypatch.setattr(WorkQueue, "_active_run", staticmethod(stale_check))
+    merged = await work_queue.enqueue_run()
+
+    assert merged == {"job_id": created["job_id"], "scope": "workers", "merged": True}
+    assert await _active_runs() == 1
+
+
+async def _unit(unit_id: int) -> WorkUnit:
+    async with async_session() as session:
+        return await session.get(WorkUnit, unit_id)
+
+
+async def test_expired_lease_is_reclaimed_by_another_worker(db, monkeypatch):
+    await work_queue.enqueue_run()
+
+    # 임대하자마자 만료 - heartbeat 없이 죽은 워커
+    monkeypatch.setattr(settings, "worker_lease_seconds", -1)
+    dead = await work_queue.lease("dead:1")
+
+    monkeypatch.setattr(settings, "worker_lease_seconds", 60)
+    reclaimed = await work_queue.lease("alive:2")
+
+    assert reclaimed.id == dead.id
+    assert reclaimed.worker_id == "alive:2"
+    assert reclaimed.attempts == 2
+    # 이전 워커는 임대를 잃었으므로 연장도 완료도 못 함
+    assert await work_queue.heartbeat(dead.id, "dead:1") is False
+    assert await work_queue.complete(dead.id, "dead:1", {"found": 1, "skipped": 0, "analyzed": 0}) is False
+    assert await work_queue.heartbeat(dead.id, "alive:2") is True
+
+
+async def test_expired_lease_fails_after_max_attempts(db, monkeypatch):
+    await work_queue.enqueue_run()
+    monkeypatch.setattr(settings, "worker_max_attempts", 1)
+    monkeypatch.setattr(settings, "worker_lease_seconds", -1)
+    dead = await work_queue.lease("dead:1")
+
+    # 임대 횟수를 다 쓴 작업은 다시 임대하지 않고 실패 처리
+    monkeypatch.setattr(settings, "worker_lease_seconds", 60)
+    other = await work_queue.lease("alive:2")
+
+    assert other.id != dead.id
+    unit = await _unit(dead.id)
+    assert unit.status == "failed"
+    assert unit.completed_at is not None
+
+
+async def test_complete_is_refused_for_a_non_owner(db):
+    await work_queue.enqueue_run()
+    unit = await work_queue.lease("owner:1")
+    stats = {"found": 3, "skipped": 1, "analyzed": 2}
+
+    assert await work_queue.complete(unit.id, "other:2", stats) is False
+    assert (await _unit(unit.id)).status == "leased"
+
+    assert await work_queue.complete(unit.id, "owner:1", stats) is True
+    done = await _unit(unit.id)
+    assert (done.status, done.found, done.skipped, done.analyzed) == ("done", 3, 1, 2)
+    # 완료된 작업은 다시 완료할 수 없음
+    assert await work_queue.complete(unit.id, "owner:1", stats) is False
+
+
+async def test_finish_runs_aggregates_unit_results(db, monkeypatch):
+    monkeypatch.setattr(settings, "worker_max_attempts", 1)
+    run = await work_queue.enqueue_run()
+
+    first = await work_queue.lease("w:1")
+    await work_queue.fail(first.id, "w:1", "boom")
+    assert await work_queue.finish_runs() == []  # 남은 작업이 있으면 완료하지 않음
+
+    units = 1
+    while (unit := await work_queue.lease("w:1")) is not None:
+        units += 1
+        assert await work_queue.complete(unit.id, "w:1", {"found": 2, "skipped": 1, "analyzed": 1})
+
+    assert await work_queue.finish_runs() == [run["job_id"]]
+    # 이미 완료된 실행은 다시 완료하지 않음 (여러 워커가 동시에 호출해도 한 번)
+    assert await work_queue.finish_runs() == []
+
+    async with async_session() as session:
+        log = await session.get(ResearchLog, run["job_id"])
+    done = units - 1
+    assert units == run["units"]
+    assert log.status == "completed"
+    assert (log.total_found, log.total_skipped, log.total_analyzed) == (2 * done, done, done)
+    assert log.error_message == "실패한 작업 1개"
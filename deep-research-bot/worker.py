@@ -0,0 +1,217 @@
+"""
+리서치 워커 - 작업 큐(work_units)의 키워드 × 소스 단위 작업을 여러 프로세스에서 처리
+
+    python worker.py enqueue            # 활성 키워드 전체 리서치를 작업 큐에 등록
+    python worker.py run -n 4           # 워커 프로세스 4개 실행 (남은 작업이 없으면 종료)
+    python worker.py run -n 4 --wait    # 작업이 없어도 종료하지 않고 새 실행을 기다림
+
+고정 RSS 피드는 실행마다 피드 작업 하나가 한 번만 받아 모든 키워드와 매칭하고, 키워드 × 소스 작업은
+검색 API만 사용한다. RESEARCH_MODE=workers로 서버를 실행하면 예약/수동 전체 리서치가 작업 큐에 등록되므로
+워커를 --wait로 띄워 두면 된다. 워커가 죽으면 임대가 만료된 뒤 다른 워커가 그 작업을 이어받는다.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.database import Keyword, ResearchLog, WorkUnit, init_db, async_session
+from app.core.http import http_client
+from app.core.executor import parse_executor
+from app.services.transcripts import transcript_fetcher
+from app.services.collectors import FeedSnapshot
+from app.services.pipeline import ResearchPipeline
+from app.services.work_queue import work_queue, FEEDS_UNIT
+
+
+async def _unit_pipeline(unit: WorkUnit):
+    """작업에 맞는 (키워드 목록, 파이프라인) - 없는 키워드/소스면 None"""
+    from app.services.researcher import researcher
+    
+    languages = researcher.languages
+    analyze = settings.analysis_mode != "batch"
+    
+    if unit.source_type == FEEDS_UNIT:
+        # 고정 피드는 실행당 한 번만 받아 실행의 모든 키워드와 매칭 ("*" 워터마크, 전체 리서치와 같음)
+        async with async_session() as session:
+            result = await session.execute(
+                select(Keyword)
+                .where(Keyword.id.in_(select(WorkUnit.keyword_id).where(WorkUnit.log_id == unit.log_id)))
+                .order_by(Keyword.id)
+            )
+            keywords = result.scalars().all()
+        collectors = {
+            source_type: collector for source_type, collector in researcher.collectors.items()
+            if any(collector.get_feeds(language) for language in languages)
+        }
+        snapshot = FeedSnapshot()
+        await snapshot.load(collectors, languages)
+        snapshot.match([k.name for k in keywords])
+        # 미분석 항목은 키워드 × 소스 작업이 각자 맡음 (여기서도 읽으면 같은 항목을 두 번 분석)
+        return keywords, ResearchPipeline(
+            collectors, languages, snapshot, analyze=analyze, feeds_only=True, load_backlog=False
+        )
+    
+    async with async_session() as session:
+        keyword = await session.get(Keyword, unit.keyword_id)
+        log = await session.get(ResearchLog, unit.log_id)
+    collector = researcher.collectors.get(unit.source_type)
+    if keyword is None or collector is None:
+        return None
+    
+    # 고정 피드는 피드 작업이 맡으므로 검색 API만 사용
+    snapshot = FeedSnapshot()
+    snapshot.skip({unit.source_type: collector}, languages)
+    # 실행 시작 후 저장된 항목은 저장한 작업(피드 작업 등)이 분석하므로 미분석 항목에서 제외
+    return [keyword], ResearchPipeline(
+        {unit.source_type: collector}, languages, snapshot, analyze=analyze,
+        backlog_before=log.started_at if log else None
+    )
+
+
+async def _run_unit(unit: WorkUnit) -> Optional[Tuple[str, Dict[str, int]]]:
+    """작업 실행 - (작업 이름, 수집/중복/분석 건수)"""
+    prepared = await _unit_pipeline(unit)
+    if prepared is None:
+        return None
+    keywords, pipeline = prepared
+    keyword_stats = await pipeline.run(keywords)
+    
+    name = "고정 피드" if unit.source_type == FEEDS_UNIT else keywords[0].name
+    stats = {
+        field: sum(s[field] for s in keyword_stats.values())
+        for field in ("found", "skipped", "analyzed")
+    }
+    return f"{name} / {unit.source_type}", stats
+
+
+async def process_unit(worker_id: str, unit: WorkUnit):
+    """작업 하나 처리 - 처리 중 heartbeat로 임대를 연장하고, 임대를 잃으면 중단"""
+    task = asyncio.create_task(_run_unit(unit))
+    while True:
+        done, _ = await asyncio.wait([task], timeout=settings.worker_heartbeat_seconds)
+        if done:
+            break
+        if not await work_queue.heartbeat(unit.id, worker_id):
+            # 임대 만료 후 다른 워커가 가져갔거나 실행이 취소됨
+            task.cancel()
+            await asyncio.wait([task])
+            print(f"⚠️ [{worker_id}] 임대 상실, 작업 중단: #{unit.id} ({unit.source_type})")
+            return
+    
+    if task.exception() is not None:
+        print(f"[{worker_id}] 작업 오류 (#{unit.id} {unit.source_type}): {task.exception()}")
+        await work_queue.fail(unit.id, worker_id, str(task.exception()))
+        return
+    
+    if task.result() is None:
+        await work_queue.fail(unit.id, worker_id, "키워드 또는 소스를 찾을 수 없습니다.")
+        return
+    
+    name, stats = task.result()
+    if await work_queue.complete(unit.id, worker_id, stats):
+        print(
+            f"✅ [{worker_id}] {name}: "
+            f"수집 {stats['found']}, 중복 {stats['skipped']}, 분석 {stats['analyzed']}"
+        )
+
+
+async def finish_run(log_id: int):
+    """실행 완료 후 작업 (이 워커가 실행을 완료 처리한 경우에만)"""
+    from app.services.analysis_batches import analysis_batches
+    from app.services.analysis_cache import analysis_cache
+    from app.services.digests import daily_digests
+    
+    if settings.analysis_mode == "batch":
+        await analysis_batches.submit()
+    if settings.digest_prebuild:
+        await daily_digests.refresh()
+    if settings.analysis_cache:
+        await analysis_cache.evict()
+    print(f"🏁 워커 리서치 완료: #{log_id}")
+
+
+async def worker_loop(wait: bool):
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    await http_client.start()
+    print(f"👷 워커 시작: {worker_id}")
+    try:
+        while True:
+            unit = await work_queue.lease(worker_id)
+            if unit is None:
+                for log_id in await work_queue.finish_runs():
+                    await finish_run(log_id)
+                if not wait:
+                    break
+                await asyncio.sleep(settings.worker_poll_seconds)
+                continue
+            
+            await work_queue.update_progress(unit.log_id)
+            try:
+                await process_unit(worker_id, unit)
+            except Exception as e:
+                print(f"[{worker_id}] 작업 처리 오류: {e}")
+                await work_queue.fail(unit.id, worker_id, str(e))
+            await work_queue.update_progress(unit.log_id)
+    finally:
+        await http_client.close()
+        parse_executor.shutdown()
+        transcript_fetcher.shutdown()
+        print(f"👋 워커 종료: {worker_id}")
+
+
+def run_worker(wait: bool):
+    """워커 프로세스 진입점"""
+    try:
+        asyncio.run(worker_loop(wait))
+    except KeyboardInterrupt:
+        pass
+
+
+def run(processes: int, wait: bool):
+    asyncio.run(init_db())
+    # 자식 프로세스가 부모의 이벤트 루프/DB 연결을 물려받지 않도록 spawn 사용
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=run_worker, args=(wait,)) for _ in range(processes)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.join()
+
+
+async def enqueue() -> Optional[int]:
+    await init_db()
+    result = await work_queue.enqueue_run()
+    if "job_id" not in result:
+        print(result["message"])
+        return None
+    if result["merged"]:
+        print(f"진행 중인 워커 리서치가 있습니다: #{result['job_id']}")
+    return result["job_id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deep Research Bot 리서치 워커")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("enqueue", help="활성 키워드 전체 리서치를 작업 큐에 등록")
+    run_parser = commands.add_parser("run", help="워커 프로세스 실행")
+    run_parser.add_argument("-n", "--processes", type=int, default=settings.worker_processes, help="워커 프로세스 수")
+    run_parser.add_argument("--wait", action="store_true", help="작업이 없어도 종료하지 않고 대기")
+    args = parser.parse_args()
+    
+    if args.command == "enqueue":
+        asyncio.run(enqueue())
+    else:
+        run(max(args.processes, 1), args.wait)
+
+
+if __name__ == "__main__":
+    main()